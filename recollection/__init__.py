@@ -360,6 +360,38 @@ from .core import (
     Memento,
 )
 
+from .offload import (
+    SerialisationPool,
+)
+
+from .shared import (
+    SharedHistory,
+    SharedHistoryReader,
+)
+
+from .distributed import (
+    SyncCoordinator,
+    SyncLink,
+)
+
+from .replication import (
+    ReplicationPrimary,
+    ReplicationFollower,
+)
+
+from .profiling import (
+    Profiler,
+    profile,
+)
+
+from .tree import (
+    UndoTree,
+)
+
+from .bulk import (
+    deserialise_all,
+)
+
 from .inference import (
     Inference,
 )
@@ -371,6 +403,19 @@ from .serialiser import (
 from .serialisers import (
     PickleSerialiser,
     JsonAppSerialiser,
+    JsonLinesSerialiser,
+    PickleBufferSerialiser,
+)
+
+from .fileio import (
+    set_durability,
+    durability,
+)
+
+from .constants import (
+    DURABILITY_NONE,
+    DURABILITY_SYNC,
+    DURABILITY_GROUP,
 )
 
 from . exceptions import (
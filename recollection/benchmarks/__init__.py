@@ -0,0 +1,95 @@
+"""
+This namespace holds benchmarks which measure the cost of recollection's
+core operations. They are not run as part of the tests, and are instead
+intended to be run by hand when working on performance.
+
+The whole suite can be run from the command line, writing its results as
+json so they can be compared between releases:
+
+    ..code-block:: bash
+
+        python -m recollection.benchmarks --output results.json
+
+Or from python:
+
+    ..code-block:: python
+
+        >>> from recollection import benchmarks
+        >>>
+        >>> results = benchmarks.run(names=['core', 'inference'], quick=True)
+"""
+from . import core
+from . import bulk
+from . import groups
+from . import threads
+from . import inference
+from . import serialisers
+
+import sys
+import platform
+
+import recollection
+
+
+# ------------------------------------------------------------------------------
+# -- The benchmark modules in the order they are run
+NAMES = (
+    'core',
+    'serialisers',
+    'bulk',
+    'inference',
+    'groups',
+    'threads',
+)
+
+
+# ------------------------------------------------------------------------------
+def run(names=None, quick=False):
+    """
+    Runs the given benchmarks, returning their results along with a
+    description of the environment they were run in.
+
+    :param names: The names of the benchmarks to run, which defaults to
+        all of them
+    :type names: list(str, ...)
+
+    :param quick: If true, fewer operations are performed, giving less
+        reliable results in far less time
+    :type quick: bool
+
+    :return: dict
+    """
+    runners = dict(
+        core=core.run,
+        serialisers=serialisers.run,
+        bulk=bulk.run,
+        inference=inference.run,
+        groups=groups.run,
+        threads=lambda quick: threads.run(stores=2000 if quick else 20000),
+    )
+
+    names = names or NAMES
+
+    for name in names:
+        if name not in runners:
+            raise ValueError(
+                '%s is not a benchmark, expected one of : %s' % (
+                    name,
+                    ', '.join(NAMES),
+                ),
+            )
+
+    results = list()
+
+    for name in names:
+        results.extend(runners[name](quick))
+
+    return dict(
+        version=recollection.__version__,
+        python=sys.version,
+        implementation=platform.python_implementation(),
+        platform=platform.platform(),
+        gil_enabled=threads.gil_enabled(),
+        quick=quick,
+        results=results,
+    )
@@ -0,0 +1,53 @@
+"""
+Runs the benchmark suite, writing the results as json to stdout or to
+the given file.
+"""
+from . import run
+from . import NAMES
+
+import sys
+import json
+import argparse
+
+
+# ------------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m recollection.benchmarks',
+        description='Measures the cost of recollection\'s core operations.',
+    )
+    parser.add_argument(
+        'names',
+        nargs='*',
+        metavar='name',
+        help='The benchmarks to run (%s), defaulting to all' % ', '.join(NAMES),
+    )
+    parser.add_argument(
+        '--quick',
+        action='store_true',
+        help='Perform fewer operations, for a fast but noisier run',
+    )
+    parser.add_argument(
+        '--output',
+        help='Write the results to this file rather than to stdout',
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        results = run(names=args.names, quick=args.quick)
+
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4)
+
+    else:
+        json.dump(results, sys.stdout, indent=4)
+        sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+This benchmark measures the start up cost of deserialising many mementos,
+comparing a loop which deserialises each in turn with deserialise_all.
+Where the platform allows it, the files are evicted from the page cache
+before each run so they are read from disk, as they would be when an
+application first starts.
+"""
+from .timing import result
+
+import os
+import time
+import uuid
+import shutil
+
+import recollection
+from recollection import fileio
+
+
+# ------------------------------------------------------------------------------
+class _Target(object):
+    """
+    A plain object holding the attributes to be deserialised
+    """
+
+    def __init__(self):
+        self.numbers = None
+        self.names = None
+
+
+# ------------------------------------------------------------------------------
+def run(quick=False):
+    """
+    Runs the start up benchmarks, both with each memento reading its own
+    file and with several mementos sharing each file
+
+    :param quick: If true, fewer files are read
+    :type quick: bool
+
+    :return: list(dict, ...)
+    """
+    files = 50 if quick else 300
+    results = list()
+
+    for sharing in (1, 4):
+        results.extend(_start_up(files, sharing))
+
+    return results
+
+
+# ------------------------------------------------------------------------------
+def _start_up(files, sharing, repeats=5):
+    serialiser = recollection.JsonAppSerialiser
+
+    # -- Give each run a unique location so nothing which already exists
+    # -- is read or replaced
+    root = 'memento/benchmarks/%s' % uuid.uuid4().hex
+    identifiers = ['%s/%s' % (root, idx) for idx in range(files)]
+
+    for identifier in identifiers:
+        serialiser.serialise(
+            dict(
+                numbers=list(range(100)),
+                names=['name_%s' % idx for idx in range(100)],
+            ),
+            identifier,
+        )
+
+    def loop(mementos):
+        for memento in mementos:
+            memento.deserialise()
+
+    results = list()
+
+    try:
+        for benchmark, func in (
+                ('start_up_loop', loop),
+                ('start_up_bulk', recollection.deserialise_all)):
+
+            best = None
+
+            for _ in range(repeats):
+
+                # -- Keep a reference to the targets, as mementos only hold
+                # -- weak references to them
+                targets = [_Target() for _ in range(files * sharing)]
+                mementos = list()
+
+                for idx, target in enumerate(targets):
+                    memento = recollection.Memento(target)
+                    memento.register('numbers')
+                    memento.register('names')
+                    memento.register_serialiser(
+                        serialiser,
+                        identifiers[idx % files],
+                    )
+                    mementos.append(memento)
+
+                cold = _evict(
+                    [
+                        serialiser.locator(identifier)
+                        for identifier in identifiers
+                    ],
+                )
+
+                start = time.perf_counter()
+                func(mementos)
+                elapsed = time.perf_counter() - start
+
+                if best is None or elapsed < best:
+                    best = elapsed
+
+            results.append(
+                result(
+                    benchmark,
+                    files * sharing,
+                    best,
+                    files=files,
+                    sharing=sharing,
+                    cold=cold,
+                ),
+            )
+
+    finally:
+        shutil.rmtree(
+            os.path.dirname(serialiser.locator(identifiers[0])),
+            ignore_errors=True,
+        )
+
+    return results
+
+
+# ------------------------------------------------------------------------------
+def _evict(paths):
+    """
+    Drops the given files from both the in-process cache and, where the
+    platform allows it, the page cache. Returns whether the page cache
+    could be dropped.
+    """
+    fileio.clear_cache()
+
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+
+    # -- Pages which are yet to be written out cannot be dropped
+    os.sync()
+
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+        finally:
+            os.close(fd)
+
+    return True
@@ -0,0 +1,128 @@
+"""
+This benchmark measures the cost of storing and restoring (along with
+checkpointing and rolling back), across different numbers of labels and
+sizes of value, along with the cost of each of the ways a value can be
+copied into a state.
+"""
+from .timing import measure
+
+import recollection
+
+
+# ------------------------------------------------------------------------------
+class _Target(object):
+    """
+    A plain object holding a number of list attributes to be stored
+    """
+
+    def __init__(self, labels, size):
+        for idx in range(labels):
+            setattr(self, 'value_%s' % idx, list(range(size)))
+
+
+# ------------------------------------------------------------------------------
+def run(quick=False):
+    """
+    Runs the store, restore and copy benchmarks
+
+    :param quick: If true, fewer operations are performed
+    :type quick: bool
+
+    :return: list(dict, ...)
+    """
+    operations = 200 if quick else 2000
+    results = list()
+
+    for labels in (1, 10, 100):
+        for size in (1, 100, 1000):
+
+            # -- Keep the total amount of work roughly level so the
+            # -- largest combinations do not dominate the run time
+            count = max(
+                operations // 100,
+                operations // max(1, (labels * size) // 100),
+            )
+
+            results.extend(_store_and_restore(labels, size, count))
+
+    for copy_value in (True, False):
+        target, memento = _memento(10, 1000, copy_value=copy_value)
+
+        results.append(
+            measure(
+                'copy',
+                lambda: [memento.store() for _ in range(operations)],
+                operations,
+                mode='deepcopy' if copy_value else 'reference',
+                labels=10,
+                size=1000,
+            ),
+        )
+
+    return results
+
+
+# ------------------------------------------------------------------------------
+def _store_and_restore(labels, size, count):
+    target, memento = _memento(labels, size)
+
+    stored = measure(
+        'store',
+        lambda: [memento.store() for _ in range(count)],
+        count,
+        labels=labels,
+        size=size,
+    )
+
+    restored = measure(
+        'restore',
+        lambda: [memento.restore(1) for _ in range(count)],
+        count,
+        labels=labels,
+        size=size,
+    )
+
+    checkpointed = measure(
+        'checkpoint',
+        lambda: [memento.checkpoint() for _ in range(count)],
+        count,
+        labels=labels,
+        size=size,
+    )
+
+    token = memento.checkpoint()
+
+    rolled_back = measure(
+        'rollback',
+        lambda: [memento.rollback(token) for _ in range(count)],
+        count,
+        labels=labels,
+        size=size,
+    )
+
+    return [stored, restored, checkpointed, rolled_back]
+
+
+# ------------------------------------------------------------------------------
+def _memento(labels, size, copy_value=True):
+    target = _Target(labels, size)
+    memento = recollection.Memento(target)
+
+    for idx in range(labels):
+        memento.register(
+            'value_%s' % idx,
+            copy_value=copy_value,
+        )
+
+    # -- Restoring needs at least two states to step back to. Every value
+    # -- is changed between them, as restoring only calls the setters of
+    # -- values which differ. Each restore then stores the state it stepped
+    # -- back to, so stepping back again always finds the other state.
+    memento.store()
+
+    for idx in range(labels):
+        setattr(target, 'value_%s' % idx, list(range(1, size + 1)))
+
+    memento.store()
+
+    return target, memento
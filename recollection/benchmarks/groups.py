@@ -0,0 +1,57 @@
+"""
+This benchmark measures how the cost of a store grows with the number of
+mementos in the sync group it is propagated to.
+"""
+from .timing import measure
+
+import recollection
+
+
+# ------------------------------------------------------------------------------
+class _Target(object):
+    """
+    A plain object holding a single integer attribute to be stored
+    """
+
+    def __init__(self):
+        self.number = 0
+
+
+# ------------------------------------------------------------------------------
+def run(quick=False):
+    """
+    Runs the fan-out benchmark for a number of group sizes
+
+    :param quick: If true, fewer operations are performed
+    :type quick: bool
+
+    :return: list(dict, ...)
+    """
+    operations = 500 if quick else 5000
+    results = list()
+
+    for members in (1, 2, 4, 8, 16):
+
+        # -- Keep a reference to the targets, as mementos only hold weak
+        # -- references to them
+        targets = [_Target() for _ in range(members)]
+        mementos = list()
+
+        for target in targets:
+            memento = recollection.Memento(target)
+            memento.register('number')
+            mementos.append(memento)
+
+        for memento in mementos[1:]:
+            mementos[0].group(memento)
+
+        results.append(
+            measure(
+                'group_store',
+                lambda: [mementos[0].store() for _ in range(operations)],
+                operations,
+                members=members,
+            ),
+        )
+
+    return results
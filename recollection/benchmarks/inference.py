@@ -0,0 +1,78 @@
+"""
+This benchmark measures the overhead Inference adds when setting attributes,
+compared to setting attributes on a plain object and to storing explicitly
+through a Memento.
+"""
+from .timing import measure
+
+import recollection
+
+
+# ------------------------------------------------------------------------------
+class _Plain(object):
+    """
+    A plain object, with nothing recording its state
+    """
+
+    def __init__(self):
+        self.number = 0
+        self.other = 0
+
+
+# ------------------------------------------------------------------------------
+class _Inferred(recollection.Inference):
+    """
+    An inference object with a single registered attribute
+    """
+
+    def __init__(self):
+        super(_Inferred, self).__init__()
+
+        self.number = 0
+        self.other = 0
+
+        self.memento.register('number')
+
+
+# ------------------------------------------------------------------------------
+def run(quick=False):
+    """
+    Runs the attribute setting benchmarks
+
+    :param quick: If true, fewer operations are performed
+    :type quick: bool
+
+    :return: list(dict, ...)
+    """
+    operations = 2000 if quick else 20000
+
+    plain = _Plain()
+    inferred = _Inferred()
+
+    explicit = _Plain()
+    memento = recollection.Memento(explicit)
+    memento.register('number')
+
+    def set_plain():
+        for idx in range(operations):
+            plain.number = idx
+
+    def set_unregistered():
+        for idx in range(operations):
+            inferred.other = idx
+
+    def set_registered():
+        for idx in range(operations):
+            inferred.number = idx
+
+    def set_explicit():
+        for idx in range(operations):
+            explicit.number = idx
+            memento.store()
+
+    return [
+        measure('setattr', set_plain, operations, mode='plain'),
+        measure('setattr', set_unregistered, operations, mode='inference'),
+        measure('setattr', set_registered, operations, mode='inference_store'),
+        measure('setattr', set_explicit, operations, mode='memento_store'),
+    ]
@@ -0,0 +1,97 @@
+"""
+This benchmark measures the throughput of each of the serialisers which
+are available out of the box, both writing a state and reading it back.
+"""
+from .timing import measure
+
+import os
+import uuid
+import shutil
+import tempfile
+
+import recollection
+
+
+# ------------------------------------------------------------------------------
+# -- The serialisers which take an absolute path as their identifier, rather
+# -- than a path within the application data location
+_ABSOLUTE = (
+    recollection.PickleSerialiser,
+    recollection.PickleBufferSerialiser,
+)
+
+
+# ------------------------------------------------------------------------------
+def run(quick=False):
+    """
+    Runs the serialisation benchmarks for every serialiser
+
+    :param quick: If true, fewer operations are performed
+    :type quick: bool
+
+    :return: list(dict, ...)
+    """
+    operations = 20 if quick else 200
+    results = list()
+
+    for serialiser in (
+            recollection.JsonAppSerialiser,
+            recollection.JsonLinesSerialiser,
+            recollection.PickleSerialiser,
+            recollection.PickleBufferSerialiser):
+
+        for size in (10, 10000):
+            results.extend(_serialise(serialiser, size, operations))
+
+    return results
+
+
+# ------------------------------------------------------------------------------
+def _serialise(serialiser, size, operations):
+    directory = tempfile.mkdtemp()
+
+    if serialiser in _ABSOLUTE:
+        identifier = os.path.join(directory, 'benchmark')
+
+    else:
+        # -- Give each run a unique location so nothing which already
+        # -- exists is read or replaced
+        identifier = 'memento/benchmarks/%s/benchmark' % uuid.uuid4().hex
+        directory = os.path.dirname(serialiser.locator(identifier))
+
+    data = dict(
+        numbers=list(range(size)),
+        names=['name_%s' % idx for idx in range(size)],
+        value=size,
+    )
+
+    # -- Every read follows a write, so it is never served from the
+    # -- cache of previously read files
+    def round_trip():
+        for _ in range(operations):
+            serialiser.serialise(data, identifier)
+            serialiser.deserialise(identifier)
+
+    try:
+        return [
+            measure(
+                'serialise',
+                lambda: [
+                    serialiser.serialise(data, identifier)
+                    for _ in range(operations)
+                ],
+                operations,
+                serialiser=serialiser.__name__,
+                size=size,
+            ),
+            measure(
+                'round_trip',
+                round_trip,
+                operations,
+                serialiser=serialiser.__name__,
+                size=size,
+            ),
+        ]
+
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,148 @@
+"""
+This benchmark measures how store throughput scales when several threads
+each drive their own, independent, Memento. Each memento shares nothing
+with any other, so on a free-threaded build of Python the throughput
+should scale close to linearly with the number of threads. On a build
+with the GIL the throughput will stay roughly flat.
+
+    ..code-block:: python
+
+        >>> from recollection.benchmarks import threads
+        >>>
+        >>> threads.main()
+"""
+from .timing import result
+
+import sys
+import time
+import threading
+
+import recollection
+
+
+# ------------------------------------------------------------------------------
+class _Target(object):
+    """
+    A plain object holding a number of integer attributes to be stored
+    """
+
+    def __init__(self, labels):
+        for idx in range(labels):
+            setattr(self, 'value_%s' % idx, idx)
+
+
+# ------------------------------------------------------------------------------
+def run(thread_counts=(1, 2, 4, 8), stores=20000, labels=8, thread_safe=False):
+    """
+    Runs the benchmark for each of the given thread counts.
+
+    :param thread_counts: The number of threads to run, each of which drives
+        its own memento
+    :type thread_counts: tuple(int, ...)
+
+    :param stores: The number of stores each thread performs
+    :type stores: int
+
+    :param labels: The number of labels registered on each memento
+    :type labels: int
+
+    :param thread_safe: Whether the mementos are created as thread safe
+    :type thread_safe: bool
+
+    :return: list(dict, ...) with one result per thread count
+    """
+    results = list()
+    baseline = None
+
+    for thread_count in thread_counts:
+        elapsed = _time_threads(thread_count, stores, labels, thread_safe)
+        throughput = (thread_count * stores) / elapsed
+
+        if baseline is None:
+            baseline = throughput / thread_count
+
+        measured = result(
+            'threads',
+            thread_count * stores,
+            elapsed,
+            threads=thread_count,
+            thread_safe=thread_safe,
+        )
+        measured['scaling'] = throughput / baseline
+
+        results.append(measured)
+
+    return results
+
+
+# ------------------------------------------------------------------------------
+def _time_threads(thread_count, stores, labels, thread_safe):
+    """
+    Returns the number of seconds it takes the given number of threads
+    to each perform the given number of stores.
+    """
+    # -- Keep a reference to the targets, as mementos only hold weak
+    # -- references to them
+    targets = [_Target(labels) for _ in range(thread_count)]
+    mementos = list()
+
+    for target in targets:
+        memento = recollection.Memento(target, thread_safe=thread_safe)
+        memento.register(
+            ['value_%s' % idx for idx in range(labels)],
+        )
+        mementos.append(memento)
+
+    # -- All threads wait on the barrier so they start together, with
+    # -- this thread taking the time once they are all ready
+    barrier = threading.Barrier(thread_count + 1)
+
+    def work(memento):
+        barrier.wait()
+
+        for _ in range(stores):
+            memento.store()
+
+    threads = [
+        threading.Thread(target=work, args=(memento,))
+        for memento in mementos
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+
+    for thread in threads:
+        thread.join()
+
+    return time.perf_counter() - start
+
+
+# ------------------------------------------------------------------------------
+def gil_enabled():
+    """
+    Returns whether this interpreter is running with the GIL
+
+    :return: bool
+    """
+    return getattr(sys, '_is_gil_enabled', lambda: True)()
+
+
+# ------------------------------------------------------------------------------
+def main():
+    print('GIL Enabled : %s' % gil_enabled())
+
+    for measured in run():
+        print(
+            '%2s threads : %10.0f stores/s (%.2fx)' % (
+                measured['params']['threads'],
+                measured['ops_per_second'],
+                measured['scaling'],
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
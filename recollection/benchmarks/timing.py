@@ -0,0 +1,66 @@
+"""
+This module holds the timing utilities shared by all the benchmarks.
+"""
+import time
+
+
+# ------------------------------------------------------------------------------
+def measure(benchmark, func, operations, repeats=3, **params):
+    """
+    Times how long the given function takes, taking the best of the given
+    number of repeats to reduce the noise from anything else running.
+
+    :param benchmark: The name of the benchmark being measured
+    :type benchmark: str
+
+    :param func: A callable which performs the given number of operations
+        each time it is called
+    :type func: callable
+
+    :param operations: The number of operations performed by each call
+    :type operations: int
+
+    :param repeats: How many times to call the function
+    :type repeats: int
+
+    :param params: Any parameters which describe this measurement, such
+        as the number of labels registered
+
+    :return: dict
+    """
+    best = None
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return result(benchmark, operations, best, **params)
+
+
+# ------------------------------------------------------------------------------
+def result(benchmark, operations, seconds, **params):
+    """
+    Returns a result in the form every benchmark reports.
+
+    :param benchmark: The name of the benchmark
+    :type benchmark: str
+
+    :param operations: The number of operations which were performed
+    :type operations: int
+
+    :param seconds: How long the operations took
+    :type seconds: float
+
+    :return: dict
+    """
+    return dict(
+        benchmark=benchmark,
+        params=params,
+        operations=operations,
+        seconds=seconds,
+        ops_per_second=operations / seconds if seconds else 0,
+    )
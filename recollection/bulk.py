@@ -0,0 +1,189 @@
+"""
+This module exposes functionality for working with many Memento objects
+at once, such as when an application builds hundreds of Memento backed
+objects during its start up.
+"""
+from . import fileio
+from .constants import log
+from .serialiser import SerialiserBase
+
+import io
+import copy
+from concurrent import futures
+
+
+# ------------------------------------------------------------------------------
+def deserialise_all(mementos, max_workers=None, process_threshold=8388608):
+    """
+    This is the bulk equivalent of calling deserialise on each of the given
+    mementos, and is quicker when there are many of them.
+
+    All the serialisation locations are resolved up front, and each unique
+    location is read only once - regardless of how many mementos share it.
+    The files are read concurrently in a thread pool, so the time spent
+    waiting on a cold disk overlaps. Text formats (see
+    SerialiserBase.PARSES_TEXT) in files larger than the process threshold
+    are parsed in a process pool. The deserialised states are then applied
+    to each memento on the calling thread.
+
+    ..code-block:: python
+
+        >>> import recollection
+        >>>
+        >>> preferences = [Preferences(name) for name in names]
+        >>>
+        >>> recollection.deserialise_all(
+        ...     [preference.memento for preference in preferences],
+        ... )
+
+    :param mementos: The memento objects to deserialise
+    :type mementos: list(recollection.Memento, ...)
+
+    :param max_workers: The maximum number of threads used to read files
+    :type max_workers: int
+
+    :param process_threshold: Text files of at least this many bytes are
+        parsed in a process pool rather than on the reading thread. The
+        loaded data has to be unpickled on its return, which costs around
+        three quarters of parsing json, so this only pays for files of
+        several megabytes on a machine with spare cores. If None, all
+        files are parsed on the reading threads.
+    :type process_threshold: int
+
+    :return: None
+    """
+    mementos = list(mementos)
+
+    # -- Validate everything before we start reading anything
+    for memento in mementos:
+        if not memento._serialiser:
+            raise Exception(
+                'No serialiser has been defined for this recollection object',
+            )
+
+    # -- Group the mementos by what they read from, so each location is
+    # -- only ever read once
+    requests = dict()
+
+    for memento in mementos:
+        serialiser = memento._serialiser
+        identifier = memento._serialisation_identifier
+
+        key = (serialiser, serialiser.locator(identifier))
+        requests.setdefault(key, (identifier, list()))[1].append(memento)
+
+    results = dict()
+    contents = dict()
+
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as threads:
+        reads = dict(
+            (
+                threads.submit(
+                    _read,
+                    serialiser,
+                    path,
+                    identifier,
+                    process_threshold,
+                ),
+                (serialiser, path),
+            )
+            for (serialiser, path), (identifier, _) in requests.items()
+        )
+
+        # -- Anything too large to parse on a thread is returned to us
+        # -- as raw bytes to be handed to the process pool
+        raw = dict()
+
+        for future in futures.as_completed(reads):
+            key = reads[future]
+            loaded, data, contents[key] = future.result()
+
+            if loaded:
+                results[key] = data
+
+            else:
+                raw[key] = contents[key]
+
+    if raw:
+        results.update(_parse_in_processes(raw))
+
+    # -- Apply the results on this thread, giving each memento its own
+    # -- copy of the state where a location is shared. Loading the content
+    # -- we already hold again is far cheaper than deep copying the data.
+    for key, (_, targets) in requests.items():
+        serialiser = key[0]
+        data = results.get(key)
+        content = contents.get(key)
+
+        for idx, memento in enumerate(targets):
+            if idx and content is not None:
+                data = _load(serialiser.load, content)
+
+            elif idx:
+                data = copy.deepcopy(data)
+
+            memento._apply_deserialisation(data)
+
+    log.debug('Bulk deserialised %s mementos', len(mementos))
+
+
+# ------------------------------------------------------------------------------
+def _read(serialiser, path, identifier, process_threshold):
+    """
+    Reads the given location, returning a tuple of whether the data has
+    been loaded, the loaded data (if it has been) and the raw content of
+    the file. The raw content is None if the serialiser cannot load from a
+    file, or if the file does not exist.
+    """
+    # -- Serialisers which cannot load from a file are read in full
+    # -- through their own deserialise method
+    if not _can_load(serialiser):
+        return True, serialiser.deserialise(identifier), None
+
+    read = fileio.read_bytes(path)
+
+    if read is None:
+        return True, None, None
+
+    _, content = read
+
+    # -- Only text is worth parsing in another process, as anything
+    # -- binary is as costly to hand back as it is to load
+    if serialiser.PARSES_TEXT and process_threshold is not None \
+            and len(content) >= process_threshold:
+        return False, None, content
+
+    return True, _load(serialiser.load, content), content
+
+
+# ------------------------------------------------------------------------------
+def _parse_in_processes(raw):
+    results = dict()
+
+    with futures.ProcessPoolExecutor() as processes:
+        parses = dict(
+            (
+                processes.submit(
+                    _load,
+                    serialiser.load,
+                    content,
+                ),
+                (serialiser, path),
+            )
+            for (serialiser, path), content in raw.items()
+        )
+
+        for future in futures.as_completed(parses):
+            results[parses[future]] = future.result()
+
+    return results
+
+
+# ------------------------------------------------------------------------------
+def _load(loader, content):
+    return loader(io.BytesIO(content))
+
+
+# ------------------------------------------------------------------------------
+def _can_load(serialiser):
+    return serialiser.load is not SerialiserBase.load
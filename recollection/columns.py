@@ -0,0 +1,207 @@
+"""
+This module holds the columnar index which can be enabled on a memento to
+read the history of individual labels without walking every state.
+
+Whilst enabled, every stored value of an indexed label is appended to a
+column for that label. Columns of integers or floats are held within an
+array, so long histories of numeric labels are compact and can be handed
+straight to anything which understands the buffer protocol.
+
+    ..code-block:: python
+
+        >>> import recollection
+        >>>
+        >>> memento = recollection.Memento(player)
+        >>> memento.enable_columns(['score'])
+        >>>
+        >>> # -- The last 500 scores, most recent first
+        >>> scores = memento.history('score', 0, 500)
+        >>> list(scores.ids)
+
+Columns are only ever appended to or replaced, never altered, so a history
+view remains valid whilst more states are stored.
+"""
+from .observer import MISSING
+from .observer import HistoryObserver
+
+from array import array
+
+import collections.abc
+
+
+# ------------------------------------------------------------------------------
+# -- The array type code used for a column of each numeric type. Any other
+# -- type of value (including bools) is held in a list.
+_TYPECODES = {
+    int: 'q',
+    float: 'd',
+}
+
+# -- Evicted values are only removed from the front of a column once they
+# -- make up at least this many of its values, as removing them means
+# -- replacing the column
+_COMPACT_AT = 64
+
+
+# ------------------------------------------------------------------------------
+class Columns(HistoryObserver):
+    """
+    Holds a column for each indexed label of a memento, kept in step with
+    its history.
+    """
+
+    # --------------------------------------------------------------------------
+    def view(self, label, start=0, stop=None):
+        """
+        Returns a view of the indexed values of the given label, between
+        the given state indices.
+
+        :return: HistoryView
+        """
+        return self._held[label].view(start, stop)
+
+    # --------------------------------------------------------------------------
+    def _create(self, first_id):
+        return _Column(first_id)
+
+
+# ------------------------------------------------------------------------------
+class HistoryView(collections.abc.Sequence):
+    """
+    A read-only sequence of the values a single label held across a range
+    of states, with the most recent first - matching the indices given to
+    restore. Values are only read from the column as they are accessed.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, values, first, last_id, length):
+        """
+        :param values: The column (or list) holding the values, oldest first
+        :param first: The position of the most recent value in the view
+        :param last_id: The state id of the most recent value in the view
+        :param length: The number of values in the view
+        """
+        self._values = values
+        self._first = first
+        self._last_id = last_id
+        self._length = length
+
+    # --------------------------------------------------------------------------
+    def __len__(self):
+        return self._length
+
+    # --------------------------------------------------------------------------
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(*index.indices(self._length))]
+
+        if index < 0:
+            index += self._length
+
+        if not 0 <= index < self._length:
+            raise IndexError('History index out of range')
+
+        return self._values[self._first - index]
+
+    # --------------------------------------------------------------------------
+    def __repr__(self):
+        return '<HistoryView of %s values>' % self._length
+
+    # --------------------------------------------------------------------------
+    @property
+    def ids(self):
+        """
+        The state ids of each value within the view, most recent first
+
+        :return: range
+        """
+        return range(self._last_id, self._last_id - self._length, -1)
+
+    # --------------------------------------------------------------------------
+    def oldest_first(self):
+        """
+        Returns the values of the view ordered from oldest to most recent.
+        For numeric columns this is an array.
+
+        :return: array.array or list
+        """
+        return self._values[self._first - self._length + 1:self._first + 1]
+
+
+# ------------------------------------------------------------------------------
+class _Column(object):
+    """
+    This is an internal and private class which holds the values of a
+    single label, oldest first, along with the state id of the oldest.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, first_id):
+        self.values = None
+        self.offset = 0
+        self.first_id = first_id
+
+    # --------------------------------------------------------------------------
+    def add(self, state_id, value):
+        # -- A state which does not hold the label still needs a place
+        # -- within the column
+        self.append(None if value is MISSING else value)
+
+    # --------------------------------------------------------------------------
+    def append(self, value):
+        if self.values is None:
+            typecode = _TYPECODES.get(type(value))
+            self.values = array(typecode) if typecode else list()
+
+        if isinstance(self.values, array):
+            if type(value) is not _VALUE_TYPES[self.values.typecode]:
+                self.values = list(self.values)
+
+            else:
+                try:
+                    self.values.append(value)
+                    return
+
+                except OverflowError:
+                    self.values = list(self.values)
+
+        self.values.append(value)
+
+    # --------------------------------------------------------------------------
+    def evict(self, oldest_id):
+        """
+        Drops the values of any states older than the given id
+        """
+        if oldest_id <= self.first_id:
+            return
+
+        self.offset += oldest_id - self.first_id
+        self.first_id = oldest_id
+
+        # -- Views may hold the current values, so rather than altering
+        # -- them we replace them with a compacted copy
+        if self.offset >= _COMPACT_AT and \
+                self.offset * 2 >= len(self.values):
+            self.values = self.values[self.offset:]
+            self.offset = 0
+
+    # --------------------------------------------------------------------------
+    def view(self, start=0, stop=None):
+        values = list() if self.values is None else self.values
+
+        held = len(values) - self.offset
+        start, stop, _ = slice(start, stop).indices(held)
+
+        return HistoryView(
+            values,
+            first=self.offset + held - 1 - start,
+            last_id=self.first_id + held - 1 - start,
+            length=max(0, stop - start),
+        )
+
+
+# ------------------------------------------------------------------------------
+_VALUE_TYPES = dict(
+    (typecode, value_type)
+    for value_type, typecode in _TYPECODES.items()
+)
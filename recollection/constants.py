@@ -1,5 +1,35 @@
+import os
 import logging
 
 
 # -- All memento logging will be done through this logger
 log = logging.getLogger('memento')
+
+
+# -- Debug logging is only formatted when this is true and the logger is
+# -- enabled for debug output. It is false when python is run optimised
+# -- (-O), or when the RECOLLECTION_DEBUG_LOGGING environment variable is
+# -- set to 0, in which case the hot paths do nothing more than check it.
+# -- It can also be changed at runtime.
+DEBUG_LOGGING = __debug__ and \
+    os.environ.get('RECOLLECTION_DEBUG_LOGGING', '1') != '0'
+
+
+# ------------------------------------------------------------------------------
+def debugging():
+    """
+    Returns whether debug logging should be formatted and emitted. Callers
+    on hot paths should check this before building any log arguments.
+
+    :return: bool
+    """
+    return DEBUG_LOGGING and log.isEnabledFor(logging.DEBUG)
+
+
+# -- Durability policies which control when written files are flushed
+# -- to the disk. With no syncing we rely entirely on the operating system,
+# -- syncing will fsync on every write, whilst group syncing will fsync all
+# -- the files written within an interval together.
+DURABILITY_NONE = 'none'
+DURABILITY_SYNC = 'sync'
+DURABILITY_GROUP = 'group'
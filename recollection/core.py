@@ -1,12 +1,26 @@
+from . import stats
+from . import columns
+from . import indexes
+from . import history
+from . import constants
 from . import exceptions
 from .constants import log
 from .signal import Signal
 from .serialiser import SerialiserBase
 from contextlib import contextmanager
+from contextlib import nullcontext
 
 import six
 import copy
+import types
+import dataclasses
+import operator
+import asyncio
+import inspect
 import weakref
+import functools
+import threading
+from concurrent import futures
 
 
 # ------------------------------------------------------------------------------
@@ -15,14 +29,16 @@ class Memento(object):
     The Memento class aims to lower the development overhead of implementing
     storable state as well as offering functionality to step backward to 
     previous states along with state serialisation for persistent state.
-    """
 
-    # -- This is a list of recollection objects which should all store
-    # -- and restore whenever any other in the sync group does.
-    _SYNC_GROUPS = list()
+    By default a Memento expects to only ever be driven from a single thread.
+    If it is constructed with thread_safe=True then all the methods which
+    alter it (storing, restoring, registering and serialising) are serialised
+    through a lock, whilst the history can be read through states and diff
+    from any thread without taking the lock.
+    """
 
     # --------------------------------------------------------------------------
-    def __init__(self, target, max_states=100):
+    def __init__(self, target, max_states=100, thread_safe=False):
 
         # -- Define our callback signals to allow other mechanisms
         # -- to hook into recollection events
@@ -36,25 +52,81 @@ class Memento(object):
         # -- to defer lots of changes into a single step
         self._defer = False
 
+        # -- All changes to this memento happen under this lock. When we
+        # -- are not thread safe this is a context which does nothing.
+        self._thread_safe = thread_safe
+        self._lock = threading.RLock() if thread_safe else nullcontext()
+
+        # -- The group of mementos this should store and restore in
+        # -- lock-step with, if any
+        self._sync_group = None
+
         # -- Store the object we want to store state
         # -- for
         self._target = weakref.ref(target)
 
-        # -- Define the list which we will store states in
-        self._states = list()
+        # -- Define the history which we will store states in. This is
+        # -- never altered, only replaced, so readers can hold on to it
+        # -- whilst other threads are storing
+        self._states = history.History()
         self._max_states = max_states
 
+        # -- Every state is given an id, counting up from zero, which is
+        # -- the number of states pushed before it
+        self._pushed = 0
+
+        # -- When enabled these hold the columnar index of the history and
+        # -- the hash indexes used to search it
+        self._columns = None
+        self._indexes = None
+
+        # -- Callables which are given every state as it is added
+        # -- to the history, such as shared memory mirrors
+        self._push_observers = list()
+
         # -- Store properties need to read when serialising
         # -- and de-serialising
         self._items_to_record = list()
+        self._has_async_getters = False
+
+        # -- The readers and writers used by checkpoint and rollback, which
+        # -- are built from the registered items when first needed
+        self._compiled = None
 
         # -- Store the registered serialiser (if required)
         self._serialiser = None
         self._serialisation_identifier = None
         self._always_serialise = False
 
+        # -- When serialising incrementally we track the state which
+        # -- was last persisted so we only need to write what changed
+        self._incremental = False
+        self._full_serialise_interval = 0
+        self._serialised_state = None
+        self._patches_since_full = 0
+
+        # -- If given, serialisation is handed to this pool of worker
+        # -- processes rather than being performed on the calling thread
+        self._serialisation_pool = None
+
+        # -- The futures of any pooled serialisations which have not yet
+        # -- completed. These are resolved on the pool's threads, so the
+        # -- record of what has been persisted has its own lock rather
+        # -- than the memento lock, which may be held whilst waiting on
+        # -- the pool for room.
+        self._in_flight = set()
+        self._serialisation_lock = threading.Condition()
+
+        # -- When stats are enabled this holds what has been recorded
+        self._stats = None
+
     # --------------------------------------------------------------------------
-    def register(self, getter, setter=None, label=None, copy_value=True):
+    def register(self,
+                 getter,
+                 setter=None,
+                 label=None,
+                 copy_value=True,
+                 history_only=False):
         """
         This registers an attribute/method to call or read whenever the 
         store method is called.
@@ -86,6 +158,11 @@ class Memento(object):
             specifically do not want them copied and instead want them
             referenced you may set this value to false.
         :type copy_value: bool
+
+        :param history_only: If true, this label will be held in the
+            history of this memento but will never be passed to a serialiser
+            and therefore never reaches persistent storage.
+        :type history_only: bool
         :return: 
         """
 
@@ -106,42 +183,96 @@ class Memento(object):
         setter = setter or getter
         label = label or getter
 
-        # -- Get a list of existing labels so we can check for dupilcates
-        existing_labels = [
-            record_.label
-            for record_ in self._items_to_record
-        ]
-
-        # -- Do a final test to ensure we have everything we need
-        if label in existing_labels:
-            raise exceptions.RegistrationError(
-                '%s is already registered. You must un-register this entry '
-                'before re-registering.'
-            )
-
         # -- Create an accessing pair
         item = _ItemToRecord(
             target=self._target,
             label=label,
             getter=getter,
             setter=setter,
-            copy_value=copy_value
+            copy_value=copy_value,
+            history_only=history_only,
         )
 
-        # -- Store the entries
-        self._items_to_record.append(item)
+        with self._lock:
 
-        # -- Emit the event
-        self.registered.emit()
+            # -- Get a list of existing labels so we can check for dupilcates
+            existing_labels = [
+                record_.label
+                for record_ in self._items_to_record
+            ]
+
+            # -- Do a final test to ensure we have everything we need
+            if label in existing_labels:
+                raise exceptions.RegistrationError(
+                    '%s is already registered. You must un-register this '
+                    'entry before re-registering.'
+                )
+
+            # -- Store the entries
+            self._items_to_record.append(item)
+            self._has_async_getters = self._has_async_getters or item.is_async
+            self._compiled = None
+
+            # -- Emit the event
+            self.registered.emit()
 
         # -- Log the result
-        log.debug(
-            'Registered %s : \n\tGetter: %s \n\tSetter: %s' % (
+        if constants.debugging():
+            log.debug(
+                'Registered %s : \n\tGetter: %s \n\tSetter: %s',
                 label,
                 getter,
                 setter,
             )
-        )
+
+    # --------------------------------------------------------------------------
+    def register_all(self, copy_value=True, history_only=False, exclude=None):
+        """
+        Registers every attribute of the target, found by introspecting its
+        dataclass fields, its __slots__ or its __dict__ (in that order of
+        preference). Attributes whose names start with an underscore are
+        not registered, nor are any which are already registered.
+
+        Attributes held within the __dict__ of the target are read straight
+        from it when storing, with all of their values copied together
+        rather than through a getattr and copy per attribute.
+
+        :param copy_value: Whether the values should be copied when stored
+        :type copy_value: bool
+
+        :param history_only: If true, the labels are held in the history
+            of this memento but never passed to a serialiser
+        :type history_only: bool
+
+        :param exclude: Any attribute names which should not be registered
+        :type exclude: list(str, ...)
+
+        :return: The labels which were registered
+        :rtype: list(str, ...)
+        """
+        self._validate_target()
+
+        target = self._target()
+        exclude = set(exclude or list())
+
+        with self._lock:
+            exclude.update(self.labels())
+            labels = list()
+
+            for name, in_dict in _introspect(target):
+                if name in exclude:
+                    continue
+
+                self.register(
+                    name,
+                    copy_value=copy_value,
+                    history_only=history_only,
+                )
+
+                self._items_to_record[-1].in_dict = in_dict
+                labels.append(name)
+
+            return labels
 
     # --------------------------------------------------------------------------
     def unregister(self, label):
@@ -156,25 +287,32 @@ class Memento(object):
         :type label: str
         :return: 
         """
-        # -- To prevent list mutation during iteration
-        # -- we get a list of items we need to remove
-        items_to_remove = [
-            item
-            for item in self._items_to_record
-            if item.label == label
-        ]
-
-        # -- Iterate until all these items are gone
-        while items_to_remove:
-            item = items_to_remove.pop()
-
-            self._items_to_record.remove(item)
+        with self._lock:
+
+            # -- To prevent list mutation during iteration
+            # -- we get a list of items we need to remove
+            items_to_remove = [
+                item
+                for item in self._items_to_record
+                if item.label == label
+            ]
+
+            # -- Iterate until all these items are gone
+            while items_to_remove:
+                item = items_to_remove.pop()
+
+                self._items_to_record.remove(item)
+                self._has_async_getters = any(
+                    item.is_async
+                    for item in self._items_to_record
+                )
+                self._compiled = None
 
-            # -- Emit the event
-            self.unregistered.emit()
+                # -- Emit the event
+                self.unregistered.emit()
 
-            # -- Log the removal
-            log.debug(str(item))
+                # -- Log the removal
+                log.debug('%s', item)
 
     # --------------------------------------------------------------------------
     def store(self, serialise=False):
@@ -184,54 +322,50 @@ class Memento(object):
         
         :param serialise: If true a serialisation (to persistent data) will
             be performed once the store is complete. If no serialiser is 
-            registered this will be be skipped.
+            registered this will be be skipped. If the serialiser was
+            registered with a pool the write completes in the background,
+            and wait_for_serialisation can be used to wait on it.
         :type serialise: bool 
         """
-        if self._defer:
-            return
-
-        # -- Given that our target is a weak ref we need to access
-        # -- it through a call. If it has already been garbage
-        # -- collected we need to raise an exception
-        if not self._target():
-            raise exceptions.StorageError('Target object is no longer in scope')
+        with self._lock:
+            if self._defer:
+                return
 
-        # -- Define the dictionary to which we will store all the
-        # -- targets details
-        snapshot = dict()
+            self._validate_target()
 
-        # -- We specifically store information based on what has been
-        # -- registered wtih the recollection object, so we cycle that
-        for item in self._items_to_record:
-            snapshot[item.label] = item.get()
+            # -- Getters which are coroutines can only be awaited, which
+            # -- is something we cannot do here
+            if self._has_async_getters:
+                raise exceptions.StorageError(
+                    'Coroutine getters are registered, so astore must be used',
+                )
 
-        # -- Insert the new stored state at the start
-        # -- of the list
-        self._states.insert(0, snapshot)
+            # -- We specifically store information based on what has been
+            # -- registered wtih the recollection object
+            snapshot = self._snapshot(self._items_to_record)
 
-        # -- If our max states has been exceeded we start
-        # -- removing them
-        if self._max_states and len(self._states) > self._max_states:
-            self._states.pop()
+            self._push(snapshot)
 
-        # -- If we need to serialise, do so now
-        if serialise or self._always_serialise:
-            self.serialise()
+            # -- If we need to serialise, do so now
+            if serialise or self._always_serialise:
+                self.serialise()
 
-        # -- Add some debug output
-        log.debug('Stored Snapshot for %s' % self._target)
+            # -- Add some debug output
+            if constants.debugging():
+                log.debug('Stored Snapshot for %s', self._target)
 
-        # -- Emit the event
-        self.stored.emit()
+            # -- Emit the event
+            self.stored.emit()
 
-        # -- Call the store on any members this is marked as keeping
-        # -- in sync step with
-        with _SyncGroupPropogation(self) as sync_group:
-            for memento in sync_group:
-                memento.store(serialise=serialise)
+            # -- Call the store on any members this is marked as keeping
+            # -- in sync step with
+            if self._sync_group is not None:
+                with _SyncGroupPropogation(self) as sync_group:
+                    for memento in sync_group:
+                        memento.store(serialise=serialise)
 
     # --------------------------------------------------------------------------
-    def restore(self, index=0):
+    def restore(self, index=0, force=False):
         """
         This will restore the state of the target object to that of the
         given index. 
@@ -239,36 +373,504 @@ class Memento(object):
         An index of 0 is the current state - and therefore will have no 
         impact. An index of 1 will mean the state will go back 1 step. An
         index of 2 will mean the state will go back two steps and so forth.
+
+        Only the labels whose stored value differs from the live value
+        on the target are set, so setters are not called needlessly.
         
         :param index: The amount of steps to go back by.
         :type index: int 
+
+        :param force: If true every registered setter is called, regardless
+            of whether the value has changed
+        :type force: bool
+
+        :return: The labels which were set
+        :rtype: list(str, ...)
+        """
+        with self._lock:
+            with self.defer():
+                # -- Access the snapshot from the state stack
+                snapshot = self._states[index]
+                applied = self._set_state(snapshot, force=force)
+
+                # -- Log the removal
+                if constants.debugging():
+                    log.debug(
+                        'Restored State [%s] to : %s',
+                        index,
+                        snapshot,
+                    )
+
+                # -- Call the store on any members this is marked as keeping
+                # -- in sync step with
+                if self._sync_group is not None:
+                    with _SyncGroupPropogation(self) as sync_group:
+                        for memento in sync_group:
+                            memento.restore(index=index, force=force)
+
+            # -- Emit the event
+            self.restored.emit()
+
+            return applied
+
+    # --------------------------------------------------------------------------
+    def _set_state(self, snapshot, force=False, items=None):
+        """
+        Sets the given snapshot onto the target through the registered
+        setters, without storing or propagating. Unless forced, labels
+        whose live value matches the snapshot are skipped.
+
+        Attribute labels are set in a single call if the target implements
+        the bulk protocol (see _snapshot).
+
+        :return: The labels which were set
+        """
+        items = self._items_to_record if items is None else items
+        target = self._target()
+
+        bulk = _bulk_items(target, items)
+        live = _bulk_get(target, bulk) if bulk and not force else None
+        changes = dict()
+
+        applied = list()
+
+        # -- Cycle over all the items we have been told to record
+        for item in items:
+            value = snapshot.get(item.label, _MISSING)
+
+            # -- A deserialised state never holds history only labels,
+            # -- so anything it does not hold is left as it is
+            if value is _MISSING:
+                continue
+
+            if item in bulk:
+                if force or not _same(live.get(item.label, _MISSING), value):
+                    changes[item.label] = value
+                    applied.append(item.label)
+
+                continue
+
+            if not force and item.matches(value):
+                continue
+
+            item.set(value)
+            applied.append(item.label)
+
+        if changes:
+            self._write_values(target, changes)
+
+        return applied
+
+    # --------------------------------------------------------------------------
+    def _read_values(self, target, items, bulk=False):
+        """
+        Reads the values of the given items from the target in a single
+        pass, without copying them - either through the bulk protocol or
+        straight from the __dict__ of the target. This is a hook which
+        profiling wraps, as these values are never read through item.get.
+
+        :return: dict or None if the values cannot be read together
+        """
+        if bulk:
+            return _bulk_get(target, items)
+
+        return _dict_get(target, items)
+
+    # --------------------------------------------------------------------------
+    def _copy_values(self, values):
         """
+        Copies the given values of several labels together, so any values
+        shared between those labels remain shared within the snapshot. This
+        is a hook which profiling and stats wrap, as these values are never
+        copied through item._copy.
 
-        with self.defer():
-            # -- Access the snapshot from the state stack
+        :return: dict
+        """
+        return copy.deepcopy(values)
+
+    # --------------------------------------------------------------------------
+    def _write_values(self, target, changes):
+        """
+        Sets the given values onto the target through the bulk protocol.
+        This is a hook which profiling wraps, as these values are never
+        set through item.set.
+
+        :return: None
+        """
+        target.__recollection_setstate__(changes)
+
+    # --------------------------------------------------------------------------
+    def _snapshot(self, items):
+        """
+        Reads the values of the given items from the target.
+
+        If the target implements the bulk protocol, by defining both
+        __recollection_getstate__(labels) which returns a dictionary of
+        the values of the given attribute labels, and
+        __recollection_setstate__(state) which sets a dictionary of
+        values, then all attribute labels are read through a single call
+        rather than one getattr per label.
+
+        :return: dict
+        """
+        target = self._target()
+        bulk = _bulk_items(target, items)
+
+        if bulk:
+            values = self._read_values(target, bulk, bulk=True)
+
+        else:
+            values = self._read_values(target, items)
+
+        if not values:
+            return dict(
+                (item.label, item.get())
+                for item in items
+            )
+
+        # -- Values read from the __dict__ which should be copied are
+        # -- copied together. Values which can never be altered need no
+        # -- copy at all.
+        if not bulk:
+            copied = dict(
+                (item.label, values[item.label])
+                for item in items
+                if item._copy_value and item.label in values and
+                type(values[item.label]) not in _IMMUTABLE_TYPES
+            )
+
+            if copied:
+                values.update(self._copy_values(copied))
+
+        snapshot = dict()
+
+        for item in items:
+            value = values.get(item.label, _MISSING)
+
+            if value is _MISSING:
+                snapshot[item.label] = item.get()
+
+            elif item in bulk:
+                snapshot[item.label] = item._copy(value)
+
+            else:
+                snapshot[item.label] = value
+
+        return snapshot
+
+    # --------------------------------------------------------------------------
+    def checkpoint(self):
+        """
+        Takes a lightweight snapshot of the registered values of the target,
+        returning an opaque token which can later be given to rollback.
+
+        Unlike store, the snapshot is not added to the history, is never
+        serialised, emits no signals and is not propagated to the sync
+        group. This makes it suited to saving and restoring state a great
+        many times, such as when searching or simulating.
+
+        ..code-block:: python
+
+            >>> token = memento.checkpoint()
+            >>> try_move(game)
+            >>> memento.rollback(token)
+
+        :return: An opaque token
+        """
+        with self._lock:
+            compiled = self._compiled or self._compile()
+
+            target = self._validate_target()
+
+            return compiled, tuple([read(target) for read in compiled.readers])
+
+    # --------------------------------------------------------------------------
+    def rollback(self, token):
+        """
+        Sets the target back to the values it held when the given token was
+        returned by checkpoint. As with checkpoint, nothing is stored,
+        serialised, emitted or propagated. A token can be rolled back to
+        any number of times.
+
+        :param token: A token returned by checkpoint
+        :type token: object
+
+        :return: None
+        """
+        with self._lock:
+            compiled, values = token
+
+            # -- The values are held in the order of the items which were
+            # -- registered when the checkpoint was taken
+            if compiled is not self._compiled:
+                raise exceptions.StorageError(
+                    'The registered labels have changed since this '
+                    'checkpoint was taken',
+                )
+
+            target = self._validate_target()
+
+            # -- Setting a registered attribute on an Inference target
+            # -- would otherwise trigger a store
+            defer = self._defer
+            self._defer = True
+
+            try:
+                for write, value in zip(compiled.writers, values):
+                    write(target, value)
+
+            finally:
+                self._defer = defer
+
+    # --------------------------------------------------------------------------
+    def _compile(self):
+        """
+        Builds the readers and writers used by checkpoint and rollback from
+        the currently registered items.
+        """
+        self._compiled = _CompiledState(self._items_to_record)
+        return self._compiled
+
+    # --------------------------------------------------------------------------
+    async def astore(self, serialise=False):
+        """
+        This is the coroutine equivalent of store. Any getters which are
+        coroutine functions are awaited concurrently whilst taking the
+        snapshot, and any serialisation is performed off the event loop.
+
+        :param serialise: If true a serialisation (to persistent data) will
+            be performed once the store is complete.
+        :type serialise: bool
+        """
+        if self._defer:
+            return
+
+        self._validate_target()
+
+        pending = [
+            item
+            for item in self._items_to_record
+            if item.is_async
+        ]
+
+        snapshot = self._snapshot(
+            [
+                item
+                for item in self._items_to_record
+                if not item.is_async
+            ]
+        )
+
+        # -- Gather all the coroutine getters together
+        if pending:
+            values = await asyncio.gather(
+                *[item.aget() for item in pending]
+            )
+
+            for item, value in zip(pending, values):
+                snapshot[item.label] = value
+
+        self._push(snapshot)
+
+        if serialise or self._always_serialise:
+            await self.aserialise()
+
+        # -- Add some debug output
+        if constants.debugging():
+            log.debug('Stored Snapshot for %s', self._target)
+
+        # -- Emit the event
+        self.stored.emit()
+
+        if self._sync_group is not None:
+            with _SyncGroupPropogation(self) as sync_group:
+                for memento in sync_group:
+                    await memento.astore(serialise=serialise)
+
+    # --------------------------------------------------------------------------
+    async def arestore(self, index=0, force=False):
+        """
+        This is the coroutine equivalent of restore. Any setters which are
+        coroutine functions are awaited. Labels with coroutine getters are
+        always set, as their live value cannot be read without awaiting.
+
+        :param index: The amount of steps to go back by.
+        :type index: int
+
+        :param force: If true every registered setter is called, regardless
+            of whether the value has changed
+        :type force: bool
+
+        :return: The labels which were set
+        :rtype: list(str, ...)
+        """
+        self._defer = True
+
+        try:
             snapshot = self._states[index]
 
-            # -- Cycle over all the items we have been told to record
+            # -- Attributes can never need awaiting, so are set in the same
+            # -- way as restore, with everything else set one by one
+            applied = self._set_state(
+                snapshot,
+                force=force,
+                items=[
+                    item
+                    for item in self._items_to_record
+                    if item.is_attribute
+                ],
+            )
+
             for item in self._items_to_record:
-                item.set(snapshot[item.label])
+                if item.is_attribute or item.label not in snapshot:
+                    continue
 
-            # -- Log the removal
-            log.debug(
-                'Restored State [%s] to : %s' % (
+                value = snapshot[item.label]
+
+                if not force and not item.is_async and item.matches(value):
+                    continue
+
+                await item.aset(value)
+                applied.append(item.label)
+
+            if constants.debugging():
+                log.debug(
+                    'Restored State [%s] to : %s',
                     index,
                     snapshot,
                 )
-            )
 
-            # -- Call the store on any members this is marked as keeping
-            # -- in sync step with
-            with _SyncGroupPropogation(self) as sync_group:
-                for memento in sync_group:
-                    memento.restore(index=index)
+            if self._sync_group is not None:
+                with _SyncGroupPropogation(self) as sync_group:
+                    for memento in sync_group:
+                        await memento.arestore(index=index, force=force)
+
+        finally:
+            self._defer = False
+
+        await self.astore()
 
         # -- Emit the event
         self.restored.emit()
 
+        return applied
+
+    # --------------------------------------------------------------------------
+    async def aserialise(self):
+        """
+        This is the coroutine equivalent of serialise. The serialiser is
+        run in the default executor of the event loop, so the loop is never
+        blocked by the write.
+        """
+        self._validate_serialiser()
+
+        job = self._next_serialisation()
+
+        if job:
+            payload, patch, data = job
+
+            try:
+                result = await asyncio.get_event_loop().run_in_executor(
+                    None,
+                    functools.partial(self._write, payload, patch),
+                )
+
+                # -- If serialisation was handed to a pool we wait on that
+                # -- without blocking the loop
+                if isinstance(result, futures.Future):
+                    self._track(result, patch, data)
+                    await asyncio.wrap_future(result)
+
+            except Exception:
+                self._serialisation_failed()
+                raise
+
+            # -- Pooled serialisations are recorded once their future
+            # -- completes
+            if not isinstance(result, futures.Future):
+                self._serialised(patch, data)
+
+        log.debug('Serialised State on %s', self)
+
+    # --------------------------------------------------------------------------
+    async def adeserialise(self):
+        """
+        This is the coroutine equivalent of deserialise. The serialiser is
+        run in the default executor of the event loop, so the loop is never
+        blocked by the read.
+        """
+        self._validate_serialiser()
+
+        deserialisation = await asyncio.get_event_loop().run_in_executor(
+            None,
+            self._serialiser.deserialise,
+            self._serialisation_identifier,
+        )
+
+        if deserialisation:
+            self._push(deserialisation)
+            await self.arestore(index=0)
+            self._serialised_state = deserialisation
+
+        log.debug('Deserialised State to %s', self)
+
+    # --------------------------------------------------------------------------
+    def _validate_target(self):
+        # -- Given that our target is a weak ref we need to access
+        # -- it through a call. If it has already been garbage
+        # -- collected we need to raise an exception
+        target = self._target()
+
+        if target is None:
+            raise exceptions.StorageError('Target object is no longer in scope')
+
+        return target
+
+    # --------------------------------------------------------------------------
+    def _validate_serialiser(self):
+        # -- If we have no serialiser but we are being requested
+        # -- to serialise we raise an exception
+        if not self._serialiser:
+            raise Exception(
+                'No serialiser has been defined for this recollection object',
+            )
+
+    # --------------------------------------------------------------------------
+    def _push(self, snapshot):
+        """
+        Inserts the given snapshot as the most recent state, removing
+        the oldest state if the max states have been exceeded.
+        """
+        with self._lock:
+
+            # -- Insert the new stored state at the start, removing the
+            # -- oldest if our max states has been exceeded. Readers may be
+            # -- holding the previous history, so we replace it rather than
+            # -- altering it
+            self._states = self._states.push(snapshot, self._max_states)
+            self._pushed += 1
+
+            for observer in self._push_observers:
+                observer(snapshot)
+
+    # --------------------------------------------------------------------------
+    def _observe(self, attribute, observer):
+        """
+        Replaces the history observer (such as the columnar index) held in
+        the given attribute with the given observer, or with None, keeping
+        the push observers in step.
+        """
+        with self._lock:
+            current = getattr(self, attribute)
+
+            if current is not None:
+                self._push_observers.remove(current.append)
+
+            setattr(self, attribute, observer)
+
+            if observer is not None:
+                self._push_observers.append(observer.append)
+
     # --------------------------------------------------------------------------
     @contextmanager
     def defer(self, serialise=False):
@@ -280,10 +882,16 @@ class Memento(object):
         
         :return: None
         """
-        self._defer = True
-        yield None
-        self._defer = False
-        self.store(serialise=serialise)
+        with self._lock:
+            self._defer = True
+
+            try:
+                yield None
+
+            finally:
+                self._defer = False
+
+            self.store(serialise=serialise)
 
     # --------------------------------------------------------------------------
     @contextmanager
@@ -294,15 +902,23 @@ class Memento(object):
 
         :return: None
         """
-        self._defer = True
-        yield None
-        self._defer = False
+        with self._lock:
+            self._defer = True
+
+            try:
+                yield None
+
+            finally:
+                self._defer = False
 
     # --------------------------------------------------------------------------
     def register_serialiser(self,
                             serialiser,
                             identifier,
-                            always_serialise=False):
+                            always_serialise=False,
+                            incremental=False,
+                            full_serialise_interval=50,
+                            pool=None):
         """
         This allows you to register the serialiser you want to utilise.
 
@@ -319,7 +935,23 @@ class Memento(object):
         :param always_serialise: If true, this will always serialise regardless
             of the argument given during the store call.
         :type always_serialise: bool
-        
+
+        :param incremental: If true, and the serialiser supports patches,
+            only the labels which have changed since the last serialisation
+            are passed to the serialiser. This is ignored for serialisers
+            which do not support patches.
+        :type incremental: bool
+
+        :param full_serialise_interval: When serialising incrementally this
+            is the number of patches which may be written before a full
+            serialisation is performed again.
+        :type full_serialise_interval: int
+
+        :param pool: If given, serialisations are encoded and written by
+            the worker processes of this pool, and serialise will return
+            a future rather than blocking until the write is complete.
+        :type pool: recollection.SerialisationPool
+
         :return: None
         """
         # -- Validate that the serialiser is indeed a serialiser!
@@ -338,9 +970,18 @@ class Memento(object):
         self._serialisation_identifier = identifier
         self._always_serialise = always_serialise
 
+        # -- Any previously tracked state relates to a different
+        # -- location, so the next serialisation must be a full one
+        self._incremental = incremental and serialiser.SUPPORTS_PATCHES
+        self._full_serialise_interval = full_serialise_interval
+        self._serialised_state = None
+        self._patches_since_full = 0
+        self._serialisation_pool = pool
+
         # -- Log the removal
         log.debug(
-            'Serialiser Registered : %s' % serialiser.__class__.__name__,
+            'Serialiser Registered : %s',
+            serialiser.__class__.__name__,
         )
 
     # --------------------------------------------------------------------------
@@ -354,6 +995,9 @@ class Memento(object):
         self._serialiser = None
         self._always_serialise = False
         self._serialisation_identifier = ''
+        self._incremental = False
+        self._serialised_state = None
+        self._serialisation_pool = None
 
     # --------------------------------------------------------------------------
     def labels(self):
@@ -370,6 +1014,331 @@ class Memento(object):
         """
         return len(self._states)
 
+    # --------------------------------------------------------------------------
+    def states(self):
+        """
+        Returns a read-only view of every stored state, with the most recent
+        state first. The view is not affected by any stores or restores
+        which happen after it is taken, so it can be freely browsed from
+        any thread.
+
+        :return: tuple(types.MappingProxyType, ...)
+        """
+        return tuple(
+            types.MappingProxyType(snapshot)
+            for snapshot in self._states
+        )
+
+    # --------------------------------------------------------------------------
+    def diff(self, older=1, newer=0):
+        """
+        Returns the labels whose values differ between two stored states.
+        Like states, this can be called from any thread.
+
+        :param older: The index of the first state to compare
+        :type older: int
+
+        :param newer: The index of the second state to compare
+        :type newer: int
+
+        :return: dict(label: (older value, newer value))
+        """
+        # -- Take a single reference so both states come from the same
+        # -- point in time
+        states = self._states
+
+        older_state = states[older]
+        newer_state = states[newer]
+
+        return dict(
+            (label, (older_state.get(label), newer_state.get(label)))
+            for label in set(older_state).union(newer_state)
+            if label not in older_state or label not in newer_state or
+            _differs(older_state[label], newer_state[label])
+        )
+
+    # --------------------------------------------------------------------------
+    def enable_stats(self):
+        """
+        Starts recording counters and latencies for this memento, which
+        can be read through the stats method. Any previously recorded
+        stats are discarded.
+
+        :return: None
+        """
+        self.disable_stats()
+        self._stats = stats.instrument(self)
+
+    # --------------------------------------------------------------------------
+    def disable_stats(self):
+        """
+        Stops recording stats, removing all the overhead of recording them.
+
+        :return: None
+        """
+        if self._stats is not None:
+            stats.uninstrument(self)
+            self._stats = None
+
+    # --------------------------------------------------------------------------
+    def stats(self):
+        """
+        Returns the counters and latency histograms recorded since stats
+        were enabled. Latencies are given in nanoseconds, and each histogram
+        is bucketed by powers of two.
+
+        :return: dict, or None if stats are not enabled
+        """
+        if self._stats is None:
+            return None
+
+        return self._stats.snapshot()
+
+    # --------------------------------------------------------------------------
+    def state_id(self, index=0):
+        """
+        Returns the id of the state at the given index. Every state stored
+        is given an id one greater than the state before it, and unlike its
+        index the id of a state never changes.
+
+        :param index: The index of the state, as given to restore
+        :type index: int
+
+        :return: int
+        """
+        if not 0 <= index < len(self._states):
+            raise IndexError('State index out of range')
+
+        return self._pushed - 1 - index
+
+    # --------------------------------------------------------------------------
+    def index_of(self, state_id):
+        """
+        Returns the current index of the state with the given id, which can
+        be given to restore.
+
+        :param state_id: The id of the state
+        :type state_id: int
+
+        :return: int
+        """
+        index = self._pushed - 1 - state_id
+
+        if not 0 <= index < len(self._states):
+            raise IndexError('State %s is no longer held' % state_id)
+
+        return index
+
+    # --------------------------------------------------------------------------
+    def enable_columns(self, labels=None):
+        """
+        Starts keeping a columnar index of the history of the given labels,
+        so that the history of a single label can be read through history
+        without touching any of the other labels. Numeric labels are held
+        in arrays.
+
+        :param labels: The labels to index. If not given, every label
+            registered at this time is indexed.
+        :type labels: list(str, ...)
+
+        :return: None
+        """
+        with self._lock:
+            self._observe('_columns', columns.Columns(self, labels))
+
+    # --------------------------------------------------------------------------
+    def disable_columns(self):
+        """
+        Stops keeping the columnar index, discarding it.
+
+        :return: None
+        """
+        self._observe('_columns', None)
+
+    # --------------------------------------------------------------------------
+    def history(self, label, start=0, stop=None):
+        """
+        Returns the values the given label held across the states between
+        the given indices, most recent first. The ids of those states are
+        available through the ids attribute of the returned view.
+
+        If the label is within the columnar index the values are read from
+        it, otherwise they are taken from each state.
+
+        ..code-block:: python
+
+            >>> values = memento.history('score', 0, 500)
+            >>> plot(values.ids, values)
+
+        :param label: The label to read the history of
+        :type label: str
+
+        :param start: The index of the most recent state to include
+        :type start: int
+
+        :param stop: The index to stop at (exclusive). If not given, every
+            state from the start index is included.
+        :type stop: int
+
+        :return: recollection.columns.HistoryView
+        """
+        with self._lock:
+            indexed = self._columns
+
+            if indexed is not None and label in indexed:
+                return indexed.view(label, start, stop)
+
+            # -- The view is ordered oldest first, so we reverse the
+            # -- history to read it
+            column = columns._Column(self._pushed - len(self._states))
+
+            for snapshot in reversed(self._states):
+                column.append(snapshot.get(label))
+
+            return column.view(start, stop)
+
+    # --------------------------------------------------------------------------
+    def enable_indexes(self, labels=None):
+        """
+        Starts keeping a hash index of the values held by the given labels
+        in each state, so that find can look states up rather than
+        scanning every state.
+
+        :param labels: The labels to index. If not given, every label
+            registered at this time is indexed.
+        :type labels: list(str, ...)
+
+        :return: None
+        """
+        with self._lock:
+            self._observe('_indexes', indexes.Indexes(self, labels))
+
+    # --------------------------------------------------------------------------
+    def disable_indexes(self):
+        """
+        Stops keeping the hash indexes, discarding them.
+
+        :return: None
+        """
+        self._observe('_indexes', None)
+
+    # --------------------------------------------------------------------------
+    def find(self, label, match, ids=False):
+        """
+        Returns the states in which the given label held the given value,
+        most recent first. If a callable is given instead of a value, it is
+        called with the value of the label and the states for which it
+        returns True are returned.
+
+        If the label is indexed (see enable_indexes) the states are looked
+        up from the index, with a predicate only being called once for each
+        distinct value. Otherwise every state is scanned.
+
+        ..code-block:: python
+
+            >>> # -- Restore the most recent state with a dark theme
+            >>> memento.restore(memento.find('theme', 'dark')[0])
+            >>>
+            >>> memento.find('lives', lambda lives: lives['Child'] == 0)
+
+        :param label: The label to search
+        :type label: str
+
+        :param match: The value to find, or a callable returning whether
+            a value matches
+        :type match: object or callable
+
+        :param ids: If true, the ids of the states are returned rather
+            than their indices
+        :type ids: bool
+
+        :return: list(int, ...)
+        """
+        with self._lock:
+            indexed = self._indexes
+
+            if indexed is not None and label in indexed:
+                found = indexed.find(label, match)
+
+                if ids:
+                    return found
+
+                return [self._pushed - 1 - state_id for state_id in found]
+
+            if callable(match):
+                test = match
+
+            else:
+                # -- Compare in the same way as the indexes, so the results
+                # -- do not depend on whether the label is indexed
+                test = lambda value: indexes._equal(value, match)
+
+            found = [
+                index
+                for index, snapshot in enumerate(self._states)
+                if label in snapshot and test(snapshot[label])
+            ]
+
+            if ids:
+                return [self._pushed - 1 - index for index in found]
+
+            return found
+
+    # --------------------------------------------------------------------------
+    def fork(self, target=None):
+        """
+        Returns a new memento which shares all of the history of this one,
+        but from which new states diverge independently. The history is
+        never altered (only ever replaced) so it is shared rather than
+        copied, making a fork cheap regardless of how many states it holds.
+
+        Forking onto a different target (such as a clone of this memento's
+        target) registers the same labels against it, with any getters or
+        setters which are methods bound to this memento's target being
+        re-bound to the new one.
+
+        Signals, serialisers, sync groups and stats are not carried over
+        to the fork.
+
+        ..code-block:: python
+
+            >>> for move in moves:
+            ...     board = copy.deepcopy(game.board)
+            ...     branch = memento.fork(board)
+            ...     board.play(move)
+            ...     branch.store()
+
+        :param target: The object the fork should store the state of. If
+            not given, the fork stores the state of the same target.
+        :type target: object
+
+        :return: Memento
+        """
+        with self._lock:
+            original = self._validate_target()
+
+            target = original if target is None else target
+
+            forked = Memento(
+                target,
+                max_states=self._max_states,
+                thread_safe=self._thread_safe,
+            )
+
+            forked._items_to_record = [
+                item.rebind(original, forked._target)
+                for item in self._items_to_record
+            ]
+            forked._has_async_getters = self._has_async_getters
+
+            # -- Both mementos replace, rather than alter, the history as
+            # -- they store so it can be safely shared. Each push only adds
+            # -- to the front of the chain, so neither side ever copies it.
+            forked._states = self._states
+            forked._pushed = self._pushed
+
+            return forked
+
     # --------------------------------------------------------------------------
     def group(self, other):
         """
@@ -383,30 +1352,23 @@ class Memento(object):
             group then all three groups will go into lock-step together.
         :type other: memento.Memento 
         """
-        # -- Cycle over the sync groups, if we find a sync group
-        # -- which contains this recollection we add the other to the
-        # -- same group
-        for idx in range(len(Memento._SYNC_GROUPS)):
-            if self in Memento._SYNC_GROUPS[idx]:
-                if other not in Memento._SYNC_GROUPS[idx]:
-                    Memento._SYNC_GROUPS[idx].append(other)
-                return
+        # -- If either memento is already grouped we extend that group,
+        # -- otherwise we need to define a new sync group
+        group = self._sync_group or other._sync_group or _SyncGroup()
 
-        # -- To get here we need to define a new sync group
-        Memento._SYNC_GROUPS.append(
-            [
-                self,
-                other,
-            ],
-        )
+        # -- Bring every member of both groups into the one group
+        for memento in self.sync_group() + other.sync_group():
+            group.add(memento)
+
+        group.share_lock()
 
         # -- Log the removal
-        log.debug(
-            '%s added to group along with : %s' % (
+        if constants.debugging():
+            log.debug(
+                '%s added to group along with : %s',
                 self,
                 self.sync_group(),
             )
-        )
 
     # --------------------------------------------------------------------------
     def sync_group(self):
@@ -416,9 +1378,8 @@ class Memento(object):
          
         :return: list(mement.Memento, ...) 
         """
-        for group in Memento._SYNC_GROUPS:
-            if self in group:
-                return list(group)
+        if self._sync_group is not None:
+            return list(self._sync_group.members)
 
         # -- If there is no group, we consider it to be alone
         # -- in its own group
@@ -430,23 +1391,192 @@ class Memento(object):
         Providing a serialiser has been registered, this will intiate a 
         serialisation process - allowing this recollection's current state to 
         be stored in a persistent way. 
+
+        :return: If the serialiser was registered with a pool this will
+            return a concurrent.futures.Future which completes once the
+            state has been written, otherwise None.
         """
-        # -- If we have no serialiser but we are being requested
-        # -- to serialise we raise an exception
-        if not self._serialiser:
-            raise Exception(
-                'No serialiser has been defined for this recollection object',
+        self._validate_serialiser()
+
+        with self._lock:
+            job = self._next_serialisation()
+
+            if not job:
+                return None
+
+            payload, patch, data = job
+
+            try:
+                result = self._write(payload, patch)
+
+            except Exception:
+                self._serialisation_failed()
+                raise
+
+            if not isinstance(result, futures.Future):
+                self._serialised(patch, data)
+
+            else:
+                self._track(result, patch, data)
+
+        # -- Log the removal
+        log.debug('Serialised State on %s', self)
+
+        return result
+
+    # --------------------------------------------------------------------------
+    def _next_serialisation(self):
+        """
+        Works out what needs to be written to serialise the current state.
+        The record of what has been persisted is only updated once the
+        write has succeeded (see _serialised).
+
+        :return: tuple(payload, patch, data) or None if there is nothing
+            to write, where data is the full state being persisted
+        """
+        # -- Remove any labels which should never be persisted
+        data = self._serialisable(self._states[0])
+        job = None
+
+        # -- If we're serialising incrementally and have a persisted state
+        # -- to compare against we only need to write what has changed
+        if self._incremental and self._serialised_state is not None and \
+                self._patches_since_full < self._full_serialise_interval:
+
+            patch = dict(
+                (label, value)
+                for label, value in data.items()
+                if label not in self._serialised_state or
+                _differs(self._serialised_state[label], value)
             )
 
-        # -- Ask the registered serialise to serialise our latest
-        # -- state
-        self._serialiser.serialise(
-            self._states[0],
-            self._serialisation_identifier,
+            # -- If nothing has changed there is nothing to write
+            if patch:
+                job = (patch, True, data)
+
+        else:
+            # -- Ask the registered serialise to serialise our latest
+            # -- state
+            job = (data, False, data)
+
+        return job
+
+    # --------------------------------------------------------------------------
+    def _serialised(self, patch, data):
+        """
+        Records the given state as having been persisted, so any following
+        incremental serialisation is made relative to it.
+        """
+        with self._serialisation_lock:
+            self._serialised_state = data
+            self._patches_since_full = self._patches_since_full + 1 \
+                if patch else 0
+
+    # --------------------------------------------------------------------------
+    def _serialisation_failed(self):
+        """
+        Forgets what has been persisted after a failed write, as we can no
+        longer be sure of it, so the next serialisation is written in full.
+        """
+        with self._serialisation_lock:
+            self._serialised_state = None
+
+    # --------------------------------------------------------------------------
+    def _track(self, future, patch, data):
+        """
+        Holds onto the future of a serialisation handed to the pool until
+        it completes, at which point its outcome is recorded.
+        """
+        with self._serialisation_lock:
+            self._in_flight.add(future)
+
+        future.add_done_callback(
+            functools.partial(self._pool_serialised, patch, data),
         )
 
-        # -- Log the removal
-        log.debug('Serialised State on %s' % self)
+    # --------------------------------------------------------------------------
+    def _pool_serialised(self, patch, data, future):
+        """
+        Called once a serialisation handed to the pool has completed
+        """
+        if future.cancelled() or future.exception() is not None:
+            self._serialisation_failed()
+
+            log.error(
+                'Serialisation of %s failed : %s',
+                self,
+                'cancelled' if future.cancelled() else future.exception(),
+            )
+
+        else:
+            self._serialised(patch, data)
+
+        # -- Only once its outcome is recorded is the serialisation
+        # -- considered complete
+        with self._serialisation_lock:
+            self._in_flight.discard(future)
+            self._serialisation_lock.notify_all()
+
+    # --------------------------------------------------------------------------
+    def wait_for_serialisation(self, timeout=None):
+        """
+        Blocks until every serialisation which has been handed to the
+        serialisation pool (whether by serialise, store or a decorated
+        method) has been written.
+
+        Any failures are logged as they happen, but the first failure of
+        the serialisations waited on is also raised here.
+
+        :param timeout: The most seconds to wait. If None this will wait
+            for as long as it takes.
+        :type timeout: float
+
+        :return: True if every serialisation completed within the timeout
+        :rtype: bool
+        """
+        with self._serialisation_lock:
+            pending = list(self._in_flight)
+
+            completed = self._serialisation_lock.wait_for(
+                lambda: not any(
+                    future in self._in_flight
+                    for future in pending
+                ),
+                timeout=timeout,
+            )
+
+        for future in pending:
+            if future.done() and not future.cancelled() and \
+                    future.exception() is not None:
+                raise future.exception()
+
+        return completed
+
+    # --------------------------------------------------------------------------
+    def _write(self, data, patch=False):
+        """
+        Hands the given data to the registered serialiser, or to the
+        serialisation pool if one was registered.
+        """
+        if self._serialisation_pool:
+            return self._serialisation_pool.submit(
+                self._serialiser,
+                data,
+                self._serialisation_identifier,
+                patch=patch,
+            )
+
+        if patch:
+            self._serialiser.serialise_patch(
+                data,
+                self._serialisation_identifier,
+            )
+
+        else:
+            self._serialiser.serialise(
+                data,
+                self._serialisation_identifier,
+            )
 
     # --------------------------------------------------------------------------
     def deserialise(self):
@@ -454,25 +1584,54 @@ class Memento(object):
         This will initialise the target with the persistently stored
         state (if available). 
         """
-        # -- If we have no serialiser but we are being requested
-        # -- to serialise we raise an exception
-        if not self._serialiser:
-            raise Exception(
-                'No serialiser has been defined for this recollection object',
-            )
+        self._validate_serialiser()
 
         # -- Get the data from the deserialisation process
-        deserialisation = self._serialiser.deserialise(
-            self._serialisation_identifier,
+        self._apply_deserialisation(
+            self._serialiser.deserialise(
+                self._serialisation_identifier,
+            ),
         )
 
+    # --------------------------------------------------------------------------
+    def _apply_deserialisation(self, deserialisation):
+        """
+        Inserts the given deserialised state into the history and restores
+        the target to it.
+        """
         # -- Providing that process was successful we add the returned
         # -- state into recollection and restore to it
         if deserialisation:
-            self._states.insert(0, deserialisation)
-            self.restore(index=0)
+            with self._lock:
+                self._push(deserialisation)
+                self.restore(index=0)
+
+                # -- This is now what is persisted, so any incremental
+                # -- serialisation can be relative to it
+                self._serialised_state = deserialisation
+
+        log.debug('Deserialised State to %s', self)
+
+    # --------------------------------------------------------------------------
+    def _serialisable(self, snapshot):
+        """
+        Returns the given snapshot without any labels which are registered
+        as being history only.
+        """
+        history_only = [
+            item.label
+            for item in self._items_to_record
+            if item.history_only
+        ]
 
-        log.debug('Deserialised State to %s' % self)
+        if not history_only:
+            return snapshot
+
+        return dict(
+            (label, value)
+            for label, value in snapshot.items()
+            if label not in history_only
+        )
 
     # --------------------------------------------------------------------------
     @staticmethod
@@ -559,7 +1718,8 @@ class Memento(object):
 
                 except AttributeError:
                     log.warning(
-                        'Could not store state after call to %s' % func,
+                        'Could not store state after call to %s',
+                        func,
                     )
 
                 return result
@@ -569,6 +1729,70 @@ class Memento(object):
         return serialise_after_inner
 
 
+# ------------------------------------------------------------------------------
+class _SyncGroup(object):
+    """
+    This is an internal and private class holding the members of a lock-step
+    group. Every member references its group directly, so storing and
+    restoring never needs to search through the groups of other mementos.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self):
+        self.members = list()
+
+        # -- The members being processed are tracked per thread, as
+        # -- propagation on one thread has no bearing on another
+        self._local = threading.local()
+
+    # --------------------------------------------------------------------------
+    def add(self, memento):
+        if memento not in self.members:
+            self.members.append(memento)
+
+        memento._sync_group = self
+
+    # --------------------------------------------------------------------------
+    def remove(self, memento):
+        """
+        Removes the given member from the group, so it is no longer stored
+        or restored alongside the others. The member keeps its reference to
+        the group, so it may still propagate to the remaining members.
+        """
+        if memento in self.members:
+            self.members.remove(memento)
+
+    # --------------------------------------------------------------------------
+    def share_lock(self):
+        """
+        Members of a sync group store and restore one another, so if any of
+        them are thread safe they must all share the same lock. Otherwise two
+        threads working on different members could each hold one lock whilst
+        waiting on the other.
+        """
+        locks = [
+            memento._lock
+            for memento in self.members
+            if memento._thread_safe
+        ]
+
+        if not locks:
+            return
+
+        for memento in self.members:
+            memento._thread_safe = True
+            memento._lock = locks[0]
+
+    # --------------------------------------------------------------------------
+    def processing(self):
+        try:
+            return self._local.processing
+
+        except AttributeError:
+            self._local.processing = list()
+            return self._local.processing
+
+
 # ------------------------------------------------------------------------------
 class _SyncGroupPropogation(object):
     """
@@ -577,12 +1801,11 @@ class _SyncGroupPropogation(object):
     will not continually call one-another when performing a lock-step call.
     """
 
-    _ACTIVELY_PROCESSING = list()
-
     # --------------------------------------------------------------------------
     def __init__(self, memento):
         self._memento = memento
         self._processing_in_context = list()
+        self._actively_processing = memento._sync_group.processing()
 
     # --------------------------------------------------------------------------
     def __enter__(self):
@@ -590,7 +1813,7 @@ class _SyncGroupPropogation(object):
         # -- If our recollection instance is already being processes then
         # -- there is nothing more to do and we return an empty
         # -- list
-        if self._memento in _SyncGroupPropogation._ACTIVELY_PROCESSING:
+        if self._memento in self._actively_processing:
             return list()
 
         # -- Get a list of members to actively process
@@ -598,7 +1821,7 @@ class _SyncGroupPropogation(object):
 
         # -- Add in the list of things we need to process, to ensure
         # -- they will not get re-processed
-        _SyncGroupPropogation._ACTIVELY_PROCESSING.extend(
+        self._actively_processing.extend(
             self._processing_in_context
         )
 
@@ -614,11 +1837,246 @@ class _SyncGroupPropogation(object):
         # -- Now that we are done processing we need to remove any
         # -- instances out of the class list.
         while self._processing_in_context:
-            self._ACTIVELY_PROCESSING.remove(
+            self._actively_processing.remove(
                 self._processing_in_context.pop(),
             )
 
 
+# ------------------------------------------------------------------------------
+# -- Returned when reading an attribute which the target does not have
+_MISSING = object()
+
+
+# ------------------------------------------------------------------------------
+# -- Values of these types can never be altered, so never need to be copied
+_IMMUTABLE_TYPES = frozenset(
+    (int, float, complex, bool, str, bytes, type(None)),
+)
+
+
+# ------------------------------------------------------------------------------
+class _CompiledState(object):
+    """
+    This is an internal and private class which holds a reader and a writer
+    for each registered item. These access the target directly, without
+    any of the bookkeeping of the items themselves.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, items):
+        for item in items:
+            if item.is_async or inspect.iscoroutinefunction(item._setter):
+                raise exceptions.StorageError(
+                    'Coroutine getters or setters are registered, which '
+                    'cannot be checkpointed',
+                )
+
+        self.readers = tuple(_reader(item) for item in items)
+        self.writers = tuple(_writer(item) for item in items)
+
+
+# ------------------------------------------------------------------------------
+def _reader(item):
+    """
+    Returns a callable which takes the target and returns the (copied if
+    required) value of the given item.
+    """
+    if item._get_is_callable:
+        getter = item._getter
+        read = lambda target: getter()
+
+    else:
+        read = operator.attrgetter(item._getter)
+
+    if item._copy_value:
+        return lambda target: _copied(read(target))
+
+    return read
+
+
+# ------------------------------------------------------------------------------
+def _writer(item):
+    """
+    Returns a callable which takes the target and a value, and sets that
+    value through the given item. Copied values are copied again so the
+    checkpoint cannot be altered through the target.
+    """
+    if item._set_is_callable:
+        setter = item._setter
+        write = lambda target, value: setter(value)
+
+    else:
+        label = item.label
+        write = lambda target, value: setattr(target, label, value)
+
+    if item._copy_value:
+        return lambda target, value: write(target, _copied(value))
+
+    return write
+
+
+# ------------------------------------------------------------------------------
+def _copied(value):
+    """
+    Returns a deep copy of the given value, skipping the copy entirely for
+    values which cannot be altered.
+    """
+    if type(value) in _IMMUTABLE_TYPES:
+        return value
+
+    return copy.deepcopy(value)
+
+
+# ------------------------------------------------------------------------------
+def _rebind(accessor, original, target):
+    """
+    Returns the given getter or setter bound to the given target if it is
+    a method bound to the original target, otherwise it is returned as is.
+    """
+    if isinstance(accessor, types.MethodType) and \
+            accessor.__self__ is original:
+        return types.MethodType(accessor.__func__, target)
+
+    return accessor
+
+
+# ------------------------------------------------------------------------------
+def _bulk_items(target, items):
+    """
+    Returns the set of the given items which should be read and written
+    through the bulk protocol of the target, which is empty if the target
+    does not implement it.
+    """
+    cls = type(target)
+
+    if not hasattr(cls, '__recollection_getstate__') or \
+            not hasattr(cls, '__recollection_setstate__'):
+        return frozenset()
+
+    return frozenset(
+        item
+        for item in items
+        if item.is_attribute
+    )
+
+
+# ------------------------------------------------------------------------------
+def _dict_get(target, items):
+    """
+    Returns the values of the given items which are held within the
+    __dict__ of the target (having been registered by register_all),
+    without copying them.
+    """
+    source = getattr(target, '__dict__', None)
+
+    if source is None:
+        return None
+
+    return dict(
+        (item.label, source[item.label])
+        for item in items
+        if item.in_dict and item.label in source
+    )
+
+
+# ------------------------------------------------------------------------------
+def _introspect(target):
+    """
+    Returns the names of the public attributes of the given target, along
+    with whether each can be read directly from its __dict__.
+    """
+    cls = type(target)
+
+    if dataclasses.is_dataclass(target):
+        names = [field.name for field in dataclasses.fields(target)]
+
+    elif hasattr(target, '__dict__'):
+        names = list(vars(target))
+
+    else:
+        names = list()
+
+        for base in reversed(cls.__mro__):
+            slots = base.__dict__.get('__slots__', ())
+
+            if isinstance(slots, six.string_types):
+                slots = [slots]
+
+            names.extend(
+                name
+                for name in slots
+                if name not in ('__dict__', '__weakref__')
+            )
+
+    source = getattr(target, '__dict__', dict())
+    attributes = list()
+    seen = set()
+
+    for name in names:
+        if name.startswith('_') or name in seen:
+            continue
+
+        seen.add(name)
+
+        # -- Anything which is a memento is managing state rather than
+        # -- holding it, such as the memento of an Inference object
+        if isinstance(source.get(name), Memento):
+            continue
+
+        # -- Data descriptors (such as properties) take precedence over
+        # -- the __dict__, so those must always be read through getattr
+        descriptor = getattr(cls, name, None)
+        in_dict = name in source and not hasattr(descriptor, '__set__')
+
+        attributes.append((name, in_dict))
+
+    return attributes
+
+
+# ------------------------------------------------------------------------------
+def _bulk_get(target, items):
+    """
+    Returns the live values of the given items through the bulk protocol
+    of the target, without copying them.
+    """
+    return target.__recollection_getstate__(
+        [item.label for item in items],
+    )
+
+
+# ------------------------------------------------------------------------------
+def _same(live, value):
+    """
+    Returns True if the live value does not need to be set to the given
+    value, as it is either the same object or is of the same type and
+    compares as equal.
+    """
+    if live is _MISSING:
+        return False
+
+    return live is value or not _differs(live, value)
+
+
+# ------------------------------------------------------------------------------
+def _differs(a, b):
+    """
+    Returns True if the two values should be considered different. Values
+    of different types (such as 1 and 1.0, or 1 and True) are always
+    considered different, even though they compare as equal, as are values
+    which cannot be compared in a truthful way (such as arrays which compare
+    element-wise).
+    """
+    if type(a) is not type(b):
+        return True
+
+    # noinspection PyBroadException
+    try:
+        return bool(a != b)
+
+    except Exception:
+        return True
+
+
 # ------------------------------------------------------------------------------
 class _ItemToRecord(object):
     """
@@ -627,9 +2085,11 @@ class _ItemToRecord(object):
     """
 
     # --------------------------------------------------------------------------
-    def __init__(self, target, label, getter, setter, copy_value):
+    def __init__(self, target, label, getter, setter, copy_value,
+                 history_only=False):
 
         self.label = label
+        self.history_only = history_only
 
         self._target = target
         self._getter = getter
@@ -641,6 +2101,19 @@ class _ItemToRecord(object):
         self._get_is_callable = callable(self._getter)
         self._set_is_callable = callable(self._setter)
 
+        # -- Labels read and written as attributes of the target can be
+        # -- handled together through the bulk protocol
+        self.is_attribute = not (
+            self._get_is_callable or self._set_is_callable
+        )
+
+        # -- Labels registered by register_all may be read straight from
+        # -- the __dict__ of the target
+        self.in_dict = False
+
+        # -- Coroutine getters can only be read through aget
+        self.is_async = inspect.iscoroutinefunction(self._getter)
+
         if not isinstance(self.label, six.string_types):
             raise TypeError(
                 'When giving a partial or method you must specify a '
@@ -655,6 +2128,33 @@ class _ItemToRecord(object):
             self._setter,
         )
 
+    # --------------------------------------------------------------------------
+    def rebind(self, original, target):
+        """
+        Returns a copy of this item which reads from, and writes to, the
+        given target. Getters and setters which are methods bound to the
+        original target are bound to the new target instead.
+
+        :param original: The object this item currently targets
+        :type original: object
+
+        :param target: A weak reference to the object to target
+        :type target: weakref.ref
+
+        :return: _ItemToRecord
+        """
+        item = _ItemToRecord(
+            target=target,
+            label=self.label,
+            getter=_rebind(self._getter, original, target()),
+            setter=_rebind(self._setter, original, target()),
+            copy_value=self._copy_value,
+            history_only=self.history_only,
+        )
+        item.in_dict = self.in_dict
+
+        return item
+
     # --------------------------------------------------------------------------
     def _copy(self, item):
         if self._copy_value:
@@ -680,12 +2180,50 @@ class _ItemToRecord(object):
                 ),
             )
 
+    # --------------------------------------------------------------------------
+    def matches(self, value):
+        """
+        Returns whether the live value on the target is the same as the
+        given value, in which case there is no need to set it. The live
+        value is read without being copied.
+
+        :param value: The stored value to compare against
+        :type value: object
+
+        :return: bool
+        """
+        if self._get_is_callable:
+            live = self._getter()
+
+        else:
+            live = getattr(self._target(), self._getter, _MISSING)
+
+        return _same(live, value)
+
+    # --------------------------------------------------------------------------
+    async def aget(self):
+        # -- We use a deepcopy to ensure that we're not storing
+        # -- mutable values
+        if self.is_async:
+            return self._copy(await self._getter())
+
+        return self.get()
+
+    # --------------------------------------------------------------------------
+    async def aset(self, *args, **kwargs):
+        # -- Setters which are coroutine functions return an awaitable
+        # -- which we must await for the value to actually be set
+        result = self.set(*args, **kwargs)
+
+        if inspect.isawaitable(result):
+            await result
+
     # --------------------------------------------------------------------------
     def set(self, *args, **kwargs):
         # -- If it s callable we call the method/function with the
         # -- value in the stored state as the argument
         if self._set_is_callable:
-            self._setter(*args, **kwargs)
+            return self._setter(*args, **kwargs)
 
         # -- The setter is not callable, so we assume its a property
         # -- to be set directly
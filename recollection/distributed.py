@@ -0,0 +1,449 @@
+"""
+This module allows memento objects which live in different processes to
+be put into lock-step with one another, in the same way that Memento.group
+puts memento objects within a single process into lock-step.
+
+A SyncCoordinator is run by one process, and a SyncLink is created for each
+memento which should join the group. Whenever a memento stores or restores,
+that event is sent to the coordinator which numbers it and passes it on to
+every other link. Each link then applies the events it receives to its own
+memento (and any mementos grouped with it) when polled.
+
+    ..code-block:: python
+
+        >>> import recollection
+        >>>
+        >>> # -- Within the coordinating process
+        >>> coordinator = recollection.SyncCoordinator()
+        >>>
+        >>> # -- Within each process, given coordinator.address
+        >>> link = recollection.SyncLink(memento, address)
+        >>>
+        >>> # -- Apply any stores or restores made by other processes
+        >>> link.poll()
+
+Connections are made through multiprocessing.connection, and therefore use
+a unix domain socket on posix platforms and a named pipe on Windows.
+"""
+from .constants import log
+from .core import _SyncGroupPropogation
+
+import queue
+import threading
+from contextlib import contextmanager
+from contextlib import nullcontext
+from multiprocessing import connection
+
+
+# ------------------------------------------------------------------------------
+_STORE = 'store'
+_RESTORE = 'restore'
+
+# -- Sent by the coordinator to a link once it will receive relayed events
+_JOINED = 'joined'
+
+# -- The errors raised when receiving from a connection which has been
+# -- closed. A connection closed by another thread whilst receiving will
+# -- raise a TypeError, as its handle has been removed.
+_DISCONNECTED = (OSError, EOFError, TypeError)
+
+
+# ------------------------------------------------------------------------------
+class SyncCoordinator(object):
+    """
+    Accepts connections from SyncLinks and relays the events sent by each
+    link to every other link. Every batch of events is given a sequence
+    number, and batches are relayed to all the links in the same order.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, address=None, family=None, authkey=None):
+        """
+        :param address: The address to listen on. If not given an address
+            is generated, which can be read from the address property.
+        :type address: str
+
+        :param family: The multiprocessing.connection family to listen with.
+            If not given the default for the platform is used.
+        :type family: str
+
+        :param authkey: If given, links must give the same key to connect
+        :type authkey: bytes
+        """
+        self._lock = threading.Lock()
+        self._connections = list()
+        self._sequence = 0
+        self._closed = False
+
+        self._listener = _Listener(
+            self._connected,
+            address=address,
+            family=family,
+            authkey=authkey,
+        )
+
+    # --------------------------------------------------------------------------
+    def __enter__(self):
+        return self
+
+    # --------------------------------------------------------------------------
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # --------------------------------------------------------------------------
+    @property
+    def address(self):
+        """
+        The address links should connect to
+
+        :return: str
+        """
+        return self._listener.address
+
+    # --------------------------------------------------------------------------
+    def close(self):
+        """
+        Stops accepting links and disconnects all the links which are
+        currently connected.
+
+        :return: None
+        """
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+            connections = list(self._connections)
+
+        self._listener.close()
+
+        for link in connections:
+            link.close()
+
+    # --------------------------------------------------------------------------
+    def _connected(self, link):
+        with self._lock:
+            if self._closed:
+                link.close()
+                return
+
+            self._connections.append(link)
+
+            # -- The link waits for this before it is grouped with its
+            # -- memento, so nothing it sends can be relayed before the
+            # -- other links are able to receive it. Sending under the lock
+            # -- means it always arrives ahead of any relayed events.
+            try:
+                link.send(_JOINED)
+
+            except (OSError, ValueError):
+                pass
+
+        thread = threading.Thread(target=self._serve, args=(link,))
+        thread.daemon = True
+        thread.start()
+
+    # --------------------------------------------------------------------------
+    def _serve(self, link):
+        while True:
+            try:
+                events = link.recv()
+
+            except _DISCONNECTED:
+                break
+
+            # -- Relaying under the lock ensures every link receives the
+            # -- batches in sequence order
+            with self._lock:
+                self._sequence += 1
+
+                for other in self._connections:
+                    if other is link:
+                        continue
+
+                    try:
+                        other.send((self._sequence, events))
+
+                    except (OSError, ValueError):
+                        pass
+
+        with self._lock:
+            if link in self._connections:
+                self._connections.remove(link)
+
+        link.close()
+
+
+# ------------------------------------------------------------------------------
+class SyncLink(object):
+    """
+    Joins a memento to the group relayed by a SyncCoordinator. The link is
+    grouped with the memento as though it were a memento itself, so any
+    store or restore of the memento (or anything grouped with it) is sent
+    on to the other processes.
+
+    Events from the other processes are received in the background but are
+    only applied when poll is called, so they are applied on a thread of
+    your choosing.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, memento, address, authkey=None):
+        """
+        :param memento: The memento to join to the group
+        :type memento: recollection.Memento
+
+        :param address: The address of the SyncCoordinator
+        :type address: str
+
+        :param authkey: The key the SyncCoordinator was given, if any
+        :type authkey: bytes
+        """
+        # -- These allow the link to be grouped alongside mementos
+        self._sync_group = None
+        self._thread_safe = False
+        self._lock = nullcontext()
+
+        self._connection = connection.Client(address, authkey=authkey)
+
+        # -- Wait until the coordinator will relay to us, as anything sent
+        # -- before then would not reach this link
+        self._connection.recv()
+
+        self._send_lock = threading.Lock()
+        self._received = queue.Queue()
+        self._batch = None
+
+        # -- The sequence number of the last batch which was applied
+        self.sequence = 0
+
+        self._thread = threading.Thread(target=self._receive)
+        self._thread.daemon = True
+        self._thread.start()
+
+        memento.group(self)
+
+    # --------------------------------------------------------------------------
+    def sync_group(self):
+        """
+        Returns all the members of the group this link belongs to
+
+        :return: list
+        """
+        if self._sync_group is not None:
+            return list(self._sync_group.members)
+
+        return [self]
+
+    # --------------------------------------------------------------------------
+    def store(self, serialise=False):
+        """
+        Called when a member of the group stores, sending the store on
+        to the other processes.
+        """
+        self._send((_STORE, serialise))
+
+    # --------------------------------------------------------------------------
+    def restore(self, index=0, force=False):
+        """
+        Called when a member of the group restores, sending the restore on
+        to the other processes.
+        """
+        self._send((_RESTORE, (index, force)))
+
+    # --------------------------------------------------------------------------
+    async def astore(self, serialise=False):
+        self.store(serialise=serialise)
+
+    # --------------------------------------------------------------------------
+    async def arestore(self, index=0, force=False):
+        self.restore(index=index, force=force)
+
+    # --------------------------------------------------------------------------
+    @contextmanager
+    def batch(self):
+        """
+        Gathers all the stores and restores made within the context and
+        sends them to the other processes together once it exits.
+
+        :return: None
+        """
+        if self._batch is not None:
+            yield None
+            return
+
+        self._batch = list()
+
+        try:
+            yield None
+
+        finally:
+            events, self._batch = self._batch, None
+
+            if events:
+                self._transmit(events)
+
+    # --------------------------------------------------------------------------
+    def poll(self, timeout=0):
+        """
+        Applies the events which have been received from other processes.
+
+        :param timeout: The number of seconds to wait for events if there
+            are none waiting. If None, this blocks until events arrive.
+        :type timeout: float
+
+        :return: The number of batches which were applied
+        """
+        applied = 0
+
+        try:
+            batch = self._received.get(
+                block=timeout != 0,
+                timeout=timeout,
+            )
+
+            while True:
+                self._apply(*batch)
+                applied += 1
+
+                batch = self._received.get_nowait()
+
+        except queue.Empty:
+            pass
+
+        return applied
+
+    # --------------------------------------------------------------------------
+    def close(self):
+        """
+        Disconnects from the coordinator, removing the link from the group
+        of the memento so it no longer sends their stores and restores.
+        Any events which have already been received can still be applied
+        through poll.
+
+        :return: None
+        """
+        self._leave()
+        self._connection.close()
+
+    # --------------------------------------------------------------------------
+    def _send(self, event):
+        if self._batch is not None:
+            self._batch.append(event)
+            return
+
+        self._transmit([event])
+
+    # --------------------------------------------------------------------------
+    def _transmit(self, events):
+        # -- Losing the coordinator should not fail the store or restore
+        # -- which is being sent, so the link simply leaves the group
+        try:
+            with self._send_lock:
+                self._connection.send(events)
+
+        except _DISCONNECTED as e:
+            log.warning(
+                'Sync link lost its connection, leaving the group : %s',
+                e,
+            )
+            self._leave()
+
+    # --------------------------------------------------------------------------
+    def _leave(self):
+        if self._sync_group is not None:
+            self._sync_group.remove(self)
+
+    # --------------------------------------------------------------------------
+    def _receive(self):
+        while True:
+            try:
+                self._received.put(self._connection.recv())
+
+            except _DISCONNECTED:
+                return
+
+    # --------------------------------------------------------------------------
+    def _apply(self, sequence, events):
+        with self._lock:
+
+            # -- Propagating from the link means the members will not send
+            # -- these events straight back to the other processes
+            with _SyncGroupPropogation(self) as members:
+                for action, argument in events:
+                    for memento in members:
+                        if action == _STORE:
+                            memento.store(serialise=argument)
+
+                        elif action == _RESTORE:
+                            index, force = argument
+                            memento.restore(index=index, force=force)
+
+            self.sequence = sequence
+
+        log.debug('Applied sync batch %s', sequence)
+
+
+# ------------------------------------------------------------------------------
+class _Listener(object):
+    """
+    This is an internal and private class which accepts connections on a
+    background thread, handing each one to the given callable, until it is
+    closed.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, on_connect, address=None, family=None, authkey=None):
+        self._listener = connection.Listener(
+            address,
+            family=family,
+            authkey=authkey,
+        )
+        self._authkey = authkey
+        self._on_connect = on_connect
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._accept)
+        self._thread.daemon = True
+        self._thread.start()
+
+    # --------------------------------------------------------------------------
+    @property
+    def address(self):
+        return self._listener.address
+
+    # --------------------------------------------------------------------------
+    def close(self):
+        if self._closed:
+            return
+
+        self._closed = True
+
+        # -- A blocking accept is not interrupted by closing the listener
+        # -- on every platform, so we wake it with a connection of our own
+        # noinspection PyBroadException
+        try:
+            connection.Client(self.address, authkey=self._authkey).close()
+
+        except Exception:
+            pass
+
+        self._thread.join()
+        self._listener.close()
+
+    # --------------------------------------------------------------------------
+    def _accept(self):
+        while True:
+            try:
+                link = self._listener.accept()
+
+            except (OSError, EOFError, connection.AuthenticationError):
+                if self._closed:
+                    return
+                continue
+
+            if self._closed:
+                link.close()
+                return
+
+            self._on_connect(link)
@@ -0,0 +1,782 @@
+"""
+This module holds the shared write path utilised by the file based
+serialisers. Full writes are always atomic - the data is written to a
+temporary file alongside the target which is then renamed over it - meaning
+a crash part way through a write can never leave a truncated file behind.
+
+How often the data is flushed to the disk is controlled by the durability
+policy, which allows durability to be traded against write latency:
+
+    ..code-block:: python
+
+        >>> import recollection
+        >>>
+        >>> # -- fsync every write before it is renamed into place
+        >>> recollection.set_durability(recollection.DURABILITY_SYNC)
+        >>>
+        >>> # -- fsync all files written within 100ms of each other together
+        >>> recollection.set_durability(
+        ...     recollection.DURABILITY_GROUP,
+        ...     group_interval=100,
+        ... )
+
+Under group durability a full write is not renamed into place until its
+group is committed, as the temporary file must be synced before it is
+renamed - otherwise a crash could leave a renamed file whose data never
+reached the disk. Reads made through this module (including exists) commit
+any pending write to the path first, so a process always sees its own
+writes, whilst other processes see them once the group is committed.
+
+Several processes may share the same files, so every write takes an
+exclusive advisory lock and every read takes a shared one. The lock is held
+on a '.lock' file alongside the data, as the data file itself is replaced
+on every write. Locking relies on fcntl, and is therefore skipped on
+platforms where it is not available.
+
+Reads are also cached in-process against the modification time, size and
+inode of the file. The cache holds the loaded data pickled, as unpickling
+is much quicker than parsing most formats (and than deep copying), whilst
+giving every reader its own copy. This means repeated reads of a file which
+has not changed skip the disk read and are cheaper than parsing the data.
+"""
+from . import constants
+
+import os
+import uuid
+import pickle
+import atexit
+import threading
+from contextlib import ExitStack
+from contextlib import contextmanager
+
+try:
+    import fcntl
+
+except ImportError:
+    fcntl = None
+
+
+# ------------------------------------------------------------------------------
+_POLICIES = (
+    constants.DURABILITY_NONE,
+    constants.DURABILITY_SYNC,
+    constants.DURABILITY_GROUP,
+)
+
+# -- The active durability policy and the group commit interval in seconds
+_durability = constants.DURABILITY_NONE
+_group_interval = 0.05
+
+
+# ------------------------------------------------------------------------------
+def set_durability(policy, group_interval=50):
+    """
+    Sets the durability policy used for all file based serialisation.
+
+    :param policy: One of recollection.DURABILITY_NONE, DURABILITY_SYNC
+        or DURABILITY_GROUP.
+    :type policy: str
+
+    :param group_interval: When using group durability this is the number
+        of milliseconds writes are gathered for before being synced together.
+    :type group_interval: int
+
+    :return: None
+    """
+    global _durability
+    global _group_interval
+
+    if policy not in _POLICIES:
+        raise ValueError(
+            '%s is not a valid durability policy. Expected one of %s' % (
+                policy,
+                ', '.join(_POLICIES),
+            )
+        )
+
+    # -- Anything pending under the previous policy is synced now so
+    # -- it is not left waiting on a policy which no longer applies
+    _GROUP_COMMIT.flush()
+
+    _durability = policy
+    _group_interval = group_interval / 1000.0
+
+
+# ------------------------------------------------------------------------------
+def durability():
+    """
+    Returns the active durability policy
+
+    :return: str
+    """
+    return _durability
+
+
+# ------------------------------------------------------------------------------
+def write(path, *chunks):
+    """
+    Atomically replaces the file at the given path with the given chunks
+    of data, syncing according to the durability policy.
+
+    :param path: The absolute path to write to
+    :type path: str
+
+    :param chunks: The bytes to write, in order
+    :type chunks: bytes
+
+    :return: None
+    """
+    write_all([(path, chunks)])
+
+
+# ------------------------------------------------------------------------------
+def write_all(files):
+    """
+    Atomically replaces each of the given files, as write does, holding the
+    locks of them all throughout. Under group durability the files are
+    committed in the same group, so a reader holding the lock of any one of
+    them never sees some of the files replaced without the others.
+
+    :param files: The path of each file to write, along with the chunks
+        of bytes to write to it
+    :type files: list(tuple(str, list(bytes, ...)), ...)
+
+    :return: None
+    """
+    for path, chunks in files:
+        _ensure_directory(path)
+        _count(chunks)
+
+    # -- Locks are taken in a consistent order, as they are when the
+    # -- group is committed
+    with ExitStack() as stack:
+        for path in sorted(path for path, _ in files):
+            stack.enter_context(lock(path))
+
+        _write(files)
+
+    if _durability == constants.DURABILITY_SYNC:
+        for directory in set(os.path.dirname(path) for path, _ in files):
+            _fsync_directory(os.path.join(directory, ''))
+
+
+# ------------------------------------------------------------------------------
+def replace(path, *chunks):
+    """
+    Atomically replaces the file at the given path, as write does, but
+    renames it into place straight away - even under group durability, in
+    which case the temporary file is synced first. This is intended for
+    callers which hold the lock of the path and need the new file to be in
+    place before they release it. Any write to the path which is waiting
+    on a group commit is superseded.
+
+    :param path: The absolute path to write to
+    :type path: str
+
+    :param chunks: The bytes to write, in order
+    :type chunks: bytes
+
+    :return: None
+    """
+    _ensure_directory(path)
+    _count(chunks)
+
+    with lock(path):
+        _GROUP_COMMIT.discard(path)
+        temp_path = _write_temporary(path, chunks)
+
+        try:
+            if _durability == constants.DURABILITY_GROUP:
+                _fsync_file(temp_path)
+
+            os.replace(temp_path, path)
+
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        _invalidate(path)
+
+    if _durability != constants.DURABILITY_NONE:
+        _fsync_directory(path)
+
+
+# ------------------------------------------------------------------------------
+def _write(files):
+    renames = list()
+
+    try:
+        for path, chunks in files:
+            renames.append((_write_temporary(path, chunks), path))
+
+        # -- The renames must wait until the group has synced the
+        # -- temporary files, so they are handed over to the group commit
+        # -- together, along with the locks they must be renamed under
+        if _durability == constants.DURABILITY_GROUP:
+            _GROUP_COMMIT.rename(renames, _held_locks())
+            return
+
+        for temp_path, path in renames:
+            os.replace(temp_path, path)
+
+    except BaseException:
+        for temp_path, _ in renames:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        raise
+
+    for _, path in renames:
+        _invalidate(path)
+
+
+# ------------------------------------------------------------------------------
+def _write_temporary(path, chunks):
+    # -- The temporary file must live in the same directory as the
+    # -- target, otherwise the rename is not guaranteed to be atomic. We
+    # -- create it with the same permissions a plain open would give.
+    temp_path = '%s.%s.tmp' % (path, uuid.uuid4().hex[:12])
+    handle = os.open(
+        temp_path,
+        os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0),
+        0o666,
+    )
+
+    try:
+        with os.fdopen(handle, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+            f.flush()
+
+            if _durability == constants.DURABILITY_SYNC:
+                os.fsync(f.fileno())
+
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return temp_path
+
+
+# ------------------------------------------------------------------------------
+def append(path, *chunks):
+    """
+    Appends the given chunks of data to the file at the given path, syncing
+    according to the durability policy. Appends cannot be made atomic, so
+    any reader of an appended file should expect that the last record may
+    be incomplete.
+
+    :param path: The absolute path to append to
+    :type path: str
+
+    :param chunks: The bytes to write, in order
+    :type chunks: bytes
+
+    :return: None
+    """
+    _ensure_directory(path)
+    _count(chunks)
+
+    # -- Anything appended must follow the last full write
+    _GROUP_COMMIT.commit(path)
+
+    with lock(path):
+        with open(path, 'ab') as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+            f.flush()
+
+            if _durability == constants.DURABILITY_SYNC:
+                os.fsync(f.fileno())
+
+        _invalidate(path)
+
+    if _durability == constants.DURABILITY_GROUP:
+        _GROUP_COMMIT.schedule(path)
+
+
+# ------------------------------------------------------------------------------
+def exists(path):
+    """
+    Returns whether the file at the given path exists, including a file
+    whose first write is waiting on a group commit.
+
+    :param path: The absolute path to check
+    :type path: str
+
+    :return: bool
+    """
+    _GROUP_COMMIT.commit(path)
+    return os.path.exists(path)
+
+
+# ------------------------------------------------------------------------------
+def read(path, loader):
+    """
+    Reads the file at the given path under a shared lock, passing the open
+    binary file to the loader. Once the same unchanged file has been read
+    twice the loaded result is cached, and subsequent reads return a copy
+    of the cached result without calling the loader. A file which is only
+    ever read once therefore costs no more than loading it. The data
+    returned is never shared with the cache, so it may be freely altered.
+
+    :param path: The absolute path to read from
+    :type path: str
+
+    :param loader: A callable which is given the open file and should
+        return the loaded data
+    :type loader: callable
+
+    :return: The loaded data, or None if the file does not exist
+    """
+    _GROUP_COMMIT.commit(path)
+
+    try:
+        return lookup(path, loader)
+
+    except KeyError:
+        pass
+
+    with lock(path, exclusive=False):
+
+        # -- Take the signature now we hold the lock, as the file may have
+        # -- been replaced whilst we were waiting for it
+        try:
+            signature = _signature(path)
+
+        except OSError:
+            return None
+
+        with open(path, 'rb') as f:
+            data = loader(f)
+
+    # -- Caching costs a pickle of the data, which is only worthwhile
+    # -- for a file which is read more than once. The first read only
+    # -- records the signature. The data is pickled into the cache before
+    # -- it is returned, so the caller is free to alter what we give back.
+    with _CACHE_LOCK:
+        seen = _CACHE.get((path, loader))
+
+    if seen and seen[0] == signature:
+        cache(path, loader, signature, data)
+
+    else:
+        with _CACHE_LOCK:
+            _CACHE[(path, loader)] = (signature, None)
+
+    return data
+
+
+# ------------------------------------------------------------------------------
+def read_bytes(path):
+    """
+    Reads the entire content of the file at the given path under a shared
+    lock. This is intended for callers which want to separate the reading
+    of a file from the loading of it, and who then cache the result with
+    the returned signature.
+
+    :param path: The absolute path to read from
+    :type path: str
+
+    :return: tuple(signature, bytes), or None if the file does not exist
+    """
+    _GROUP_COMMIT.commit(path)
+
+    with lock(path, exclusive=False):
+        try:
+            signature = _signature(path)
+
+        except OSError:
+            return None
+
+        with open(path, 'rb') as f:
+            return signature, f.read()
+
+
+# ------------------------------------------------------------------------------
+def lookup(path, loader):
+    """
+    Returns a copy of the cached result of loading the given path with
+    the given loader.
+
+    :param path: The absolute path which was read
+    :type path: str
+
+    :param loader: The loader the path was read with
+    :type loader: callable
+
+    :raises KeyError: If there is no cached result, or the file has
+        changed since it was cached.
+
+    :return: The loaded data
+    """
+    _GROUP_COMMIT.commit(path)
+
+    try:
+        signature = _signature(path)
+
+    except OSError:
+        raise KeyError(path)
+
+    with _CACHE_LOCK:
+        cached = _CACHE.get((path, loader))
+
+    if not cached or cached[0] != signature or cached[1] is None:
+        raise KeyError(path)
+
+    return pickle.loads(cached[1])
+
+
+# ------------------------------------------------------------------------------
+def cache(path, loader, signature, data):
+    """
+    Caches the result of loading the given path with the given loader.
+
+    :param path: The absolute path which was read
+    :type path: str
+
+    :param loader: The loader the path was read with
+    :type loader: callable
+
+    :param signature: The signature of the file at the time it was read,
+        as returned by read_bytes
+    :type signature: tuple
+
+    :param data: The loaded data. This is pickled into the cache, so it
+        may be altered afterward without affecting what is cached.
+
+    :return: None
+    """
+    # -- Anything which cannot be pickled is simply not cached
+    # noinspection PyBroadException
+    try:
+        pickled = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+    except Exception:
+        return
+
+    with _CACHE_LOCK:
+        _CACHE[(path, loader)] = (signature, pickled)
+
+
+# ------------------------------------------------------------------------------
+def clear_cache():
+    """
+    Removes all the cached reads
+
+    :return: None
+    """
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+# ------------------------------------------------------------------------------
+@contextmanager
+def lock(path, exclusive=True):
+    """
+    Holds an advisory lock for the given path for the duration of the
+    context. Locks are re-entrant within a thread, so a thread which
+    already holds the lock for a path can freely lock it again.
+
+    :param path: The absolute path of the data file to lock
+    :type path: str
+
+    :param exclusive: If true an exclusive (write) lock is taken,
+        otherwise a shared (read) lock is taken.
+    :type exclusive: bool
+
+    :return: None
+    """
+    held = _held_locks()
+
+    if fcntl is None or path in held:
+        yield None
+        return
+
+    _ensure_directory(path)
+
+    with open(path + '.lock', 'ab') as f:
+        fcntl.flock(
+            f.fileno(),
+            fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH,
+        )
+        held.add(path)
+
+        try:
+            yield None
+
+        finally:
+            held.discard(path)
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+# ------------------------------------------------------------------------------
+@contextmanager
+def counting():
+    """
+    Counts the number of bytes written or appended by this thread for the
+    duration of the context.
+
+    :return: A list whose only element is the number of bytes written
+    """
+    previous = getattr(_LOCAL, 'counter', None)
+    counter = _LOCAL.counter = [0]
+
+    try:
+        yield counter
+
+    finally:
+        _LOCAL.counter = previous
+
+        if previous is not None:
+            previous[0] += counter[0]
+
+
+# ------------------------------------------------------------------------------
+def flush():
+    """
+    Immediately syncs any writes which are waiting on a group commit.
+
+    :return: None
+    """
+    _GROUP_COMMIT.flush()
+
+
+# ------------------------------------------------------------------------------
+def _held_locks():
+    try:
+        return _LOCAL.held
+
+    except AttributeError:
+        _LOCAL.held = set()
+        return _LOCAL.held
+
+
+# ------------------------------------------------------------------------------
+def _count(chunks):
+    counter = getattr(_LOCAL, 'counter', None)
+
+    if counter is not None:
+        counter[0] += sum(memoryview(chunk).nbytes for chunk in chunks)
+
+
+# ------------------------------------------------------------------------------
+def _signature(path):
+    """
+    Returns the details of the file which change whenever it is written
+    to, or replaced.
+    """
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+# ------------------------------------------------------------------------------
+def _invalidate(path):
+    with _CACHE_LOCK:
+        for key in [key for key in _CACHE if key[0] == path]:
+            del _CACHE[key]
+
+
+# ------------------------------------------------------------------------------
+def _ensure_directory(path):
+    directory = os.path.dirname(path)
+
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    return directory
+
+
+# ------------------------------------------------------------------------------
+def _remove(path):
+    try:
+        os.remove(path)
+
+    except OSError:
+        pass
+
+
+# ------------------------------------------------------------------------------
+def _fsync_file(path):
+    # -- We open in append mode as some platforms will only sync a
+    # -- handle which has write access
+    if not os.path.exists(path):
+        return
+
+    with open(path, 'ab') as f:
+        os.fsync(f.fileno())
+
+
+# ------------------------------------------------------------------------------
+def _fsync_directory(path):
+    """
+    Syncs the directory holding the given path, which is what makes a
+    rename durable. Not all platforms allow a directory to be opened, in
+    which case this does nothing.
+    """
+    try:
+        handle = os.open(
+            os.path.dirname(path) or '.',
+            os.O_RDONLY,
+        )
+
+    except OSError:
+        return
+
+    try:
+        os.fsync(handle)
+
+    except OSError:
+        pass
+
+    finally:
+        os.close(handle)
+
+
+# ------------------------------------------------------------------------------
+class _GroupCommit(object):
+    """
+    Gathers the files written within the group interval and syncs them
+    all in a single pass from a background timer. Full writes are synced
+    as temporary files, and only renamed into place once synced.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._appended = set()
+        self._renames = dict()
+        self._timer = None
+
+        # -- Held for the duration of a flush, so a commit made whilst
+        # -- another thread is flushing waits for the renames to be made
+        self._flushing = threading.Lock()
+
+    # --------------------------------------------------------------------------
+    def schedule(self, path):
+        with self._lock:
+            self._appended.add(path)
+            self._start()
+
+    # --------------------------------------------------------------------------
+    def rename(self, renames, locks):
+        """
+        Schedules each of the given temporary files to be renamed over its
+        path once it has been synced, whilst holding the given locks. The
+        renames are always committed in the same group. Any write to the
+        same paths which is still pending is superseded.
+        """
+        previous = list()
+
+        with self._lock:
+            for temp_path, path in renames:
+                previous.append(self._renames.pop(path, None))
+                self._renames[path] = (temp_path, frozenset(locks) | {path})
+
+            self._start()
+
+        for pending in previous:
+            if pending:
+                _remove(pending[0])
+
+    # --------------------------------------------------------------------------
+    def discard(self, path):
+        """
+        Drops any write to the given path which is still pending
+        """
+        with self._lock:
+            pending = self._renames.pop(path, None)
+
+        if pending:
+            _remove(pending[0])
+
+    # --------------------------------------------------------------------------
+    def commit(self, path):
+        """
+        Commits the pending group if it holds a write to the given path
+        """
+        with self._flushing:
+            with self._lock:
+                pending = path in self._renames
+
+            if pending:
+                self._flush()
+
+    # --------------------------------------------------------------------------
+    def flush(self):
+        with self._flushing:
+            self._flush()
+
+    # --------------------------------------------------------------------------
+    def _start(self):
+        if self._timer is None:
+            self._timer = threading.Timer(_group_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    # --------------------------------------------------------------------------
+    def _flush(self):
+        with self._lock:
+            appended = self._appended
+            renames = self._renames
+
+            self._appended = set()
+            self._renames = dict()
+
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        # -- Every file is synced before anything is renamed, so a crash
+        # -- can never leave a renamed file whose data is not on disk
+        for path in appended:
+            _fsync_file(path)
+
+        for temp_path, _ in renames.values():
+            _fsync_file(temp_path)
+
+        # -- A temporary file can only have gone if its directory was
+        # -- removed, in which case there is nothing left to rename into
+        renames = dict(
+            (path, pending)
+            for path, pending in renames.items()
+            if os.path.exists(pending[0])
+        )
+
+        # -- Files written together (such as a pickle and its buffers) are
+        # -- renamed under the locks they were written under, so readers
+        # -- always see them as a pair. Locks are taken in a consistent
+        # -- order so two processes flushing cannot deadlock.
+        locks = sorted(
+            set().union(*(held for _, held in renames.values())),
+        )
+
+        with ExitStack() as stack:
+            for path in locks:
+                stack.enter_context(lock(path))
+
+            for path, (temp_path, _) in renames.items():
+                os.replace(temp_path, path)
+                _invalidate(path)
+
+        for directory in set(os.path.dirname(path) for path in renames):
+            _fsync_directory(os.path.join(directory, ''))
+
+
+# ------------------------------------------------------------------------------
+_GROUP_COMMIT = _GroupCommit()
+
+# -- Cached reads, keyed by path and loader, holding the file signature
+# -- at the time of the read along with the loaded data
+_CACHE = dict()
+_CACHE_LOCK = threading.Lock()
+
+# -- Tracks the paths each thread currently holds a lock for, along with
+# -- the count of bytes written whilst counting
+_LOCAL = threading.local()
+
+# -- Ensure nothing waiting on a group commit is lost on a clean exit
+atexit.register(flush)
@@ -0,0 +1,123 @@
+"""
+This module holds the structure a memento keeps its history of states in.
+The history is never altered, only replaced by a new history as each state
+is pushed, so it can be read from any thread and shared between mementos
+(such as by fork) without ever being copied.
+"""
+
+
+# ------------------------------------------------------------------------------
+class History(object):
+    """
+    An immutable sequence of states, with the most recent state first.
+
+    The states are held in a chain of (snapshot, next) pairs, so pushing a
+    state costs the same regardless of how long the history is, and two
+    histories pushed onto from the same history share everything they
+    had in common. Indexing walks the chain, so is cheapest for the most
+    recent states - which are those most often restored to.
+
+    When the number of states is bounded the chain is only trimmed once it
+    holds twice as many states as are kept, at which point the states which
+    are kept are copied into a new chain. Anything still holding the old
+    history is therefore unaffected, and the cost of trimming is spread
+    across all the pushes which led up to it.
+    """
+
+    __slots__ = ('_head', '_length', '_depth')
+
+    # --------------------------------------------------------------------------
+    def __init__(self, head=None, length=0, depth=0):
+        """
+        :param head: The most recent (snapshot, next) pair of the chain
+        :type head: tuple
+
+        :param length: The number of states in the history
+        :type length: int
+
+        :param depth: The number of states in the chain, which may be
+            more than the length when the chain has not yet been trimmed
+        :type depth: int
+        """
+        self._head = head
+        self._length = length
+        self._depth = depth
+
+    # --------------------------------------------------------------------------
+    def push(self, snapshot, max_states=None):
+        """
+        Returns a new history with the given snapshot as its most recent
+        state, holding at most the given number of states.
+
+        :param snapshot: The state to add
+        :type snapshot: dict
+
+        :param max_states: The maximum number of states to hold. If not
+            given the history is unbounded.
+        :type max_states: int
+
+        :return: History
+        """
+        head = (snapshot, self._head)
+        length = self._length + 1
+        depth = self._depth + 1
+
+        if max_states:
+            length = min(length, max_states)
+
+            # -- Rather than trimming on every push we copy the states we
+            # -- keep into a new chain once it has grown to twice the size
+            if depth >= 2 * max_states:
+                kept = list(_walk(head, length))
+                head = None
+
+                for state in reversed(kept):
+                    head = (state, head)
+
+                depth = length
+
+        return History(head, length, depth)
+
+    # --------------------------------------------------------------------------
+    def __len__(self):
+        return self._length
+
+    # --------------------------------------------------------------------------
+    def __iter__(self):
+        return _walk(self._head, self._length)
+
+    # --------------------------------------------------------------------------
+    def __reversed__(self):
+        return reversed(list(self))
+
+    # --------------------------------------------------------------------------
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self)[index]
+
+        if index < 0:
+            index += self._length
+
+        if not 0 <= index < self._length:
+            raise IndexError('History index out of range')
+
+        node = self._head
+
+        for _ in range(index):
+            node = node[1]
+
+        return node[0]
+
+    # --------------------------------------------------------------------------
+    def __repr__(self):
+        return 'History(%s)' % list(self)
+
+
+# ------------------------------------------------------------------------------
+def _walk(node, length):
+    """
+    Yields the snapshots of the first length pairs of the given chain.
+    """
+    for _ in range(length):
+        yield node[0]
+        node = node[1]
@@ -0,0 +1,192 @@
+"""
+This module holds the hash indexes which can be enabled on a memento to
+search its history without scanning every state.
+
+Whilst enabled, the id of every stored state is recorded against the value
+each indexed label held in it. Finding the states in which a label held a
+given value is then a single lookup, and finding the states matching a
+predicate only calls the predicate once for each distinct value.
+
+    ..code-block:: python
+
+        >>> import recollection
+        >>>
+        >>> memento = recollection.Memento(preferences)
+        >>> memento.enable_indexes(['theme'])
+        >>>
+        >>> # -- Every state in which the theme was dark, most recent first
+        >>> memento.find('theme', 'dark')
+
+Values which are not hashable, such as lists and dictionaries, are indexed
+by a frozen equivalent of their contents. Values which cannot be frozen are
+still found, but are compared one by one.
+"""
+from .observer import MISSING
+from .observer import HistoryObserver
+
+import collections
+
+
+# ------------------------------------------------------------------------------
+# -- Values which cannot be hashed, even once frozen, are held under this key
+_UNHASHABLE = object()
+
+
+# ------------------------------------------------------------------------------
+class Indexes(HistoryObserver):
+    """
+    Holds a hash index for each indexed label of a memento, kept in step
+    with its history.
+    """
+
+    # --------------------------------------------------------------------------
+    def find(self, label, match):
+        """
+        Returns the ids of the states in which the given label held the
+        given value (or a value for which the given callable returns True),
+        most recent first.
+
+        :return: list(int, ...)
+        """
+        return self._held[label].find(match)
+
+    # --------------------------------------------------------------------------
+    def _create(self, first_id):
+        return _Index()
+
+
+# ------------------------------------------------------------------------------
+class _Index(object):
+    """
+    This is an internal and private class which maps each distinct value
+    of a single label to the ids of the states holding it.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self):
+
+        # -- The ids of the states holding each value, oldest first,
+        # -- along with one of the values itself to test predicates on
+        self.ids = dict()
+        self.values = dict()
+
+        # -- The key each state was indexed under, oldest first, so
+        # -- evicted states can be removed from their bucket
+        self.order = collections.deque()
+
+        # -- States holding values which cannot be hashed
+        self.unhashable = dict()
+
+    # --------------------------------------------------------------------------
+    def add(self, state_id, value):
+        if value is MISSING:
+            return
+
+        key = _key(value)
+
+        if key is _UNHASHABLE:
+            self.unhashable[state_id] = value
+
+        else:
+            if key not in self.ids:
+                self.ids[key] = collections.deque()
+                self.values[key] = value
+
+            self.ids[key].append(state_id)
+
+        self.order.append((state_id, key))
+
+    # --------------------------------------------------------------------------
+    def evict(self, oldest_id):
+        while self.order and self.order[0][0] < oldest_id:
+            state_id, key = self.order.popleft()
+
+            if key is _UNHASHABLE:
+                self.unhashable.pop(state_id, None)
+                continue
+
+            bucket = self.ids[key]
+            bucket.popleft()
+
+            if not bucket:
+                del self.ids[key]
+                del self.values[key]
+
+    # --------------------------------------------------------------------------
+    def find(self, match):
+        if callable(match):
+            found = [
+                state_id
+                for key, value in self.values.items()
+                if match(value)
+                for state_id in self.ids[key]
+            ]
+            found.extend(
+                state_id
+                for state_id, value in self.unhashable.items()
+                if match(value)
+            )
+
+        else:
+            key = _key(match)
+
+            found = list(self.ids.get(key, ())) \
+                if key is not _UNHASHABLE else list()
+
+            found.extend(
+                state_id
+                for state_id, value in self.unhashable.items()
+                if _equal(value, match)
+            )
+
+        return sorted(found, reverse=True)
+
+
+# ------------------------------------------------------------------------------
+def _key(value):
+    """
+    Returns a hashable key for the given value, freezing the contents of
+    lists, sets and dictionaries.
+    """
+    try:
+        frozen = _freeze(value)
+        hash(frozen)
+
+    except TypeError:
+        return _UNHASHABLE
+
+    return frozen
+
+
+# ------------------------------------------------------------------------------
+def _freeze(value):
+    # -- The type is part of the key, so a list and a tuple with the same
+    # -- contents are not considered the same value
+    if isinstance(value, dict):
+        return dict, frozenset(
+            (key, _freeze(item))
+            for key, item in value.items()
+        )
+
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_freeze(item) for item in value)
+
+    if isinstance(value, (set, frozenset)):
+        return frozenset, frozenset(_freeze(item) for item in value)
+
+    return value
+
+
+# ------------------------------------------------------------------------------
+def _equal(a, b):
+    """
+    Returns True if the two values compare as equal. Values which cannot be
+    compared in a truthful way (such as arrays which compare element-wise)
+    are never considered equal.
+    """
+    # noinspection PyBroadException
+    try:
+        return bool(a == b)
+
+    except Exception:
+        return False
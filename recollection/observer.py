@@ -0,0 +1,79 @@
+"""
+This module holds the base class shared by the structures which are kept
+in step with the history of a memento, such as the columnar and hash
+indexes. Each is handed every state as it is pushed, and drops what it
+holds for states the memento has since evicted.
+"""
+
+
+# ------------------------------------------------------------------------------
+# -- Given in place of the value of a label which a state does not hold
+MISSING = object()
+
+
+# ------------------------------------------------------------------------------
+class HistoryObserver(object):
+    """
+    Holds a structure for each observed label of a memento, kept in step
+    with its history. Every state is identified by its state id (see
+    Memento.state_id), which never changes as further states are stored.
+
+    Subclasses implement _create, which returns the structure for a single
+    label. Each structure must implement add(state_id, value) - where the
+    value is MISSING if the state does not hold the label - and
+    evict(oldest_id), which drops anything held for older states.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, memento, labels=None):
+        """
+        :param memento: The memento whose history should be observed
+        :type memento: recollection.Memento
+
+        :param labels: The labels to observe. If not given, every label
+            registered at this time is observed.
+        :type labels: list(str, ...)
+        """
+        self._max_states = memento._max_states
+        self._next_id = memento._pushed - len(memento._states)
+
+        self._held = dict(
+            (label, self._create(self._next_id))
+            for label in (labels or memento.labels())
+        )
+
+        # -- Observe the states already held, oldest first
+        for snapshot in reversed(memento._states):
+            self.append(snapshot)
+
+    # --------------------------------------------------------------------------
+    def __contains__(self, label):
+        return label in self._held
+
+    # --------------------------------------------------------------------------
+    def append(self, snapshot):
+        """
+        Adds the values of the given snapshot, which is the next state
+        stored by the memento, evicting any states which are no longer held.
+
+        :return: None
+        """
+        state_id = self._next_id
+        self._next_id += 1
+
+        oldest_id = state_id + 1 - self._max_states \
+            if self._max_states else None
+
+        for label, held in self._held.items():
+            held.add(state_id, snapshot.get(label, MISSING))
+
+            if oldest_id is not None:
+                held.evict(oldest_id)
+
+    # --------------------------------------------------------------------------
+    def _create(self, first_id):
+        """
+        Returns the structure to hold the values of a single label, the
+        first of which will belong to the given state id.
+        """
+        raise NotImplementedError()
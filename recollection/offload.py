@@ -0,0 +1,206 @@
+"""
+This module allows the encoding and writing of memento state to be
+offloaded to worker processes. This is useful when states are large, as
+encoding them holds the GIL and would otherwise stall the calling thread
+for the duration of the serialisation.
+
+    ..code-block:: python
+
+        >>> import recollection
+        >>>
+        >>> pool = recollection.SerialisationPool(max_in_flight=4)
+        >>>
+        >>> memento = recollection.Memento(scene)
+        >>> memento.register_serialiser(
+        ...     serialiser=recollection.PickleSerialiser,
+        ...     identifier='/tmp/scene.pkl',
+        ...     pool=pool,
+        ... )
+        >>>
+        >>> # -- This returns as soon as the state has been handed over
+        >>> future = memento.serialise()
+        >>>
+        >>> # -- The future can be waited on if we need to know the state
+        >>> # -- has reached the disk
+        >>> future.result()
+        >>>
+        >>> # -- Stores which serialise do not return the future, but the
+        >>> # -- memento keeps hold of it so every write can be waited on
+        >>> memento.store(serialise=True)
+        >>> memento.wait_for_serialisation()
+
+Any serialisation which fails in the pool is logged as an error, and the
+next serialisation of that memento is written in full.
+"""
+from . import fileio
+from . import constants
+
+import functools
+import threading
+import collections
+from concurrent import futures
+
+
+# ------------------------------------------------------------------------------
+class SerialisationPool(object):
+    """
+    A pool of worker processes which serialise memento states.
+
+    Serialisations for the same location are always written in the order
+    they were submitted, whilst serialisations for different locations
+    are written concurrently.
+
+    The number of serialisations which may be waiting or in progress at
+    any one time is bounded by max_in_flight. Once that limit is reached,
+    submitting a further serialisation blocks until one completes - which
+    prevents the calling thread from producing states faster than they
+    can be written.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, max_workers=None, max_in_flight=8):
+        self._executor = futures.ProcessPoolExecutor(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+
+        # -- Serialisations waiting or in progress, per location. Only
+        # -- the first serialisation in each queue is ever in progress.
+        self._lock = threading.Lock()
+        self._queues = dict()
+
+    # --------------------------------------------------------------------------
+    def submit(self, serialiser, data, identifier, patch=False):
+        """
+        Submits the given data to be serialised by a worker process.
+
+        :param serialiser: The serialiser type to serialise with
+        :type serialiser: Type recollection.SerialiserBase
+
+        :param data: The state to serialise. This must not be altered
+            after it has been submitted.
+        :type data: dict
+
+        :param identifier: The identifier to give to the serialiser
+        :type identifier: str
+
+        :param patch: If true the data is serialised as a patch
+        :type patch: bool
+
+        :return: concurrent.futures.Future
+        """
+        # -- Block until there is room for this serialisation
+        self._slots.acquire()
+
+        future = futures.Future()
+        job = (serialiser, data, identifier, patch, future)
+        key = serialiser.locator(identifier)
+
+        with self._lock:
+            queue = self._queues.setdefault(key, collections.deque())
+            queue.append(job)
+
+            # -- If there is already a serialisation in progress for this
+            # -- location this job will be dispatched when it completes
+            if len(queue) > 1:
+                return future
+
+        self._dispatch(key, job)
+        return future
+
+    # --------------------------------------------------------------------------
+    def shutdown(self, wait=True):
+        """
+        Shuts down the worker processes.
+
+        :param wait: If true, this will block until all submitted
+            serialisations are complete
+        :type wait: bool
+
+        :return: None
+        """
+        if wait:
+            with self._lock:
+                pending = [
+                    job[-1]
+                    for queue in self._queues.values()
+                    for job in queue
+                ]
+
+            futures.wait(pending)
+
+        self._executor.shutdown(wait=wait)
+
+    # --------------------------------------------------------------------------
+    def _dispatch(self, key, job):
+        serialiser, data, identifier, patch, future = job
+
+        try:
+            worker = self._executor.submit(
+                _serialise,
+                serialiser,
+                data,
+                identifier,
+                patch,
+                fileio.durability(),
+            )
+
+        except Exception as exception:
+            future.set_exception(exception)
+            self._complete(key)
+            return
+
+        worker.add_done_callback(
+            functools.partial(
+                self._resolve,
+                key,
+                future,
+            ),
+        )
+
+    # --------------------------------------------------------------------------
+    def _resolve(self, key, future, worker):
+        exception = worker.exception()
+
+        if exception is not None:
+            future.set_exception(exception)
+
+        else:
+            future.set_result(worker.result())
+
+        self._complete(key)
+
+    # --------------------------------------------------------------------------
+    def _complete(self, key):
+        self._slots.release()
+
+        # -- Move on to the next serialisation for this location
+        with self._lock:
+            queue = self._queues[key]
+            queue.popleft()
+
+            if not queue:
+                del self._queues[key]
+                return
+
+            job = queue[0]
+
+        self._dispatch(key, job)
+
+
+# ------------------------------------------------------------------------------
+def _serialise(serialiser, data, identifier, patch, durability):
+    """
+    This is run within the worker process.
+    """
+    if fileio.durability() != durability:
+        fileio.set_durability(durability)
+
+    if patch:
+        serialiser.serialise_patch(data, identifier)
+
+    else:
+        serialiser.serialise(data, identifier)
+
+    # -- The worker may not live long enough for a group commit to
+    # -- fire, so anything it has written is synced before returning
+    if durability == constants.DURABILITY_GROUP:
+        fileio.flush()
@@ -0,0 +1,459 @@
+"""
+This module allows the cost of each registered label of a memento to be
+measured, making it possible to see which labels are responsible for slow
+stores and restores, and which labels account for the memory held by the
+history.
+
+    ..code-block:: python
+
+        >>> import recollection
+        >>>
+        >>> with recollection.profile(memento) as profiler:
+        ...     for _ in range(1000):
+        ...         memento.store()
+        >>>
+        >>> print(profiler.format())
+
+Whilst profiling, every getter, copy and setter of the labels registered on
+the memento is timed, and every copied value has its size estimated. Labels
+which are read or set together (such as through the bulk protocol) are each
+credited with an equal share of the time taken. This
+adds a noticeable overhead, so profiling should only be used when
+investigating performance.
+"""
+import sys
+import time
+import functools
+from contextlib import contextmanager
+
+
+# ------------------------------------------------------------------------------
+# -- Estimating the size of a value stops descending at this depth, as very
+# -- deep structures would otherwise take longer to measure than to copy
+_MAX_DEPTH = 8
+
+# -- The memento methods through which values are read, set and copied
+# -- together, rather than through the items
+_HOOKS = ('_read_values', '_write_values', '_copy_values')
+
+
+# ------------------------------------------------------------------------------
+class Profiler(object):
+    """
+    Times the getter, copy and setter of every label registered on a memento
+    whilst it is running, and reports the labels ranked by their cost.
+
+    Only the labels registered at the time the profiler is started are
+    profiled.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, memento):
+        """
+        :param memento: The memento to profile
+        :type memento: recollection.Memento
+        """
+        self._memento = memento
+        self._labels = dict()
+        self._originals = list()
+        self._hooks = list()
+
+    # --------------------------------------------------------------------------
+    def __enter__(self):
+        self.start()
+        return self
+
+    # --------------------------------------------------------------------------
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    # --------------------------------------------------------------------------
+    @property
+    def running(self):
+        """
+        Whether the profiler is currently profiling
+
+        :return: bool
+        """
+        return bool(self._originals or self._hooks)
+
+    # --------------------------------------------------------------------------
+    def start(self):
+        """
+        Starts profiling. Anything recorded by a previous run is kept, and
+        added to.
+
+        :return: None
+        """
+        if self.running:
+            return
+
+        for item in self._memento._items_to_record:
+            profile = self._labels.setdefault(item.label, _LabelProfile())
+
+            # -- Hold on to anything the item had set on itself, so we can
+            # -- put it back exactly as it was
+            originals = dict(
+                (name, item.__dict__[name])
+                for name in ('get', 'set', '_copy')
+                if name in item.__dict__
+            )
+
+            item.get = _timed(profile, 'get', item.get)
+            item.set = _timed(profile, 'set', item.set)
+            item._copy = _sized(profile, item._copy)
+
+            self._originals.append((item, originals, _wrappers(item)))
+
+        # -- Values read and set together never pass through the getters
+        # -- and setters of the items, so those calls are timed and shared
+        # -- between the labels involved. Anything already set on the
+        # -- memento for these hooks (such as the wrappers added by stats)
+        # -- is held on to, so it can be put back.
+        memento = self._memento
+        hooks = dict(
+            (name, memento.__dict__[name])
+            for name in _HOOKS
+            if name in memento.__dict__
+        )
+
+        memento._read_values = _shared(
+            self._labels,
+            'get',
+            memento._read_values,
+            lambda args, result: result or (),
+        )
+
+        memento._write_values = _shared(
+            self._labels,
+            'set',
+            memento._write_values,
+            lambda args, result: args[1],
+        )
+
+        memento._copy_values = _copied(self._labels, memento._copy_values)
+
+        self._hooks = [(memento, hooks, _wrappers(memento, _HOOKS))]
+
+    # --------------------------------------------------------------------------
+    def stop(self):
+        """
+        Stops profiling, removing all of its overhead and putting back
+        anything which was wrapped. The results remain available through
+        report.
+
+        Anything which has wrapped the memento since the profiler was
+        started (such as stats) must be removed first, as it would
+        otherwise be lost.
+
+        :raises RuntimeError: If something has wrapped the memento since
+            the profiler was started.
+
+        :return: None
+        """
+        wrapped = self._originals + self._hooks
+
+        for owner, _, wrappers in wrapped:
+            if _wrappers(owner, wrappers) != wrappers:
+                raise RuntimeError(
+                    'The profiler cannot be stopped whilst something which '
+                    'wrapped %s after it was started is still in place' % (
+                        self._memento,
+                    ),
+                )
+
+        for owner, originals, wrappers in wrapped:
+            for name in wrappers:
+                owner.__dict__.pop(name, None)
+
+            owner.__dict__.update(originals)
+
+        self._originals = list()
+        self._hooks = list()
+
+    # --------------------------------------------------------------------------
+    def reset(self):
+        """
+        Discards everything recorded so far
+
+        :return: None
+        """
+        for profile in self._labels.values():
+            profile.reset()
+
+    # --------------------------------------------------------------------------
+    def report(self):
+        """
+        Returns the cost of each label, ranked with the most costly first.
+        Times are given in nanoseconds and sizes in bytes. The getter time
+        excludes the time taken to copy the value.
+
+        The history size of each label is estimated from the states the
+        memento currently holds, along with its share of the total.
+
+        :return: list(dict, ...)
+        """
+        history = _history_sizes(self._memento)
+        total_history = sum(history.values()) or 1
+
+        report = list()
+
+        for label, profile in self._labels.items():
+            report.append(
+                dict(
+                    label=label,
+                    gets=profile.gets,
+                    get_ns=profile.get_ns,
+                    copies=profile.copies,
+                    copy_ns=profile.copy_ns,
+                    sets=profile.sets,
+                    set_ns=profile.set_ns,
+                    total_ns=profile.get_ns + profile.copy_ns + profile.set_ns,
+                    copy_bytes=(
+                        profile.copy_bytes // profile.copies
+                        if profile.copies else 0
+                    ),
+                    history_bytes=history.get(label, 0),
+                    history_share=history.get(label, 0) / total_history,
+                ),
+            )
+
+        return sorted(
+            report,
+            key=lambda entry: entry['total_ns'],
+            reverse=True,
+        )
+
+    # --------------------------------------------------------------------------
+    def format(self):
+        """
+        Returns the report as a human readable table
+
+        :return: str
+        """
+        lines = [
+            '%-24s %12s %12s %12s %12s %12s %8s' % (
+                'Label',
+                'Total (ms)',
+                'Get (ms)',
+                'Copy (ms)',
+                'Set (ms)',
+                'Size (b)',
+                'Memory',
+            ),
+        ]
+
+        for entry in self.report():
+            lines.append(
+                '%-24s %12.3f %12.3f %12.3f %12.3f %12s %7.1f%%' % (
+                    entry['label'][:24],
+                    entry['total_ns'] / 1e6,
+                    entry['get_ns'] / 1e6,
+                    entry['copy_ns'] / 1e6,
+                    entry['set_ns'] / 1e6,
+                    entry['copy_bytes'],
+                    entry['history_share'] * 100,
+                ),
+            )
+
+        return '\n'.join(lines)
+
+
+# ------------------------------------------------------------------------------
+@contextmanager
+def profile(memento):
+    """
+    Profiles the given memento for the duration of the context.
+
+    :param memento: The memento to profile
+    :type memento: recollection.Memento
+
+    :return: Profiler
+    """
+    profiler = Profiler(memento)
+
+    with profiler:
+        yield profiler
+
+
+# ------------------------------------------------------------------------------
+class _LabelProfile(object):
+    """
+    This is an internal and private class which holds what has been
+    recorded for a single label.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self):
+        self.reset()
+
+    # --------------------------------------------------------------------------
+    def reset(self):
+        self.gets = 0
+        self.get_ns = 0
+        self.sets = 0
+        self.set_ns = 0
+        self.copies = 0
+        self.copy_ns = 0
+        self.copy_bytes = 0
+
+
+# ------------------------------------------------------------------------------
+def _wrappers(owner, names=('get', 'set', '_copy')):
+    """
+    Returns what the given object has set on itself for each of the given
+    names, which is None for any it has not set.
+    """
+    return dict((name, owner.__dict__.get(name)) for name in names)
+
+
+# ------------------------------------------------------------------------------
+def _timed(profile, name, func):
+    calls = name + 's'
+    elapsed = name + '_ns'
+
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        start = time.perf_counter_ns()
+        copying = profile.copy_ns
+
+        try:
+            return func(*args, **kwargs)
+
+        finally:
+            # -- Any copy made within the call is recorded as a copy
+            # -- rather than as part of the call itself
+            taken = time.perf_counter_ns() - start
+            taken -= profile.copy_ns - copying
+
+            setattr(profile, elapsed, getattr(profile, elapsed) + taken)
+            setattr(profile, calls, getattr(profile, calls) + 1)
+
+    return timed
+
+
+# ------------------------------------------------------------------------------
+def _shared(profiles, name, func, labels_of):
+    """
+    Times a call which gets or sets the values of several labels at once,
+    crediting each label with an equal share of the time taken.
+    labels_of is given the arguments and result of the call, and returns
+    the labels which were involved.
+    """
+    calls = name + 's'
+    elapsed = name + '_ns'
+
+    @functools.wraps(func)
+    def shared(*args, **kwargs):
+        start = time.perf_counter_ns()
+        result = func(*args, **kwargs)
+        taken = time.perf_counter_ns() - start
+
+        involved = [
+            profiles[label]
+            for label in labels_of(args, result)
+            if label in profiles
+        ]
+
+        for profile in involved:
+            setattr(
+                profile,
+                elapsed,
+                getattr(profile, elapsed) + taken // len(involved),
+            )
+            setattr(profile, calls, getattr(profile, calls) + 1)
+
+        return result
+
+    return shared
+
+
+# ------------------------------------------------------------------------------
+def _sized(profile, func):
+    @functools.wraps(func)
+    def sized(value):
+        start = time.perf_counter_ns()
+        result = func(value)
+        profile.copy_ns += time.perf_counter_ns() - start
+
+        profile.copies += 1
+        profile.copy_bytes += _estimate_size(result)
+
+        return result
+
+    return sized
+
+
+# ------------------------------------------------------------------------------
+def _copied(profiles, func):
+    """
+    Times a copy of the values of several labels at once, crediting each
+    label with an equal share of the time taken along with the size of
+    its own copied value.
+    """
+    @functools.wraps(func)
+    def copied(values):
+        start = time.perf_counter_ns()
+        result = func(values)
+        taken = time.perf_counter_ns() - start
+
+        involved = [label for label in result if label in profiles]
+
+        for label in involved:
+            profile = profiles[label]
+            profile.copy_ns += taken // len(involved)
+            profile.copies += 1
+            profile.copy_bytes += _estimate_size(result[label])
+
+        return result
+
+    return copied
+
+
+# ------------------------------------------------------------------------------
+def _history_sizes(memento):
+    """
+    Returns the estimated number of bytes held by each label across all
+    of the states of the given memento. Values shared between states are
+    only counted once.
+    """
+    sizes = dict()
+    seen = set()
+
+    for snapshot in memento._states:
+        for label, value in snapshot.items():
+            sizes[label] = sizes.get(label, 0) + _estimate_size(value, seen)
+
+    return sizes
+
+
+# ------------------------------------------------------------------------------
+def _estimate_size(value, seen=None, depth=0):
+    """
+    Estimates the number of bytes the given value occupies, including the
+    values it contains.
+    """
+    seen = set() if seen is None else seen
+
+    if id(value) in seen:
+        return 0
+
+    seen.add(id(value))
+    size = sys.getsizeof(value, 0)
+
+    if depth >= _MAX_DEPTH:
+        return size
+
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += _estimate_size(key, seen, depth + 1)
+            size += _estimate_size(item, seen, depth + 1)
+
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += _estimate_size(item, seen, depth + 1)
+
+    elif hasattr(value, '__dict__') and not isinstance(value, type):
+        size += _estimate_size(vars(value), seen, depth + 1)
+
+    return size
@@ -0,0 +1,470 @@
+"""
+This module allows the history of a memento to be replicated into a memento
+within another process, which can then take over should the original
+process fail.
+
+A ReplicationPrimary ships every state stored by its memento to each
+connected ReplicationFollower. Where possible only the labels which changed
+since the previous state are sent. Followers add the states they receive to
+the history of their own memento, in order, and acknowledge each one - so
+the primary can wait until a state is known to be held by every follower.
+
+    ..code-block:: python
+
+        >>> import recollection
+        >>>
+        >>> # -- Within the primary process
+        >>> primary = recollection.ReplicationPrimary(memento)
+        >>>
+        >>> # -- Within the standby process, given primary.address
+        >>> follower = recollection.ReplicationFollower(standby, address)
+        >>>
+        >>> # -- Within the primary, wait until the standby has the latest
+        >>> # -- state
+        >>> memento.store()
+        >>> primary.wait()
+        >>>
+        >>> # -- Should the primary fail, the standby takes over
+        >>> follower.promote()
+
+Connections are made through multiprocessing.connection, and therefore use
+a unix domain socket on posix platforms and a named pipe on Windows.
+"""
+from .constants import log
+from .core import _differs
+from .distributed import _Listener
+from .distributed import _DISCONNECTED
+
+import queue
+import threading
+import collections
+from multiprocessing import connection
+
+
+# ------------------------------------------------------------------------------
+_HISTORY = 'history'
+_FULL = 'full'
+_DELTA = 'delta'
+_ACK = 'ack'
+
+
+# ------------------------------------------------------------------------------
+class ReplicationPrimary(object):
+    """
+    Accepts connections from followers and ships every state stored by
+    the memento to each of them. Every state is given a log sequence number,
+    which increases by one with each state.
+
+    When a follower connects it is first sent the history the primary
+    currently holds, followed by every state from then on.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, memento, address=None, family=None, authkey=None):
+        """
+        :param memento: The memento to replicate
+        :type memento: recollection.Memento
+
+        :param address: The address to listen on. If not given an address
+            is generated, which can be read from the address property.
+        :type address: str
+
+        :param family: The multiprocessing.connection family to listen with.
+            If not given the default for the platform is used.
+        :type family: str
+
+        :param authkey: If given, followers must give the same key
+        :type authkey: bytes
+        """
+        self._memento = memento
+
+        # -- The states held by the primary, along with their sequence
+        # -- numbers, which are sent to followers as they connect
+        self._condition = threading.Condition()
+        self._log = collections.deque(maxlen=memento._max_states or None)
+        self._lsn = 0
+        self._followers = list()
+        self._closed = False
+
+        with memento._lock:
+            for snapshot in reversed(memento._states):
+                self._lsn += 1
+                self._log.append((self._lsn, snapshot))
+
+            memento._push_observers.append(self._ship)
+
+        self._listener = _Listener(
+            self._connected,
+            address=address,
+            family=family,
+            authkey=authkey,
+        )
+
+    # --------------------------------------------------------------------------
+    def __enter__(self):
+        return self
+
+    # --------------------------------------------------------------------------
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # --------------------------------------------------------------------------
+    @property
+    def address(self):
+        """
+        The address followers should connect to
+
+        :return: str
+        """
+        return self._listener.address
+
+    # --------------------------------------------------------------------------
+    @property
+    def lsn(self):
+        """
+        The log sequence number of the most recent state
+
+        :return: int
+        """
+        return self._lsn
+
+    # --------------------------------------------------------------------------
+    def acknowledged(self):
+        """
+        Returns the log sequence number acknowledged by each follower
+
+        :return: list(int, ...)
+        """
+        with self._condition:
+            return [
+                follower.acknowledged
+                for follower in self._followers
+            ]
+
+    # --------------------------------------------------------------------------
+    def wait(self, lsn=None, followers=1, timeout=None):
+        """
+        Blocks until the given number of followers have acknowledged the
+        state with the given log sequence number.
+
+        :param lsn: The log sequence number to wait for. If not given the
+            most recent state is waited for.
+        :type lsn: int
+
+        :param followers: The number of followers which must have
+            acknowledged the state
+        :type followers: int
+
+        :param timeout: The maximum number of seconds to wait
+        :type timeout: float
+
+        :return: True if the state was acknowledged, otherwise False
+        """
+        with self._condition:
+            lsn = self._lsn if lsn is None else lsn
+
+            return self._condition.wait_for(
+                lambda: len(
+                    [
+                        follower
+                        for follower in self._followers
+                        if follower.acknowledged >= lsn
+                    ]
+                ) >= followers,
+                timeout=timeout,
+            )
+
+    # --------------------------------------------------------------------------
+    def close(self):
+        """
+        Stops replicating and disconnects all the followers
+
+        :return: None
+        """
+        with self._memento._lock:
+            if self._ship in self._memento._push_observers:
+                self._memento._push_observers.remove(self._ship)
+
+        with self._condition:
+            if self._closed:
+                return
+
+            self._closed = True
+            followers = list(self._followers)
+
+        self._listener.close()
+
+        for follower in followers:
+            follower.close()
+
+    # --------------------------------------------------------------------------
+    def _ship(self, snapshot):
+        """
+        Called whenever the memento adds a state to its history
+        """
+        with self._condition:
+            self._lsn += 1
+
+            # -- Send only what has changed since the previous state, unless
+            # -- the delta would be no smaller than the state itself
+            message = (_FULL, self._lsn, snapshot)
+
+            if self._log:
+                changed, removed = _delta(self._log[-1][1], snapshot)
+
+                if len(changed) + len(removed) < len(snapshot):
+                    message = (_DELTA, self._lsn, changed, removed)
+
+            self._log.append((self._lsn, snapshot))
+
+            for follower in self._followers:
+                follower.send(message)
+
+    # --------------------------------------------------------------------------
+    def _connected(self, link):
+        with self._condition:
+            if self._closed:
+                link.close()
+                return
+
+            follower = _Follower(link, self._condition)
+
+            # -- Bring the follower up to date before it receives
+            # -- anything else
+            follower.send((_HISTORY, list(self._log)))
+            self._followers.append(follower)
+
+        follower.start(self._remove)
+
+    # --------------------------------------------------------------------------
+    def _remove(self, follower):
+        with self._condition:
+            if follower in self._followers:
+                self._followers.remove(follower)
+
+            self._condition.notify_all()
+
+
+# ------------------------------------------------------------------------------
+class _Follower(object):
+    """
+    This is an internal and private class which manages the connection to
+    a single follower on behalf of the primary. Messages are sent from a
+    thread of their own, so a slow follower never blocks a store.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, link, condition):
+        self.acknowledged = 0
+
+        self._link = link
+        self._condition = condition
+        self._outgoing = queue.Queue()
+
+    # --------------------------------------------------------------------------
+    def start(self, on_disconnect):
+        for target in (self._send, self._receive):
+            thread = threading.Thread(target=target, args=(on_disconnect,))
+            thread.daemon = True
+            thread.start()
+
+    # --------------------------------------------------------------------------
+    def send(self, message):
+        self._outgoing.put(message)
+
+    # --------------------------------------------------------------------------
+    def close(self):
+        self._outgoing.put(None)
+        self._link.close()
+
+    # --------------------------------------------------------------------------
+    def _send(self, on_disconnect):
+        while True:
+            message = self._outgoing.get()
+
+            if message is None:
+                return
+
+            try:
+                self._link.send(message)
+
+            except (OSError, ValueError):
+                on_disconnect(self)
+                return
+
+    # --------------------------------------------------------------------------
+    def _receive(self, on_disconnect):
+        while True:
+            try:
+                action, lsn = self._link.recv()
+
+            except _DISCONNECTED:
+                on_disconnect(self)
+                return
+
+            if action == _ACK:
+                with self._condition:
+                    self.acknowledged = max(self.acknowledged, lsn)
+                    self._condition.notify_all()
+
+
+# ------------------------------------------------------------------------------
+class ReplicationFollower(object):
+    """
+    Connects to a ReplicationPrimary and adds every state it ships to the
+    history of the given memento. States are only added to the history,
+    the target of the memento is left untouched until the follower is
+    promoted.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, memento, address, authkey=None):
+        """
+        :param memento: The memento to hold the replicated history
+        :type memento: recollection.Memento
+
+        :param address: The address of the ReplicationPrimary
+        :type address: str
+
+        :param authkey: The key the ReplicationPrimary was given, if any
+        :type authkey: bytes
+        """
+        self._memento = memento
+        self._link = connection.Client(address, authkey=authkey)
+
+        self._condition = threading.Condition()
+        self._lsn = 0
+        self._previous = None
+        self._promoted = False
+
+        self._thread = threading.Thread(target=self._receive)
+        self._thread.daemon = True
+        self._thread.start()
+
+    # --------------------------------------------------------------------------
+    @property
+    def lsn(self):
+        """
+        The log sequence number of the most recent state applied
+
+        :return: int
+        """
+        return self._lsn
+
+    # --------------------------------------------------------------------------
+    def wait(self, lsn, timeout=None):
+        """
+        Blocks until the state with the given log sequence number has
+        been applied.
+
+        :param lsn: The log sequence number to wait for
+        :type lsn: int
+
+        :param timeout: The maximum number of seconds to wait
+        :type timeout: float
+
+        :return: True if the state was applied, otherwise False
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._lsn >= lsn,
+                timeout=timeout,
+            )
+
+    # --------------------------------------------------------------------------
+    def promote(self, restore=True):
+        """
+        Stops following the primary, leaving the memento free to be used
+        in its place.
+
+        :param restore: If true the target of the memento is set to the
+            most recent state which was replicated
+        :type restore: bool
+
+        :return: The log sequence number of the most recent state
+        """
+        with self._condition:
+            self._promoted = True
+
+        self._link.close()
+
+        with self._memento._lock:
+            if restore and self._memento._states:
+                self._memento._set_state(self._memento._states[0])
+
+        log.debug('Promoted follower at %s', self._lsn)
+
+        return self._lsn
+
+    # --------------------------------------------------------------------------
+    def _receive(self):
+        while True:
+            try:
+                message = self._link.recv()
+
+            except _DISCONNECTED:
+                return
+
+            with self._condition:
+
+                # -- Once promoted the memento is no longer ours to alter
+                if self._promoted:
+                    return
+
+                self._apply(message)
+                self._condition.notify_all()
+
+            try:
+                self._link.send((_ACK, self._lsn))
+
+            except (OSError, ValueError):
+                return
+
+    # --------------------------------------------------------------------------
+    def _apply(self, message):
+        action, records = message[0], message[1:]
+
+        if action == _HISTORY:
+            for lsn, snapshot in records[0]:
+                self._push(lsn, snapshot)
+
+        elif action == _FULL:
+            self._push(*records)
+
+        elif action == _DELTA:
+            lsn, changed, removed = records
+
+            snapshot = dict(self._previous)
+            snapshot.update(changed)
+
+            for label in removed:
+                snapshot.pop(label, None)
+
+            self._push(lsn, snapshot)
+
+    # --------------------------------------------------------------------------
+    def _push(self, lsn, snapshot):
+        self._memento._push(snapshot)
+        self._previous = snapshot
+        self._lsn = lsn
+
+
+# ------------------------------------------------------------------------------
+def _delta(previous, snapshot):
+    """
+    Returns the labels whose values have changed between the two states,
+    along with the labels which have been removed.
+    """
+    changed = dict(
+        (label, value)
+        for label, value in snapshot.items()
+        if label not in previous or _differs(previous[label], value)
+    )
+
+    removed = [
+        label
+        for label in previous
+        if label not in snapshot
+    ]
+
+    return changed, removed
@@ -13,8 +13,24 @@ class SerialiserBase(object):
     Note: Different serialisers have different levels of support for
     different datatypes. Therefore please read the docstrings of the
     serialisers when deciding which serialiser you want to utilise.
+
+    Serialisers which can persist a partial state (only the labels which
+    have changed since the last serialisation) should set SUPPORTS_PATCHES
+    to True and implement serialise_patch. Their deserialise method is then
+    expected to return the full state with all patches applied.
     """
 
+    # -- If True, this serialiser implements serialise_patch and can be
+    # -- used by mementos registered for incremental serialisation
+    SUPPORTS_PATCHES = False
+
+    # -- If True, load parses text (such as json). This is costly enough
+    # -- that very large files are worth parsing in a process pool when
+    # -- deserialising in bulk. Binary formats such as pickle should leave
+    # -- this as False, as handing the loaded data back from another
+    # -- process costs as much as loading it in the first place.
+    PARSES_TEXT = False
+
     # --------------------------------------------------------------------------
     @staticmethod
     @abc.abstractmethod
@@ -36,6 +52,31 @@ class SerialiserBase(object):
         """
         pass
 
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def serialise_patch(patch, identifier):
+        """
+        Attempts to persist only the given subset of labels, such that
+        a subsequent deserialisation will return the previously serialised
+        state updated with the patch. This is only called on serialisers
+        which declare SUPPORTS_PATCHES, and only after a full serialise
+        has taken place for the identifier.
+
+        :param patch: This is a dictionary of only the labels which have
+            changed since the last serialisation
+        :type patch: dict
+
+        :param identifier: This is very dependent on the requirements of
+            each individual serialiser. This could be a filepath, a url,
+            a name etc.
+        :type identifier: str
+
+        :return: None
+        """
+        raise NotImplementedError(
+            'This serialiser does not support serialising patches',
+        )
+
     # --------------------------------------------------------------------------
     @staticmethod
     @abc.abstractmethod
@@ -52,6 +93,25 @@ class SerialiserBase(object):
         """
         pass
 
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def load(f):
+        """
+        Serialisers which store their data in the single file returned by
+        the locator may implement this to load that data from an open
+        binary file. Doing so allows the file reading and the loading of
+        the data to be separated, which is utilised when deserialising
+        many mementos at once.
+
+        :param f: Open binary file object
+        :type f: file
+
+        :return: Dictionary which can be inserted into a memento stack
+        """
+        raise NotImplementedError(
+            'This serialiser does not support loading from a file',
+        )
+
     # --------------------------------------------------------------------------
     @staticmethod
     @abc.abstractmethod
@@ -1,2 +1,4 @@
 from .appdata import JsonAppSerialiser
 from .picklefile import PickleSerialiser
+from .picklebuffer import PickleBufferSerialiser
+from .jsonlines import JsonLinesSerialiser
@@ -1,4 +1,5 @@
 from ..serialiser import SerialiserBase
+from .. import fileio
 
 import os
 import sys
@@ -41,36 +42,40 @@ class JsonAppSerialiser(SerialiserBase):
     would (on windows) result in:
         %APPDATA%/recollection/foo/bar.json
 
+    The file is always replaced atomically, so a failed write will never
+    leave a truncated file behind.
     """
 
+    PARSES_TEXT = True
+
     # --------------------------------------------------------------------------
     @staticmethod
     def serialise(data, identifier):
         path = JsonAppSerialiser.locator(identifier)
 
-        directory = os.path.dirname(path)
-
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-
-        with open(path, 'w') as f:
-            json.dump(
+        fileio.write(
+            path,
+            json.dumps(
                 data,
-                f,
                 indent=4,
                 sort_keys=True,
-            )
+            ).encode('utf-8'),
+        )
 
     # --------------------------------------------------------------------------
     @staticmethod
     def deserialise(identifier):
         path = JsonAppSerialiser.locator(identifier)
 
-        if not os.path.exists(path):
+        if not fileio.exists(path):
             return None
 
-        with open(path, 'r') as f:
-            return json.load(f)
+        return fileio.read(path, JsonAppSerialiser.load)
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def load(f):
+        return json.loads(f.read().decode('utf-8'))
 
     # --------------------------------------------------------------------------
     @staticmethod
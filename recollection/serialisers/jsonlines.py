@@ -0,0 +1,364 @@
+from ..serialiser import SerialiserBase
+from .. import fileio
+from .appdata import _APPDATA_ROOT
+
+import os
+import json
+import base64
+import collections
+
+
+# ------------------------------------------------------------------------------
+# -- Records holding only changed labels are wrapped in this tag so they
+# -- can be distinguished from full records
+_PATCH_TAG = '__patch__'
+
+
+# ------------------------------------------------------------------------------
+class JsonLinesSerialiser(SerialiserBase):
+    """
+    This will serialise the recollection state as a compact json record
+    appended to a json-lines file in the application data location (varies
+    depending on platform). As with the JsonAppSerialiser you can utilise
+    the identifier as a sub-path to create namespaced serialisation objects.
+
+    For instance:
+        serialiser.serialise(data, 'foo/bar')
+
+    would (on windows) result in a record being appended to:
+        %APPDATA%/recollection/foo/bar.jsonl
+
+    Because each serialisation only appends a single line, the cost of a
+    write does not grow with the amount of history held in the file. The
+    most recent record is what is deserialised, whilst the full history can
+    be streamed using the history generator.
+
+    Tuples, sets, frozensets and bytes are encoded in such a way that they
+    are restored as their original types rather than as lists or strings.
+
+    This serialiser supports patches, which are appended as records holding
+    only the changed labels. These are folded onto the preceding full record
+    when deserialising or streaming the history.
+
+    So the file does not grow without bound, once it exceeds MAX_SIZE bytes
+    it is compacted down to (at most) the KEEP most recent states. Setting
+    MAX_SIZE to None retains the full history.
+    """
+
+    SUPPORTS_PATCHES = True
+    PARSES_TEXT = True
+
+    # -- The size of the blocks read when searching backward through
+    # -- the file for the latest record
+    CHUNK_SIZE = 65536
+
+    # -- Once the file grows beyond this many bytes it is compacted,
+    # -- retaining this many of the most recent states
+    MAX_SIZE = 64 * 1024 * 1024
+    KEEP = 100
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def serialise(data, identifier):
+        path = JsonLinesSerialiser.locator(identifier)
+
+        fileio.append(path, _dumps(data))
+        _compact_if_needed(identifier, path)
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def serialise_patch(patch, identifier):
+        path = JsonLinesSerialiser.locator(identifier)
+
+        fileio.append(path, _dumps({_PATCH_TAG: patch}))
+        _compact_if_needed(identifier, path)
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def deserialise(identifier):
+        path = JsonLinesSerialiser.locator(identifier)
+
+        if not fileio.exists(path):
+            return None
+
+        return fileio.read(path, JsonLinesSerialiser.load)
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def load(f):
+        # -- Patches are collected newest first until we reach the full
+        # -- record they apply to
+        patches = list()
+        lines = _reversed_lines(f, JsonLinesSerialiser.CHUNK_SIZE)
+
+        # -- The first segment is whatever follows the final newline, which
+        # -- is either empty or a record that was only partially written, so
+        # -- it is always skipped
+        next(lines)
+
+        for line in lines:
+            if not line.strip():
+                continue
+
+            record = _loads(line)
+
+            if not _is_patch(record):
+                while patches:
+                    record.update(patches.pop())
+                return record
+
+            patches.append(record[_PATCH_TAG])
+
+        return None
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def history(identifier):
+        """
+        This is a generator which streams every state stored against the
+        given identifier, from the oldest to the most recent. Records are
+        decoded one at a time, so the file is never loaded in its entirety.
+        Patch records are yielded as the full state they result in.
+
+        :param identifier: The namespaced identifier the records were
+            serialised with
+        :type identifier: str
+
+        :return: generator(dict, ...)
+        """
+        path = JsonLinesSerialiser.locator(identifier)
+
+        if not fileio.exists(path):
+            return
+
+        state = None
+
+        with fileio.lock(path, exclusive=False), open(path, 'rb') as f:
+            for line in f:
+
+                # -- A line without a newline is a partially written
+                # -- record, which can only ever be the last line
+                if not line.endswith(b'\n'):
+                    return
+
+                if not line.strip():
+                    continue
+
+                record = _loads(line)
+
+                if not _is_patch(record):
+                    state = record
+
+                # -- A patch with nothing to apply to can only come from
+                # -- a file which has been tampered with, so we skip it
+                elif state is not None:
+                    state = dict(state)
+                    state.update(record[_PATCH_TAG])
+
+                else:
+                    continue
+
+                yield state
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def compact(identifier, keep=1, max_size=None):
+        """
+        Rewrites the file for the given identifier such that only the most
+        recent states are retained. Each retained state is written as a
+        full record, so any patches are folded away.
+
+        :param identifier: The namespaced identifier the records were
+            serialised with
+        :type identifier: str
+
+        :param keep: The number of most recent states to retain
+        :type keep: int
+
+        :param max_size: If given, the oldest of the retained states are
+            dropped until the file is no larger than this many bytes. The
+            most recent state is always retained.
+        :type max_size: int
+
+        :return: None
+        """
+        path = JsonLinesSerialiser.locator(identifier)
+
+        if not fileio.exists(path):
+            return
+
+        # -- Hold the lock throughout so nothing can be appended between
+        # -- reading the history and replacing the file
+        with fileio.lock(path):
+            states = collections.deque(
+                JsonLinesSerialiser.history(identifier),
+                maxlen=keep,
+            )
+
+            records = collections.deque(_dumps(state) for state in states)
+
+            if max_size is not None:
+                size = sum(len(record) for record in records)
+
+                while len(records) > 1 and size > max_size:
+                    size -= len(records.popleft())
+
+            # -- Under group durability a write would only be renamed into
+            # -- place after the lock is released, losing anything appended
+            # -- in the meantime, so the rewrite is replaced straight away
+            fileio.replace(path, *records)
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def locator(identifier):
+        """
+        With the given identifier this should return the resolved location
+        of the data
+
+        :param identifier: This is very dependent on the requirements of
+            each individual serialiser. This could be a filepath, a url,
+            a name etc.
+        :type identifier: str
+
+        :return: str
+        """
+        parts = identifier.split('/')
+        parts[-1] = parts[-1] + '.jsonl'
+        path = _APPDATA_ROOT
+
+        while parts:
+            path = os.path.join(
+                path,
+                parts.pop(0),
+            )
+
+        return path
+
+
+# ------------------------------------------------------------------------------
+def _compact_if_needed(identifier, path):
+    """
+    Compacts the file once it has grown beyond the maximum size. What is
+    retained is limited to half the maximum size, so the cost of each
+    compaction is spread across many serialisations.
+    """
+    max_size = JsonLinesSerialiser.MAX_SIZE
+
+    if max_size is None or os.path.getsize(path) <= max_size:
+        return
+
+    JsonLinesSerialiser.compact(
+        identifier,
+        keep=JsonLinesSerialiser.KEEP,
+        max_size=max_size // 2,
+    )
+
+
+# ------------------------------------------------------------------------------
+def _dumps(data):
+    return json.dumps(
+        _encode(data),
+        separators=(',', ':'),
+    ).encode('utf-8') + b'\n'
+
+
+# ------------------------------------------------------------------------------
+def _loads(line):
+    return json.loads(
+        line.decode('utf-8'),
+        object_hook=_decode,
+    )
+
+
+# ------------------------------------------------------------------------------
+def _is_patch(record):
+    return len(record) == 1 and _PATCH_TAG in record
+
+
+# ------------------------------------------------------------------------------
+def _encode(value):
+    # -- Anything not in the dispatch table is either natively supported
+    # -- by json or is something we cannot encode, in which case we let
+    # -- json raise its own error
+    encoder = _ENCODERS.get(type(value))
+
+    if encoder is None:
+        return value
+
+    return encoder(value)
+
+
+# ------------------------------------------------------------------------------
+def _decode(obj):
+    if len(obj) != 1:
+        return obj
+
+    for tag, value in obj.items():
+        decoder = _DECODERS.get(tag)
+
+        if decoder is None:
+            return obj
+
+        return decoder(value)
+
+
+# ------------------------------------------------------------------------------
+def _reversed_lines(f, chunk_size):
+    """
+    Yields the newline separated segments of the given binary file from the
+    end of the file to the start, reading it in blocks of chunk_size.
+    """
+    f.seek(0, os.SEEK_END)
+    position = f.tell()
+    pending = b''
+
+    while position > 0:
+        step = min(chunk_size, position)
+        position -= step
+
+        f.seek(position)
+        lines = (f.read(step) + pending).split(b'\n')
+
+        # -- The first segment may continue into the previous block
+        # -- so we carry it forward rather than yielding it
+        pending = lines.pop(0)
+
+        for line in reversed(lines):
+            yield line
+
+    yield pending
+
+
+# ------------------------------------------------------------------------------
+# -- These tables map python types to their tagged json representation
+# -- and tags back to python types. Looking up the exact type keeps the
+# -- encoding to a single dictionary access per value.
+_ENCODERS = {
+    dict: lambda value: dict(
+        (key, _encode(item))
+        for key, item in value.items()
+    ),
+    list: lambda value: [_encode(item) for item in value],
+    tuple: lambda value: {'__tuple__': [_encode(item) for item in value]},
+    set: lambda value: {'__set__': [_encode(item) for item in value]},
+    frozenset: lambda value: {
+        '__frozenset__': [_encode(item) for item in value],
+    },
+    bytearray: lambda value: {
+        '__bytearray__': base64.b64encode(value).decode('ascii'),
+    },
+}
+
+_DECODERS = {
+    '__tuple__': tuple,
+    '__set__': set,
+    '__frozenset__': frozenset,
+    '__bytes__': lambda value: base64.b64decode(value),
+    '__bytearray__': lambda value: bytearray(base64.b64decode(value)),
+}
+
+# -- Under python 2 bytes is str, which json already handles
+if bytes is not str:
+    _ENCODERS[bytes] = lambda value: {
+        '__bytes__': base64.b64encode(value).decode('ascii'),
+    }
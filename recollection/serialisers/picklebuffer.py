@@ -0,0 +1,248 @@
+from ..serialiser import SerialiserBase
+from .. import fileio
+
+import mmap
+import pickle
+
+
+# ------------------------------------------------------------------------------
+# -- Out-of-band buffers are only available from pickle protocol 5 onward
+# -- (python 3.8+). On older interpreters we fall back to a standard in-band
+# -- pickle stream with no sidecar file.
+_SUPPORTS_OUT_OF_BAND = hasattr(pickle, 'PickleBuffer')
+
+# -- Buffers are written into the sidecar on this boundary, which keeps
+# -- any array-like data nicely aligned when it is mapped back in.
+_ALIGNMENT = 64
+
+
+# ------------------------------------------------------------------------------
+class PickleBufferSerialiser(SerialiserBase):
+    """
+    This will serialise the memento state to a pickle file using protocol 5
+    out-of-band buffers. Any large buffer data (bytes, bytearray, memoryview
+    or array-like objects which support protocol 5, such as numpy arrays) is
+    written to a sidecar file rather than being copied into the pickle
+    stream.
+
+    When deserialising, the sidecar file is memory-mapped and the buffers
+    are handed to the unpickler as views onto that map - meaning large
+    payloads are never copied through python objects on load.
+
+    The identifier for this serialiser should be the absolute path to the
+    file you want to write to. The sidecar will be written alongside it
+    with a '.buffers' extension.
+
+    For instance:
+        serialiser.serialise(data, '/tmp/foo/bar.pkl')
+
+    would result in:
+        /tmp/foo/bar.pkl
+        /tmp/foo/bar.pkl.buffers
+
+    Note: Top level bytes and bytearray values are restored as the type
+    they were stored as, which means they are copied out of the map. Top
+    level memoryview values are restored as read-only memoryview objects
+    pointing into the mapped sidecar. Such values cannot be deep copied,
+    so you should register those labels with copy_value=False.
+    """
+
+    # -- Top level bytes and bytearray values smaller than this are left
+    # -- in-band as the overhead of mapping them outweighs the copy
+    MIN_BUFFER_SIZE = 4096
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def serialise(data, identifier):
+        """
+        The identifier for this serialiser should be the absolute path
+        to the file you want to write to
+
+        :param data: dict
+        :param identifier: str
+
+        :return:
+        """
+        if not _SUPPORTS_OUT_OF_BAND:
+            fileio.write(
+                identifier,
+                pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL),
+            )
+            return
+
+        # -- Wrap any large top level buffers so the pickler will hand
+        # -- them to us rather than copying them into the stream
+        data = dict(
+            (label, PickleBufferSerialiser._wrap(value))
+            for label, value in data.items()
+        )
+
+        buffers = list()
+        payload = pickle.dumps(
+            data,
+            protocol=5,
+            buffer_callback=buffers.append,
+        )
+
+        # -- Lay the buffers out for the sidecar, recording where each
+        # -- one lives so we can slice them back out of the map
+        layout = list()
+        chunks = list()
+        offset = 0
+
+        for buffer_ in buffers:
+            raw = buffer_.raw()
+            padding = -offset % _ALIGNMENT
+
+            if padding:
+                chunks.append(b'\0' * padding)
+                offset += padding
+
+            chunks.append(raw)
+            layout.append((offset, raw.nbytes))
+            offset += raw.nbytes
+
+        # -- The two files must always be read as a pair, so they are
+        # -- written (and committed) together under the locks of both. The
+        # -- sidecar may currently be mapped by a reader, so we must never
+        # -- truncate it in place. The atomic write replaces the file,
+        # -- leaving any existing maps pointing at the old (still valid)
+        # -- data.
+        fileio.write_all(
+            [
+                (PickleBufferSerialiser.sidecar(identifier), chunks),
+                (identifier, [pickle.dumps(layout, protocol=5), payload]),
+            ],
+        )
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def deserialise(identifier):
+        """
+        The identifier for this serialiser should be the absolute path
+        to the file you want to read from
+
+        :param identifier: str
+
+        :return: dict
+        """
+        if not fileio.exists(identifier):
+            return None
+
+        if not _SUPPORTS_OUT_OF_BAND:
+            with open(identifier, 'rb') as f:
+                return pickle.load(f)
+
+        # -- The mapped buffers cannot be copied, so this serialiser
+        # -- never makes use of the read cache
+        with fileio.lock(identifier, exclusive=False), \
+                open(identifier, 'rb') as f:
+            layout = pickle.load(f)
+
+            return pickle.load(
+                f,
+                buffers=PickleBufferSerialiser._map_buffers(
+                    identifier,
+                    layout,
+                ),
+            )
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def locator(identifier):
+        """
+        With the given identifier this should return the resolved location
+        of the data
+
+        :param identifier: This is very dependent on the requirements of
+            each individual serialiser. This could be a filepath, a url,
+            a name etc.
+        :type identifier: str
+
+        :return: str
+        """
+        return identifier
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def sidecar(identifier):
+        """
+        Returns the path of the file which holds the out-of-band buffers
+        for the given identifier
+
+        :param identifier: str
+
+        :return: str
+        """
+        return identifier + '.buffers'
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def _wrap(value):
+        # -- Memoryviews cannot be pickled in-band at all, so they are
+        # -- always written to the sidecar whatever their size
+        if isinstance(value, memoryview):
+            return _OutOfBand(value)
+
+        if not isinstance(value, (bytes, bytearray)):
+            return value
+
+        if len(value) >= PickleBufferSerialiser.MIN_BUFFER_SIZE:
+            return _OutOfBand(value)
+
+        return value
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def _map_buffers(identifier, layout):
+        # -- An empty sidecar cannot be mapped, but equally there is
+        # -- nothing in it to map
+        if not any(length for _, length in layout):
+            return [memoryview(b'') for _ in layout]
+
+        with open(PickleBufferSerialiser.sidecar(identifier), 'rb') as f:
+            mapped = mmap.mmap(
+                f.fileno(),
+                0,
+                access=mmap.ACCESS_READ,
+            )
+
+        # -- Each view holds a reference to the map, so it will stay
+        # -- open for as long as any restored value needs it
+        view = memoryview(mapped)
+
+        return [
+            view[offset:offset + length]
+            for offset, length in layout
+        ]
+
+
+# ------------------------------------------------------------------------------
+class _OutOfBand(object):
+    """
+    This is an internal and private class which pickles a buffer value
+    out-of-band, recording its type so it is restored as the same type.
+    """
+
+    __slots__ = ('value',)
+
+    # --------------------------------------------------------------------------
+    def __init__(self, value):
+        self.value = value
+
+    # --------------------------------------------------------------------------
+    def __reduce__(self):
+        return _restore, (type(self.value), pickle.PickleBuffer(self.value))
+
+
+# ------------------------------------------------------------------------------
+def _restore(kind, buffer_):
+    """
+    Returns the given buffer (a view onto the mapped sidecar) as the type
+    it was stored as. Memoryviews are returned as they are, so they are
+    never copied.
+    """
+    if kind is memoryview:
+        return memoryview(buffer_)
+
+    return kind(buffer_)
@@ -1,6 +1,6 @@
 from ..serialiser import SerialiserBase
+from .. import fileio
 
-import os
 
 try:
     # noinspection PyPep8Naming
@@ -24,8 +24,16 @@ class PickleSerialiser(SerialiserBase):
     would (on windows) result in:
         %APPDATA%/memento/foo/bar.json
 
+    Full serialisations replace the file atomically, so a failed write
+    will never leave a truncated file behind.
+
+    This serialiser supports patches. Each patch is appended to the file
+    as an additional pickle frame following the full state, and the frames
+    are folded together when deserialising.
     """
 
+    SUPPORTS_PATCHES = True
+
     # --------------------------------------------------------------------------
     @staticmethod
     def serialise(data, identifier):
@@ -38,16 +46,27 @@ class PickleSerialiser(SerialiserBase):
          
         :return: 
         """
-        directory = os.path.dirname(identifier)
+        fileio.write(
+            identifier,
+            pickle.dumps(data),
+        )
 
-        if not os.path.exists(directory):
-            os.makedirs(directory)
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def serialise_patch(patch, identifier):
+        """
+        Appends the patch as a new pickle frame at the end of the file
+        written by the last full serialisation
 
-        with open(identifier, 'wb') as f:
-            pickle.dump(
-                data,
-                f,
-            )
+        :param patch: dict
+        :param identifier: str
+
+        :return:
+        """
+        fileio.append(
+            identifier,
+            pickle.dumps(patch),
+        )
 
     # --------------------------------------------------------------------------
     @staticmethod
@@ -60,11 +79,25 @@ class PickleSerialiser(SerialiserBase):
          
         :return: 
         """
-        if not os.path.exists(identifier):
+        if not fileio.exists(identifier):
             return None
 
-        with open(identifier, 'rb') as f:
-            return pickle.load(f)
+        return fileio.read(identifier, PickleSerialiser.load)
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def load(f):
+        data = pickle.load(f)
+
+        # -- Apply any patches which were appended after the full state. A
+        # -- frame which cannot be read was only partially written, so we
+        # -- stop there.
+        while True:
+            try:
+                data.update(pickle.load(f))
+
+            except (EOFError, pickle.UnpicklingError):
+                return data
 
     # --------------------------------------------------------------------------
     @staticmethod
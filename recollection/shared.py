@@ -0,0 +1,353 @@
+"""
+This module allows the history of a memento to be read by other processes
+through shared memory. The process which owns the memento mirrors every
+stored state into a ring of fixed size slots within a shared memory
+segment, and any other process can attach to that segment by name and
+decode the states directly out of it - without any of the state having
+to be sent through a pipe.
+
+    ..code-block:: python
+
+        >>> import recollection
+        >>>
+        >>> # -- Within the owning process
+        >>> memento = recollection.Memento(scene)
+        >>> shared = recollection.SharedHistory(memento)
+        >>>
+        >>> # -- Within any other process, given shared.name
+        >>> reader = recollection.SharedHistoryReader(name)
+        >>> previous = reader.state(1)
+
+States are written with pickle, so anything stored must be picklable. Each
+state must also fit within the slot size, and any state which does not is
+recorded as being unavailable to readers.
+"""
+from . import exceptions
+from .constants import log
+
+import struct
+import pickle
+
+try:
+    from multiprocessing import shared_memory
+
+except ImportError:
+    shared_memory = None
+
+
+# ------------------------------------------------------------------------------
+# -- The segment starts with a header of a marker, the number of slots, the
+# -- size of each slot and the total number of states ever written
+_MARKER = b'RCSH'
+_HEADER = struct.Struct('<4s4xQQQ')
+_TOTAL = struct.Struct('<Q')
+_TOTAL_OFFSET = _HEADER.size - _TOTAL.size
+
+# -- Each slot starts with the sequence number of the state it holds (which
+# -- is zero whilst being written) and the length of the pickled state
+_SLOT = struct.Struct('<QQ')
+
+# -- The length given to a slot whose state was too large to write
+_OVERSIZED = 0xFFFFFFFFFFFFFFFF
+
+# -- How many times a reader will re-read a slot which was overwritten
+# -- whilst it was being read
+_READ_ATTEMPTS = 16
+
+
+# ------------------------------------------------------------------------------
+class SharedHistory(object):
+    """
+    Mirrors the history of a memento into a shared memory segment which
+    other processes can read through a SharedHistoryReader.
+
+    The segment holds a fixed number of slots, which by default matches
+    the max states of the memento, so readers can access the same history
+    as the memento itself.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, memento, slots=None, slot_size=65536, name=None):
+        """
+        :param memento: The memento whose history should be shared
+        :type memento: recollection.Memento
+
+        :param slots: The number of states held in the segment. If not
+            given the max states of the memento is used.
+        :type slots: int
+
+        :param slot_size: The maximum number of bytes a pickled state
+            may occupy
+        :type slot_size: int
+
+        :param name: The name to give the shared memory segment. If not
+            given a unique name is generated.
+        :type name: str
+        """
+        if shared_memory is None:
+            raise exceptions.StorageError(
+                'Shared memory is not available in this version of python',
+            )
+
+        self._memento = memento
+        self._slots = slots or memento._max_states or 100
+        self._slot_size = slot_size
+        self._stride = _stride(slot_size)
+        self._total = 0
+
+        self._memory = shared_memory.SharedMemory(
+            name=name,
+            create=True,
+            size=_HEADER.size + (self._slots * self._stride),
+        )
+
+        _HEADER.pack_into(
+            self._memory.buf,
+            0,
+            _MARKER,
+            self._slots,
+            self._slot_size,
+            0,
+        )
+
+        # -- Mirror the states we already have, oldest first, and then
+        # -- every state from here on
+        with memento._lock:
+            for snapshot in reversed(memento._states[:self._slots]):
+                self._write(snapshot)
+
+            memento._push_observers.append(self._write)
+
+    # --------------------------------------------------------------------------
+    def __enter__(self):
+        return self
+
+    # --------------------------------------------------------------------------
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # --------------------------------------------------------------------------
+    @property
+    def name(self):
+        """
+        The name other processes should use to attach to this history
+
+        :return: str
+        """
+        return self._memory.name
+
+    # --------------------------------------------------------------------------
+    def close(self):
+        """
+        Stops mirroring the memento and removes the shared memory segment.
+        Any readers which are still attached can continue to read the
+        states which were written before this was called.
+
+        :return: None
+        """
+        with self._memento._lock:
+            if self._write in self._memento._push_observers:
+                self._memento._push_observers.remove(self._write)
+
+        self._memory.close()
+
+        try:
+            self._memory.unlink()
+
+        except FileNotFoundError:
+            pass
+
+    # --------------------------------------------------------------------------
+    def _write(self, snapshot):
+        buf = self._memory.buf
+
+        sequence = self._total + 1
+        offset = _HEADER.size + ((sequence - 1) % self._slots) * self._stride
+
+        data = pickle.dumps(dict(snapshot), protocol=pickle.HIGHEST_PROTOCOL)
+        length = len(data)
+
+        # -- Mark the slot as being written, so any reader part way
+        # -- through reading the state it held knows to discard it
+        _SLOT.pack_into(buf, offset, 0, 0)
+
+        if length > self._slot_size:
+            log.warning(
+                'State of %s bytes is too large to share, the slot size '
+                'is %s bytes',
+                length,
+                self._slot_size,
+            )
+            length = _OVERSIZED
+
+        else:
+            buf[offset + _SLOT.size:offset + _SLOT.size + length] = data
+
+        _SLOT.pack_into(buf, offset, sequence, length)
+
+        # -- Only once the slot is complete do we tell readers about it
+        self._total = sequence
+        _TOTAL.pack_into(buf, _TOTAL_OFFSET, sequence)
+
+
+# ------------------------------------------------------------------------------
+class SharedHistoryReader(object):
+    """
+    Gives read-only access to a history being shared by a SharedHistory
+    in another process. Indexing works in the same way as restoring, in
+    that an index of zero is the most recent state.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, name):
+        """
+        :param name: The name of the SharedHistory to attach to
+        :type name: str
+        """
+        if shared_memory is None:
+            raise exceptions.StorageError(
+                'Shared memory is not available in this version of python',
+            )
+
+        self._memory = _attach(name)
+
+        marker, self._slots, self._slot_size, _ = _HEADER.unpack_from(
+            self._memory.buf,
+            0,
+        )
+
+        if marker != _MARKER:
+            self._memory.close()
+            raise exceptions.StorageError(
+                '%s is not a shared recollection history' % name,
+            )
+
+        self._stride = _stride(self._slot_size)
+
+    # --------------------------------------------------------------------------
+    def __enter__(self):
+        return self
+
+    # --------------------------------------------------------------------------
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # --------------------------------------------------------------------------
+    def count(self):
+        """
+        Returns how many states are currently available
+
+        :return: int
+        """
+        return min(self._total(), self._slots)
+
+    # --------------------------------------------------------------------------
+    def state(self, index=0):
+        """
+        Decodes the state at the given index.
+
+        :param index: The amount of steps back from the most recent state
+        :type index: int
+
+        :raises IndexError: If there is no state at the given index
+        :raises StorageError: If the state was too large to be shared
+
+        :return: dict
+        """
+        buf = self._memory.buf
+
+        for _ in range(_READ_ATTEMPTS):
+            total = self._total()
+
+            if index < 0 or index >= min(total, self._slots):
+                raise IndexError('There is no state at index %s' % index)
+
+            sequence = total - index
+            offset = _HEADER.size + (
+                ((sequence - 1) % self._slots) * self._stride
+            )
+
+            written, length = _SLOT.unpack_from(buf, offset)
+
+            # -- The slot has already been reused for a newer state, so
+            # -- we try again with the latest total
+            if written != sequence:
+                continue
+
+            if length == _OVERSIZED:
+                raise exceptions.StorageError(
+                    'The state at index %s was too large to share' % index,
+                )
+
+            try:
+                state = pickle.loads(
+                    buf[offset + _SLOT.size:offset + _SLOT.size + length],
+                )
+
+            except Exception:
+
+                # -- A state which was overwritten whilst being read may
+                # -- well fail to decode, in which case we try again. If
+                # -- the slot is unchanged the state itself cannot be
+                # -- decoded, which the caller needs to know about.
+                if _SLOT.unpack_from(buf, offset)[0] != sequence:
+                    continue
+
+                raise
+
+            # -- Only if the slot is unchanged now we have read it can we
+            # -- be sure the state was not overwritten whilst being read
+            if _SLOT.unpack_from(buf, offset)[0] == sequence:
+                return state
+
+        raise exceptions.StorageError(
+            'The state at index %s was overwritten whilst being read' % index,
+        )
+
+    # --------------------------------------------------------------------------
+    def states(self):
+        """
+        Decodes every available state, with the most recent state first
+
+        :return: list(dict, ...)
+        """
+        return [
+            self.state(index)
+            for index in range(self.count())
+        ]
+
+    # --------------------------------------------------------------------------
+    def close(self):
+        """
+        Detaches from the shared memory segment
+
+        :return: None
+        """
+        self._memory.close()
+
+    # --------------------------------------------------------------------------
+    def _total(self):
+        return _TOTAL.unpack_from(self._memory.buf, _TOTAL_OFFSET)[0]
+
+
+# ------------------------------------------------------------------------------
+def _stride(slot_size):
+    """
+    Returns the distance between slots, keeping each slot 8 byte aligned
+    """
+    return (_SLOT.size + slot_size + 7) & ~7
+
+
+# ------------------------------------------------------------------------------
+def _attach(name):
+    """
+    Attaches to an existing shared memory segment without taking ownership
+    of it, where the version of python allows. Older versions register the
+    segment with the resource tracker of this process tree, which is shared
+    with the owner when this process was started by it.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
@@ -0,0 +1,316 @@
+"""
+This module holds the instrumentation which can be enabled on a memento to
+measure how much time it spends storing, restoring, copying and serialising.
+
+Instrumentation works by wrapping the methods of the individual memento
+(and its registered items) in timed equivalents. When it is not enabled
+nothing is wrapped, so it has no cost at all.
+
+    ..code-block:: python
+
+        >>> import recollection
+        >>>
+        >>> memento = recollection.Memento(scene)
+        >>> memento.enable_stats()
+        >>>
+        >>> for _ in range(1000):
+        ...     memento.store()
+        >>>
+        >>> memento.stats()['latency']['store']['mean_ns']
+"""
+from . import fileio
+
+import time
+import functools
+
+
+# ------------------------------------------------------------------------------
+# -- The memento methods which are timed, and the name each is recorded as
+_TIMED_METHODS = (
+    ('store', 'store'),
+    ('restore', 'restore'),
+    ('serialise', 'serialise'),
+    ('_write', 'serialiser'),
+    ('_copy_values', 'copy'),
+)
+
+# -- Every memento method which instrumenting wraps
+_WRAPPED = tuple(method for method, _ in _TIMED_METHODS) + (
+    '_push',
+    'register',
+)
+
+# -- Latencies are recorded into power of two buckets of nanoseconds, such
+# -- that bucket N holds latencies of less than 2^N nanoseconds
+_BUCKETS = 64
+
+
+# ------------------------------------------------------------------------------
+class Stats(object):
+    """
+    Holds the counters and latency histograms recorded for a memento.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self):
+        self.counters = dict(
+            store=0,
+            restore=0,
+            serialise=0,
+            evictions=0,
+            bytes_written=0,
+        )
+        self.histograms = dict()
+
+        # -- Each object which has been wrapped, along with what it had set
+        # -- on itself beforehand and the wrappers set in their place
+        self._wrapped = list()
+
+    # --------------------------------------------------------------------------
+    def record(self, name, nanoseconds):
+        """
+        Records a single latency against the given name
+
+        :param name: The name of what was timed
+        :type name: str
+
+        :param nanoseconds: How long it took
+        :type nanoseconds: int
+
+        :return: None
+        """
+        histogram = self.histograms.get(name)
+
+        if histogram is None:
+            histogram = self.histograms[name] = _Histogram()
+
+        histogram.record(nanoseconds)
+
+    # --------------------------------------------------------------------------
+    def snapshot(self):
+        """
+        Returns a copy of everything recorded so far
+
+        :return: dict
+        """
+        return dict(
+            counters=dict(self.counters),
+            latency=dict(
+                (name, histogram.snapshot())
+                for name, histogram in self.histograms.items()
+            ),
+        )
+
+
+# ------------------------------------------------------------------------------
+class _Histogram(object):
+    """
+    This is an internal and private class which records latencies into
+    power of two buckets.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self):
+        self.buckets = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = 0
+
+    # --------------------------------------------------------------------------
+    def record(self, nanoseconds):
+        self.buckets[min(nanoseconds.bit_length(), _BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += nanoseconds
+        self.maximum = max(self.maximum, nanoseconds)
+
+        if self.minimum is None or nanoseconds < self.minimum:
+            self.minimum = nanoseconds
+
+    # --------------------------------------------------------------------------
+    def percentile(self, percentile):
+        """
+        Returns the upper bound of the bucket holding the given percentile
+        """
+        target = self.count * percentile / 100.0
+        seen = 0
+
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+
+            if count and seen >= target:
+                return min(2 ** bucket, self.maximum)
+
+        return self.maximum
+
+    # --------------------------------------------------------------------------
+    def snapshot(self):
+        return dict(
+            count=self.count,
+            total_ns=self.total,
+            min_ns=self.minimum or 0,
+            max_ns=self.maximum,
+            mean_ns=self.total / self.count if self.count else 0,
+            p50_ns=self.percentile(50),
+            p99_ns=self.percentile(99),
+            buckets=dict(
+                (2 ** bucket, count)
+                for bucket, count in enumerate(self.buckets)
+                if count
+            ),
+        )
+
+
+# ------------------------------------------------------------------------------
+def instrument(memento):
+    """
+    Wraps the methods of the given memento, and of its registered items,
+    such that they record into a new Stats object.
+
+    :param memento: The memento to instrument
+    :type memento: recollection.Memento
+
+    :return: Stats
+    """
+    stats = Stats()
+
+    # -- Hold on to anything already set on the memento, such as the
+    # -- wrappers of a running profiler, so it can be put back
+    originals = dict(
+        (method, memento.__dict__[method])
+        for method in _WRAPPED
+        if method in memento.__dict__
+    )
+
+    for method, name in _TIMED_METHODS:
+        setattr(
+            memento,
+            method,
+            _timed(stats, name, getattr(memento, method)),
+        )
+
+    memento._write = _counted(stats, memento._write)
+    memento._push = _evicting(stats, memento, memento._push)
+
+    # -- Items registered from now on need to be timed too
+    register = memento.register
+
+    @functools.wraps(register)
+    def instrumented_register(*args, **kwargs):
+        result = register(*args, **kwargs)
+        _instrument_items(stats, memento)
+        return result
+
+    memento.register = instrumented_register
+
+    stats._wrapped.append(
+        (memento, originals, _wrappers(memento, _WRAPPED)),
+    )
+    _instrument_items(stats, memento)
+
+    return stats
+
+
+# ------------------------------------------------------------------------------
+def uninstrument(memento):
+    """
+    Removes all the wrapping added by instrument, leaving the memento and
+    its items exactly as they were.
+
+    Anything which has wrapped the memento since it was instrumented (such
+    as a running profiler) must be removed first, as it would otherwise
+    be lost.
+
+    :param memento: The memento to remove instrumentation from
+    :type memento: recollection.Memento
+
+    :raises RuntimeError: If something has wrapped the memento since it
+        was instrumented.
+
+    :return: None
+    """
+    wrapped = memento._stats._wrapped
+
+    for owner, _, wrappers in wrapped:
+        if _wrappers(owner, wrappers) != wrappers:
+            raise RuntimeError(
+                'Stats cannot be disabled on %s whilst something which '
+                'wrapped it after they were enabled is still in place' % (
+                    memento,
+                ),
+            )
+
+    for owner, originals, wrappers in wrapped:
+        for name in wrappers:
+            owner.__dict__.pop(name, None)
+
+        owner.__dict__.update(originals)
+
+    del wrapped[:]
+
+
+# ------------------------------------------------------------------------------
+def _instrument_items(stats, memento):
+    for item in memento._items_to_record:
+        if '_copy' not in item.__dict__:
+            item._copy = _timed(stats, 'copy', item._copy)
+            stats._wrapped.append((item, dict(), _wrappers(item, ['_copy'])))
+
+
+# ------------------------------------------------------------------------------
+def _wrappers(owner, names):
+    """
+    Returns what the given object has set on itself for each of the given
+    names, which is None for any it has not set.
+    """
+    return dict((name, owner.__dict__.get(name)) for name in names)
+
+
+# ------------------------------------------------------------------------------
+def _timed(stats, name, func):
+    counted = name in stats.counters
+
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        if counted:
+            stats.counters[name] += 1
+
+        start = time.perf_counter_ns()
+
+        try:
+            return func(*args, **kwargs)
+
+        finally:
+            stats.record(name, time.perf_counter_ns() - start)
+
+    return timed
+
+
+# ------------------------------------------------------------------------------
+def _counted(stats, func):
+    """
+    Counts the bytes written by the serialiser. Serialisations handed to
+    a pool are written by other processes and are therefore not counted.
+    """
+    @functools.wraps(func)
+    def counted(*args, **kwargs):
+        with fileio.counting() as written:
+            try:
+                return func(*args, **kwargs)
+
+            finally:
+                stats.counters['bytes_written'] += written[0]
+
+    return counted
+
+
+# ------------------------------------------------------------------------------
+def _evicting(stats, memento, func):
+    @functools.wraps(func)
+    def evicting(snapshot):
+        count = len(memento._states)
+        result = func(snapshot)
+        stats.counters['evictions'] += count + 1 - len(memento._states)
+        return result
+
+    return evicting
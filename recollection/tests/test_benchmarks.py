@@ -0,0 +1,81 @@
+from recollection import benchmarks
+from recollection.benchmarks import core
+from recollection.benchmarks import __main__ as cli
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+
+# ------------------------------------------------------------------------------
+class TestBenchmarks(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    # --------------------------------------------------------------------------
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    # --------------------------------------------------------------------------
+    def test_results_are_written_as_json(self):
+        """
+        Checks that running a benchmark from the command line writes
+        its results to the given file
+
+        :return:
+        """
+        path = os.path.join(self.directory, 'results.json')
+
+        cli.main(['inference', '--quick', '--output', path])
+
+        with open(path, 'r') as f:
+            results = json.load(f)
+
+        self.assertEqual(
+            ['inference', 'inference_store', 'memento_store', 'plain'],
+            sorted(
+                result['params']['mode']
+                for result in results['results']
+            ),
+        )
+
+        for result in results['results']:
+            self.assertGreater(
+                result['ops_per_second'],
+                0,
+            )
+
+    # --------------------------------------------------------------------------
+    def test_unknown_benchmark(self):
+        """
+        Checks that asking for a benchmark which does not exist
+        raises a ValueError
+
+        :return:
+        """
+        self.assertRaises(
+            ValueError,
+            benchmarks.run,
+            names=['missing'],
+        )
+
+    # --------------------------------------------------------------------------
+    def test_restores_set_values(self):
+        """
+        Checks that every restore measured by the core benchmark sets the
+        values, rather than finding them already in place
+
+        :return:
+        """
+        # -- Hold on to the target, as the memento only references it weakly
+        target, memento = core._memento(3, 10)
+
+        for _ in range(3):
+            self.assertEqual(
+                ['value_0', 'value_1', 'value_2'],
+                sorted(memento.restore(1)),
+            )
@@ -0,0 +1,217 @@
+from recollection import bulk
+from recollection import fileio
+from recollection.tests.classes import SetterTestClass
+
+import os
+import shutil
+import tempfile
+import unittest
+import recollection
+
+
+# ------------------------------------------------------------------------------
+class TestBulk(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    # --------------------------------------------------------------------------
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    # --------------------------------------------------------------------------
+    def test_deserialise_all(self):
+        """
+        Ensures that every memento is deserialised, including those which
+        share an identifier, and that shared state is not shared between
+        the targets
+
+        :return:
+        """
+        paths = [
+            os.path.join(self.directory, '%s.pkl' % idx)
+            for idx in range(5)
+        ]
+
+        for idx, path in enumerate(paths):
+            recollection.PickleSerialiser.serialise(
+                {'target': [idx], 'distance': idx * 10},
+                path,
+            )
+
+        pairs = [
+            self._memento_test_data(path)
+            for path in paths + [paths[0]]
+        ]
+
+        recollection.deserialise_all(
+            [stack for _, stack in pairs],
+            process_threshold=None,
+        )
+
+        for idx, (test_class, _) in enumerate(pairs[:5]):
+            self.assertEqual(
+                [idx],
+                test_class.getTarget(),
+            )
+
+            self.assertEqual(
+                idx * 10,
+                test_class.getDistance(),
+            )
+
+        # -- The two mementos sharing a path should not share values
+        self.assertEqual(
+            pairs[0][0].getTarget(),
+            pairs[5][0].getTarget(),
+        )
+
+        self.assertIsNot(
+            pairs[0][0].getTarget(),
+            pairs[5][0].getTarget(),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_deserialise_all_in_processes(self):
+        """
+        Ensures that text files parsed in the process pool are applied, and
+        that missing files leave the target untouched
+
+        :return:
+        """
+        identifier = 'memento/tests/bulk_large'
+        path = recollection.JsonAppSerialiser.locator(identifier)
+
+        recollection.JsonAppSerialiser.serialise(
+            {'target': 'x' * 1000, 'distance': 1},
+            identifier,
+        )
+
+        try:
+            test_class, stack = self._memento_test_data(
+                identifier,
+                recollection.JsonAppSerialiser,
+            )
+            missing_class, missing_stack = self._memento_test_data(
+                'memento/tests/bulk_missing',
+                recollection.JsonAppSerialiser,
+            )
+
+            recollection.deserialise_all(
+                [stack, missing_stack],
+                process_threshold=0,
+            )
+
+        finally:
+            os.remove(path)
+
+        self.assertEqual(
+            'x' * 1000,
+            test_class.getTarget(),
+        )
+
+        self.assertIsNone(
+            missing_class.getTarget(),
+        )
+
+        self.assertEqual(
+            0,
+            missing_stack.count(),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_binary_is_not_parsed_in_processes(self):
+        """
+        Ensures that binary formats are always loaded on the reading
+        thread, as handing them back from another process costs as much
+        as loading them
+
+        :return:
+        """
+        path = os.path.join(self.directory, 'large.pkl')
+
+        recollection.PickleSerialiser.serialise(
+            {'target': 'x' * 1000, 'distance': 1},
+            path,
+        )
+
+        self.assertEqual(
+            True,
+            bulk._read(recollection.PickleSerialiser, path, path, 0)[0],
+        )
+
+    # --------------------------------------------------------------------------
+    def test_shared_location_is_read_once(self):
+        """
+        Ensures that mementos sharing a location only read it once between
+        them, whilst each is still given its own data
+
+        :return:
+        """
+        path = os.path.join(self.directory, 'shared.pkl')
+
+        recollection.PickleSerialiser.serialise(
+            {'target': [1], 'distance': 1},
+            path,
+        )
+
+        pairs = [self._memento_test_data(path) for _ in range(5)]
+        reads = list()
+
+        def read_bytes(path):
+            reads.append(path)
+            return original(path)
+
+        original = fileio.read_bytes
+        fileio.read_bytes = read_bytes
+
+        try:
+            recollection.deserialise_all([stack for _, stack in pairs])
+
+        finally:
+            fileio.read_bytes = original
+
+        self.assertEqual(
+            [path],
+            reads,
+        )
+
+        targets = [test_class.getTarget() for test_class, _ in pairs]
+
+        self.assertEqual(
+            [[1]] * 5,
+            targets,
+        )
+
+        self.assertEqual(
+            5,
+            len(set(id(target) for target in targets)),
+        )
+
+    # --------------------------------------------------------------------------
+    @classmethod
+    def _memento_test_data(cls, path, serialiser=None):
+
+        test_class = SetterTestClass()
+
+        stack = recollection.Memento(test_class)
+        stack.register(
+            label='target',
+            getter=test_class.getTarget,
+            setter=test_class.setTarget,
+        )
+
+        stack.register(
+            label='distance',
+            getter=test_class.getDistance,
+            setter=test_class.setDistance,
+        )
+
+        stack.register_serialiser(
+            serialiser=serialiser or recollection.PickleSerialiser,
+            identifier=path,
+        )
+
+        return test_class, stack
+
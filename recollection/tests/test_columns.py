@@ -0,0 +1,112 @@
+from recollection.tests.classes import EmptyTestClass
+
+import array
+import recollection
+import unittest
+
+
+# ------------------------------------------------------------------------------
+class TestColumns(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.test_class = EmptyTestClass()
+        self.test_class.score = 0
+        self.test_class.name = ''
+
+        self.stack = recollection.Memento(self.test_class, max_states=100)
+        self.stack.register(['score', 'name'])
+
+    # --------------------------------------------------------------------------
+    def _store(self, count):
+        for _ in range(count):
+            self.test_class.score += 1
+            self.test_class.name = 'name_%s' % self.test_class.score
+            self.stack.store()
+
+    # --------------------------------------------------------------------------
+    def test_history(self):
+        """
+        Checks that the history of a label is read from its column, most
+        recent first, along with the ids of each state
+
+        :return:
+        """
+        self._store(5)
+        self.stack.enable_columns(['score'])
+        self._store(5)
+
+        history = self.stack.history('score', 1, 4)
+
+        self.assertEqual(
+            [9, 8, 7],
+            list(history),
+        )
+
+        self.assertEqual(
+            [8, 7, 6],
+            list(history.ids),
+        )
+
+        self.assertEqual(
+            8,
+            self.stack.state_id(1),
+        )
+
+        self.assertEqual(
+            1,
+            self.stack.index_of(8),
+        )
+
+        self.assertIsInstance(
+            self.stack.history('score').oldest_first(),
+            array.array,
+        )
+
+        # -- Labels without a column are read from the states
+        self.assertEqual(
+            ['name_10', 'name_9'],
+            list(self.stack.history('name', 0, 2)),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_columns_evict_with_states(self):
+        """
+        Checks that columns only hold the values of states which are still
+        held, and that a view is unaffected by later stores
+
+        :return:
+        """
+        self.stack.enable_columns()
+        self._store(150)
+
+        view = self.stack.history('score', 0, 3)
+        self._store(200)
+
+        self.assertEqual(
+            [150, 149, 148],
+            list(view),
+        )
+
+        history = self.stack.history('score')
+
+        self.assertEqual(
+            100,
+            len(history),
+        )
+
+        self.assertEqual(
+            (350, 251),
+            (history[0], history[-1]),
+        )
+
+        self.assertEqual(
+            [state['score'] for state in self.stack.states()],
+            list(history),
+        )
+
+        self.assertRaises(
+            IndexError,
+            self.stack.index_of,
+            249,
+        )
@@ -0,0 +1,231 @@
+from recollection.tests.classes import EmptyTestClass
+
+import recollection
+import unittest
+import multiprocessing
+
+
+# ------------------------------------------------------------------------------
+def _follow(address, pipe):
+    """
+    Joins a memento to the group from within another process, reporting
+    the value it holds after each batch it applies
+    """
+    test_class = EmptyTestClass()
+    test_class.foo = 'child'
+
+    stack = recollection.Memento(test_class)
+    stack.register('foo')
+    stack.store()
+
+    link = recollection.SyncLink(stack, address)
+    pipe.send('ready')
+
+    for _ in range(2):
+        link.poll(timeout=10)
+        pipe.send((stack.count(), test_class.foo))
+
+    link.close()
+
+
+# ------------------------------------------------------------------------------
+class TestDistributed(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.coordinator = recollection.SyncCoordinator()
+
+        self.test_class_a = EmptyTestClass()
+        self.test_class_a.foo = 0
+
+        self.test_class_b = EmptyTestClass()
+        self.test_class_b.foo = 0
+
+        self.stack_a = recollection.Memento(self.test_class_a)
+        self.stack_a.register('foo')
+
+        self.stack_b = recollection.Memento(self.test_class_b)
+        self.stack_b.register('foo')
+
+        self.link_a = recollection.SyncLink(
+            self.stack_a,
+            self.coordinator.address,
+        )
+
+        self.link_b = recollection.SyncLink(
+            self.stack_b,
+            self.coordinator.address,
+        )
+
+    # --------------------------------------------------------------------------
+    def tearDown(self):
+        self.link_a.close()
+        self.link_b.close()
+        self.coordinator.close()
+
+    # --------------------------------------------------------------------------
+    def test_store_and_restore_are_relayed(self):
+        """
+        Checks that stores and restores on one linked memento are applied
+        to the other once it polls, without being sent back
+
+        :return:
+        """
+        for i in range(3):
+            self.test_class_a.foo = i
+            self.test_class_b.foo = i * 10
+            self.stack_a.store()
+
+            self.assertEqual(
+                1,
+                _poll_until(self.link_b, 1),
+            )
+
+        # -- Restoring stores once it is complete, so this relays both
+        # -- a restore and a store
+        self.stack_a.restore(1)
+
+        self.assertEqual(
+            2,
+            _poll_until(self.link_b, 2),
+        )
+
+        self.assertEqual(
+            10,
+            self.test_class_b.foo,
+        )
+
+        # -- Nothing should have been echoed back to the sender
+        self.assertEqual(
+            0,
+            self.link_a.poll(timeout=0.1),
+        )
+
+        self.assertEqual(
+            5,
+            self.link_b.sequence,
+        )
+
+    # --------------------------------------------------------------------------
+    def test_batch(self):
+        """
+        Checks that events made within a batch are sent together
+
+        :return:
+        """
+        with self.link_a.batch():
+            for _ in range(5):
+                self.stack_a.store()
+
+        self.assertEqual(
+            1,
+            _poll_until(self.link_b, 1),
+        )
+
+        self.assertEqual(
+            5,
+            self.stack_b.count(),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_close_leaves_group(self):
+        """
+        Checks that a closed link is removed from the group of its memento,
+        so the memento can still store
+
+        :return:
+        """
+        self.link_b.close()
+
+        self.assertNotIn(
+            self.link_b,
+            self.stack_b.sync_group(),
+        )
+
+        self.stack_b.store()
+
+        self.assertEqual(
+            1,
+            self.stack_b.count(),
+        )
+
+        self.assertEqual(
+            0,
+            self.link_a.poll(timeout=0.1),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_lost_connection(self):
+        """
+        Checks that losing the connection to the coordinator does not fail
+        a store, and that the link leaves the group of its memento
+
+        :return:
+        """
+        self.link_a._connection.close()
+
+        with self.assertLogs('memento', 'WARNING'):
+            self.stack_a.store()
+
+        self.assertNotIn(
+            self.link_a,
+            self.stack_a.sync_group(),
+        )
+
+        self.stack_a.store()
+
+        self.assertEqual(
+            2,
+            self.stack_a.count(),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_across_processes(self):
+        """
+        Checks that a memento in another process follows this one
+
+        :return:
+        """
+        parent, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_follow,
+            args=(self.coordinator.address, child),
+        )
+        process.start()
+
+        try:
+            self.assertTrue(parent.poll(10))
+            parent.recv()
+
+            self.test_class_a.foo = 1
+            self.stack_a.store()
+
+            self.assertTrue(parent.poll(10))
+            self.assertEqual(
+                (2, 'child'),
+                parent.recv(),
+            )
+
+            self.stack_a.store()
+
+            self.assertTrue(parent.poll(10))
+            self.assertEqual(
+                (3, 'child'),
+                parent.recv(),
+            )
+
+        finally:
+            process.join(10)
+
+
+# ------------------------------------------------------------------------------
+def _poll_until(link, batches):
+    applied = 0
+
+    for _ in range(50):
+        applied += link.poll(timeout=0.1)
+
+        if applied >= batches:
+            break
+
+    return applied
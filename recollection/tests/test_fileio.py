@@ -0,0 +1,298 @@
+from recollection import fileio
+
+import os
+import shutil
+import tempfile
+import unittest
+import recollection
+
+
+# ------------------------------------------------------------------------------
+class TestFileIO(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'sub', 'data.bin')
+
+    # --------------------------------------------------------------------------
+    def tearDown(self):
+        recollection.set_durability(recollection.DURABILITY_NONE)
+        shutil.rmtree(self.directory)
+
+    # --------------------------------------------------------------------------
+    def test_write_replaces_atomically(self):
+        """
+        Ensures that writing replaces the file content and leaves no
+        temporary files behind
+
+        :return:
+        """
+        fileio.write(self.path, b'first')
+        fileio.write(self.path, b'second', b'-part')
+
+        with open(self.path, 'rb') as f:
+            self.assertEqual(
+                b'second-part',
+                f.read(),
+            )
+
+        self.assertEqual(
+            [],
+            self._temporary_files(),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_failed_write_keeps_original(self):
+        """
+        Ensures that a failure part way through a write leaves the
+        original file untouched
+
+        :return:
+        """
+        fileio.write(self.path, b'original')
+
+        try:
+            fileio.write(self.path, b'partial', None)
+            self.assertTrue(
+                False,
+                msg='Writing an invalid chunk did not fail',
+            )
+
+        except TypeError:
+            pass
+
+        with open(self.path, 'rb') as f:
+            self.assertEqual(
+                b'original',
+                f.read(),
+            )
+
+        self.assertEqual(
+            [],
+            self._temporary_files(),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_append(self):
+        """
+        Ensures appending adds to the end of the file
+
+        :return:
+        """
+        fileio.append(self.path, b'a')
+        fileio.append(self.path, b'b', b'c')
+
+        with open(self.path, 'rb') as f:
+            self.assertEqual(
+                b'abc',
+                f.read(),
+            )
+
+    # --------------------------------------------------------------------------
+    def test_durability_policies(self):
+        """
+        Ensures each durability policy can be written under, and that
+        an invalid policy is rejected
+
+        :return:
+        """
+        for policy in [recollection.DURABILITY_SYNC,
+                       recollection.DURABILITY_GROUP,
+                       recollection.DURABILITY_NONE]:
+            recollection.set_durability(policy, group_interval=1)
+            fileio.write(self.path, policy.encode('utf-8'))
+            fileio.append(self.path, b'!')
+            fileio.flush()
+
+            self.assertEqual(
+                policy,
+                recollection.durability(),
+            )
+
+        self.assertRaises(
+            ValueError,
+            recollection.set_durability,
+            'sometimes',
+        )
+
+    # --------------------------------------------------------------------------
+    def test_group_syncs_before_renaming(self):
+        """
+        Ensures that under group durability a write is only renamed into
+        place once its temporary file has been synced, whilst still being
+        visible to reads made by this process
+
+        :return:
+        """
+        recollection.set_durability(
+            recollection.DURABILITY_GROUP,
+            group_interval=60000,
+        )
+
+        events = list()
+        fsync, replace = os.fsync, os.replace
+
+        def recording_fsync(handle):
+            events.append('fsync')
+            fsync(handle)
+
+        def recording_replace(source, destination):
+            events.append('replace')
+            replace(source, destination)
+
+        os.fsync, os.replace = recording_fsync, recording_replace
+
+        try:
+            fileio.write(self.path, b'first')
+            fileio.write(self.path, b'second')
+
+            # -- Nothing is renamed until the group is committed
+            self.assertFalse(os.path.exists(self.path))
+            self.assertEqual([], events)
+
+            # -- Reading commits the group, syncing before renaming
+            self.assertTrue(fileio.exists(self.path))
+
+        finally:
+            os.fsync, os.replace = fsync, replace
+
+        self.assertEqual(
+            ['fsync', 'replace'],
+            events[:2],
+        )
+
+        self.assertEqual(
+            b'second',
+            fileio.read(self.path, lambda f: f.read()),
+        )
+
+        # -- The superseded write leaves no temporary file behind
+        self.assertEqual(
+            [],
+            [
+                name
+                for name in os.listdir(os.path.dirname(self.path))
+                if name.endswith('.tmp')
+            ],
+        )
+
+    # --------------------------------------------------------------------------
+    def test_write_all_is_committed_together(self):
+        """
+        Ensures that under group durability files written together are
+        handed to the group commit in a single call, so a commit can never
+        rename one of them without the other
+
+        :return:
+        """
+        recollection.set_durability(
+            recollection.DURABILITY_GROUP,
+            group_interval=60000,
+        )
+
+        sidecar = self.path + '.buffers'
+        calls = list()
+        rename = fileio._GROUP_COMMIT.rename
+
+        def recording_rename(renames, locks):
+            calls.append(sorted(path for _, path in renames))
+            rename(renames, locks)
+
+        fileio._GROUP_COMMIT.rename = recording_rename
+
+        try:
+            fileio.write_all(
+                [
+                    (sidecar, [b'buffers']),
+                    (self.path, [b'data']),
+                ],
+            )
+
+        finally:
+            del fileio._GROUP_COMMIT.rename
+
+        self.assertEqual(
+            [[self.path, sidecar]],
+            calls,
+        )
+
+        self.assertFalse(os.path.exists(sidecar))
+        self.assertTrue(fileio.exists(self.path))
+        self.assertTrue(os.path.exists(sidecar))
+
+    # --------------------------------------------------------------------------
+    def test_cached_read(self):
+        """
+        Ensures that once an unchanged file has been read twice the loader
+        is not called again, but that any change to the file means it is
+
+        :return:
+        """
+        calls = list()
+
+        def loader(f):
+            calls.append(None)
+            return {'data': f.read()}
+
+        fileio.write(self.path, b'first')
+
+        self.assertEqual(
+            {'data': b'first'},
+            fileio.read(self.path, loader),
+        )
+
+        # -- Mutating the result must not affect the cache
+        fileio.read(self.path, loader)['data'] = None
+
+        self.assertEqual(
+            {'data': b'first'},
+            fileio.read(self.path, loader),
+        )
+
+        self.assertEqual(
+            2,
+            len(calls),
+        )
+
+        fileio.append(self.path, b'-second')
+
+        self.assertEqual(
+            {'data': b'first-second'},
+            fileio.read(self.path, loader),
+        )
+
+        self.assertEqual(
+            3,
+            len(calls),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_lock_is_reentrant(self):
+        """
+        Ensures that a thread holding a lock can write to the same path
+        without deadlocking on itself
+
+        :return:
+        """
+        with fileio.lock(self.path):
+            fileio.write(self.path, b'data')
+
+            with fileio.lock(self.path, exclusive=False):
+                self.assertEqual(
+                    b'data',
+                    fileio.read(self.path, _read_all),
+                )
+
+    # --------------------------------------------------------------------------
+    def _temporary_files(self):
+        return [
+            name
+            for name in os.listdir(os.path.dirname(self.path))
+            if name.endswith('.tmp')
+        ]
+
+
+# ------------------------------------------------------------------------------
+def _read_all(f):
+    return f.read()
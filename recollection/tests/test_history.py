@@ -0,0 +1,113 @@
+from recollection import history
+
+import unittest
+
+
+# ------------------------------------------------------------------------------
+class TestHistory(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def test_push(self):
+        """
+        Checks that pushed states are held most recent first, and that the
+        history pushed onto is left as it was
+
+        :return:
+        """
+        first = history.History().push(1).push(2)
+        second = first.push(3)
+
+        self.assertEqual(
+            [2, 1],
+            list(first),
+        )
+
+        self.assertEqual(
+            [3, 2, 1],
+            list(second),
+        )
+
+        self.assertEqual(
+            [1, 2, 3],
+            list(reversed(second)),
+        )
+
+        self.assertEqual(
+            (3, 1),
+            (second[0], second[-1]),
+        )
+
+        self.assertEqual(
+            (2, 1),
+            second[1:],
+        )
+
+        self.assertRaises(
+            IndexError,
+            second.__getitem__,
+            3,
+        )
+
+    # --------------------------------------------------------------------------
+    def test_bounded(self):
+        """
+        Checks that only the given number of states are held, and that
+        trimming the chain does not affect a history which is still
+        being read
+
+        :return:
+        """
+        states = history.History()
+        held = list()
+
+        for state in range(20):
+            states = states.push(state, max_states=3)
+            held.append(states)
+
+        self.assertEqual(
+            [19, 18, 17],
+            list(states),
+        )
+
+        # -- The chain is only ever twice the size of what is kept
+        self.assertLess(
+            states._depth,
+            6,
+        )
+
+        for state, states in enumerate(held):
+            self.assertEqual(
+                list(range(state, max(state - 3, -1), -1)),
+                list(states),
+            )
+
+    # --------------------------------------------------------------------------
+    def test_shared(self):
+        """
+        Checks that two histories pushed onto from the same history share
+        the states they have in common rather than copying them
+
+        :return:
+        """
+        states = history.History()
+
+        for state in range(100):
+            states = states.push(state)
+
+        first = states.push('first')
+        second = states.push('second')
+
+        self.assertIs(
+            first._head[1],
+            second._head[1],
+        )
+
+        self.assertEqual(
+            ['first', 99],
+            list(first[:2]),
+        )
+
+        self.assertEqual(
+            ['second', 99],
+            list(second[:2]),
+        )
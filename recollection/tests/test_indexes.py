@@ -0,0 +1,91 @@
+from recollection.tests.classes import EmptyTestClass
+
+import recollection
+import unittest
+
+
+# ------------------------------------------------------------------------------
+class TestIndexes(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.test_class = EmptyTestClass()
+        self.test_class.theme = 'light'
+        self.test_class.lives = dict(Parent=3, Child=3)
+
+        self.stack = recollection.Memento(self.test_class, max_states=10)
+        self.stack.register(['theme', 'lives'])
+
+    # --------------------------------------------------------------------------
+    def _play(self):
+        for i in range(4):
+            self.test_class.theme = 'dark' if i % 2 else 'light'
+            self.test_class.lives['Child'] = 3 - i
+            self.stack.store()
+
+    # --------------------------------------------------------------------------
+    def test_find(self):
+        """
+        Checks that finding by value and by predicate gives the same
+        results whether or not the labels are indexed
+
+        :return:
+        """
+        self._play()
+
+        expected = [
+            self.stack.find('theme', 'dark'),
+            self.stack.find('lives', lambda lives: lives['Child'] == 0),
+            self.stack.find('lives', dict(Parent=3, Child=2), ids=True),
+        ]
+
+        self.assertEqual(
+            [[0, 2], [0], [1]],
+            expected,
+        )
+
+        self.stack.enable_indexes()
+
+        self.assertEqual(
+            expected,
+            [
+                self.stack.find('theme', 'dark'),
+                self.stack.find('lives', lambda lives: lives['Child'] == 0),
+                self.stack.find('lives', dict(Parent=3, Child=2), ids=True),
+            ],
+        )
+
+    # --------------------------------------------------------------------------
+    def test_indexes_evict_with_states(self):
+        """
+        Checks that states are removed from the indexes as they are
+        removed from the history
+
+        :return:
+        """
+        self.stack.enable_indexes(['theme'])
+
+        self.test_class.theme = 'dark'
+        self.stack.store()
+
+        self.test_class.theme = 'light'
+
+        for _ in range(9):
+            self.stack.store()
+
+        self.assertEqual(
+            [9],
+            self.stack.find('theme', 'dark'),
+        )
+
+        self.stack.store()
+
+        self.assertEqual(
+            [],
+            self.stack.find('theme', 'dark'),
+        )
+
+        self.assertEqual(
+            10,
+            len(self.stack.find('theme', 'light')),
+        )
@@ -5,10 +5,112 @@ from recollection.tests.classes import (
     EventCalledException,
 )
 
+import time
+import asyncio
+import logging
+import dataclasses
 import recollection
 import unittest
 
 
+# ------------------------------------------------------------------------------
+class _RecordingSerialiser(recollection.SerialiserBase):
+    """
+    Holds onto the last data it was asked to serialise
+    """
+
+    DATA = None
+
+    @staticmethod
+    def serialise(data, identifier):
+        _RecordingSerialiser.DATA = data
+
+    @staticmethod
+    def deserialise(identifier):
+        return _RecordingSerialiser.DATA
+
+    @staticmethod
+    def locator(identifier):
+        return identifier
+
+
+# ------------------------------------------------------------------------------
+class _AsyncTestClass(object):
+    """
+    Exposes a value through coroutine getters and setters
+    """
+
+    def __init__(self):
+        self._value = 0
+        self.plain = 0
+
+    async def get_value(self):
+        await asyncio.sleep(0)
+        return self._value
+
+    async def set_value(self, value):
+        await asyncio.sleep(0)
+        self._value = value
+
+
+# ------------------------------------------------------------------------------
+class _BulkTestClass(object):
+    """
+    Implements the bulk protocol, recording every call made to it
+    """
+
+    def __init__(self):
+        self.foo = 0
+        self.bar = 0
+        self.calls = list()
+
+    def __recollection_getstate__(self, labels):
+        self.calls.append(('get', sorted(labels)))
+        return dict((label, getattr(self, label)) for label in labels)
+
+    def __recollection_setstate__(self, state):
+        self.calls.append(('set', dict(state)))
+        self.__dict__.update(state)
+
+
+# ------------------------------------------------------------------------------
+@dataclasses.dataclass
+class _DataTestClass(object):
+    """
+    A dataclass whose fields should all be registered
+    """
+    name: str = ''
+    points: list = dataclasses.field(default_factory=list)
+
+
+# ------------------------------------------------------------------------------
+class _SlotsTestClass(object):
+    """
+    Holds its attributes in slots rather than a __dict__
+    """
+    __slots__ = ('x', 'y', '__weakref__')
+
+    def __init__(self):
+        self.x = 0
+        self.y = 0
+
+
+# ------------------------------------------------------------------------------
+class _FormatCountingValue(object):
+    """
+    Counts how many times it has been formatted into a string
+    """
+
+    FORMATTED = 0
+
+    def __repr__(self):
+        _FormatCountingValue.FORMATTED += 1
+        return 'FormatCountingValue'
+
+    def __deepcopy__(self, memo):
+        return self
+
+
 # ------------------------------------------------------------------------------
 class TestMemento(unittest.TestCase):
     """
@@ -197,6 +299,493 @@ class TestMemento(unittest.TestCase):
             len(stack_a.sync_group())
         )
 
+    # --------------------------------------------------------------------------
+    def test_logging_is_only_formatted_when_enabled(self):
+        """
+        Checks that stored values are only formatted into the log when the
+        memento logger is enabled for debug output
+
+        :return:
+        """
+        test_class = EmptyTestClass()
+        test_class.foo = _FormatCountingValue()
+
+        stack = recollection.Memento(test_class)
+        stack.register('foo')
+
+        logger = logging.getLogger('memento')
+        level = logger.level
+
+        try:
+            _FormatCountingValue.FORMATTED = 0
+            logger.setLevel(logging.WARNING)
+
+            stack.store()
+            stack.store()
+            stack.restore(1)
+
+            self.assertEqual(
+                0,
+                _FormatCountingValue.FORMATTED,
+            )
+
+            logger.setLevel(logging.DEBUG)
+
+            with self.assertLogs(logger, logging.DEBUG):
+                stack.restore(0)
+
+            self.assertGreater(
+                _FormatCountingValue.FORMATTED,
+                0,
+            )
+
+        finally:
+            logger.setLevel(level)
+
+    # --------------------------------------------------------------------------
+    def test_restore_only_sets_changed_labels(self):
+        """
+        Checks that a restore only calls the setters of labels whose live
+        value differs from the stored value, unless forced
+
+        :return:
+        """
+        test_class = SetterTestClass()
+        test_class.foo = 0
+
+        calls = list()
+
+        def set_distance(distance):
+            calls.append(distance)
+            test_class.setDistance(distance)
+
+        stack = recollection.Memento(test_class)
+        stack.register('foo')
+        stack.register(
+            label='distance',
+            getter=test_class.getDistance,
+            setter=set_distance,
+        )
+
+        stack.store()
+
+        test_class.foo = 1
+        stack.store()
+
+        self.assertEqual(
+            ['foo'],
+            stack.restore(1),
+        )
+
+        self.assertEqual(
+            [],
+            calls,
+        )
+
+        self.assertEqual(
+            ['foo', 'distance'],
+            stack.restore(0, force=True),
+        )
+
+        self.assertEqual(
+            [0],
+            calls,
+        )
+
+    # --------------------------------------------------------------------------
+    def test_restore_sets_equal_values_of_another_type(self):
+        """
+        Checks that a live value which compares as equal to the stored
+        value, but is of a different type, is still set
+
+        :return:
+        """
+        test_class = EmptyTestClass()
+        test_class.ratio = 1
+        test_class.flag = 1
+
+        stack = recollection.Memento(test_class)
+        stack.register(['ratio', 'flag'])
+
+        stack.store()
+
+        test_class.ratio = 1.0
+        test_class.flag = True
+
+        self.assertEqual(
+            ['ratio', 'flag'],
+            stack.restore(0),
+        )
+
+        self.assertIs(
+            int,
+            type(test_class.ratio),
+        )
+
+        self.assertIs(
+            int,
+            type(test_class.flag),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_bulk_protocol(self):
+        """
+        Checks that a target implementing the bulk protocol is read with
+        a single call per store, and has all of its changed attributes
+        set with a single call per restore
+
+        :return:
+        """
+        test_class = _BulkTestClass()
+
+        stack = recollection.Memento(test_class)
+        stack.register(['foo', 'bar'])
+
+        stack.store()
+
+        test_class.foo = 1
+        test_class.bar = 2
+        stack.store()
+
+        del test_class.calls[:]
+
+        self.assertEqual(
+            ['foo', 'bar'],
+            stack.restore(1),
+        )
+
+        self.assertEqual(
+            (0, 0),
+            (test_class.foo, test_class.bar),
+        )
+
+        # -- One read to compare, one write, and the read of the store
+        # -- which follows the restore
+        self.assertEqual(
+            [
+                ('get', ['bar', 'foo']),
+                ('set', dict(foo=0, bar=0)),
+                ('get', ['bar', 'foo']),
+            ],
+            test_class.calls,
+        )
+
+    # --------------------------------------------------------------------------
+    def test_register_all(self):
+        """
+        Checks that the public attributes of a dataclass, an object with
+        slots and a plain object are all found and registered
+
+        :return:
+        """
+        plain = EmptyTestClass()
+        plain.foo = [1]
+        plain.bar = 2
+        plain._private = 3
+
+        for test_class, expected in (
+                (plain, ['foo', 'bar']),
+                (_DataTestClass('a', [1]), ['name', 'points']),
+                (_SlotsTestClass(), ['x', 'y'])):
+
+            stack = recollection.Memento(test_class)
+
+            self.assertEqual(
+                expected,
+                stack.register_all(),
+            )
+
+            self.assertEqual(
+                expected,
+                stack.labels(),
+            )
+
+        stack = recollection.Memento(plain)
+        stack.register_all(exclude=['bar'])
+        stack.store()
+
+        plain.foo.append(2)
+        stack.store()
+
+        self.assertEqual(
+            [[1, 2], [1]],
+            [state['foo'] for state in stack.states()],
+        )
+
+    # --------------------------------------------------------------------------
+    def test_register_all_skips_inference_memento(self):
+        """
+        Checks that the memento of an Inference object is not registered
+        as state
+
+        :return:
+        """
+        class _InferenceTestClass(recollection.Inference):
+            def __init__(self):
+                super(_InferenceTestClass, self).__init__()
+                self.number = 1
+
+        test_class = _InferenceTestClass()
+
+        self.assertEqual(
+            ['number'],
+            test_class.memento.register_all(),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_checkpoint_and_rollback(self):
+        """
+        Checks that rolling back to a checkpoint restores the values it
+        held, any number of times, without touching the history or
+        emitting any signals
+
+        :return:
+        """
+        test_class = SetterTestClass()
+        test_class.foo = [1, 2]
+        test_class.setDistance(5)
+
+        stack = recollection.Memento(test_class)
+        stack.register('foo')
+        stack.register(
+            label='distance',
+            getter=test_class.getDistance,
+            setter=test_class.setDistance,
+        )
+
+        emitted = list()
+        stack.stored.connect(lambda: emitted.append('stored'))
+        stack.restored.connect(lambda: emitted.append('restored'))
+
+        token = stack.checkpoint()
+
+        for _ in range(2):
+            test_class.foo.append(3)
+            test_class.setDistance(10)
+
+            stack.rollback(token)
+
+            self.assertEqual(
+                [1, 2],
+                test_class.foo,
+            )
+
+            self.assertEqual(
+                5,
+                test_class.getDistance(),
+            )
+
+        self.assertEqual(
+            0,
+            stack.count(),
+        )
+
+        self.assertEqual(
+            [],
+            emitted,
+        )
+
+    # --------------------------------------------------------------------------
+    def test_rollback_after_registration_changes(self):
+        """
+        Checks that a checkpoint cannot be rolled back to once the
+        registered labels have changed
+
+        :return:
+        """
+        test_class = EmptyTestClass()
+        test_class.foo = 1
+        test_class.bar = 2
+
+        stack = recollection.Memento(test_class)
+        stack.register('foo')
+
+        token = stack.checkpoint()
+        stack.register('bar')
+
+        self.assertRaises(
+            recollection.StorageError,
+            stack.rollback,
+            token,
+        )
+
+    # --------------------------------------------------------------------------
+    def test_fork_shares_history(self):
+        """
+        Checks that a fork starts with the history of the memento it was
+        forked from, and that the two then diverge independently
+
+        :return:
+        """
+        test_class = EmptyTestClass()
+        test_class.foo = 0
+
+        stack = recollection.Memento(test_class)
+        stack.register('foo')
+
+        for i in range(3):
+            test_class.foo = i
+            stack.store()
+
+        forked = stack.fork()
+
+        self.assertIs(
+            stack._states,
+            forked._states,
+        )
+
+        test_class.foo = 10
+        forked.store()
+
+        test_class.foo = 20
+        stack.store()
+
+        self.assertEqual(
+            [10, 2, 1, 0],
+            [state['foo'] for state in forked.states()],
+        )
+
+        self.assertEqual(
+            [20, 2, 1, 0],
+            [state['foo'] for state in stack.states()],
+        )
+
+    # --------------------------------------------------------------------------
+    def test_fork_store_cost(self):
+        """
+        Checks that storing on either side of a fork does not copy the
+        history, so costs no more after forking a long history than it
+        does after forking a short one
+
+        :return:
+        """
+        def _chain(memento, depth):
+            node = memento._states._head
+
+            for _ in range(depth):
+                node = node[1]
+
+            return node
+
+        def store_cost(length):
+            test_class = EmptyTestClass()
+            test_class.foo = 0
+
+            stack = recollection.Memento(test_class, max_states=None)
+            stack.register('foo')
+
+            for i in range(length):
+                test_class.foo = i
+                stack.store()
+
+            forked = stack.fork()
+            best = None
+
+            for _ in range(3):
+                start = time.perf_counter()
+
+                for i in range(200):
+                    test_class.foo = i
+                    stack.store()
+                    forked.store()
+
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+
+            # -- Everything older than the fork is shared by both, as
+            # -- each store has pushed 600 states onto either side
+            self.assertIs(
+                _chain(stack, 600),
+                _chain(forked, 600),
+            )
+
+            return best
+
+        short = store_cost(10)
+        long = store_cost(20000)
+
+        self.assertLess(
+            long,
+            short * 3,
+        )
+
+    # --------------------------------------------------------------------------
+    def test_fork_onto_clone(self):
+        """
+        Checks that forking onto a clone of the target re-binds getters
+        and setters which are methods of the original target
+
+        :return:
+        """
+        test_class = SetterTestClass()
+        test_class.setDistance(1)
+
+        stack = recollection.Memento(test_class)
+        stack.register(
+            label='distance',
+            getter=test_class.getDistance,
+            setter=test_class.setDistance,
+        )
+        stack.store()
+        test_class.setDistance(3)
+
+        clone = SetterTestClass()
+        clone.setDistance(5)
+
+        forked = stack.fork(clone)
+        forked.store()
+
+        clone.setDistance(9)
+        forked.restore(1)
+
+        self.assertEqual(
+            1,
+            clone.getDistance(),
+        )
+
+        self.assertEqual(
+            3,
+            test_class.getDistance(),
+        )
+
+        self.assertEqual(
+            1,
+            stack.count(),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_grouping_merges_groups(self):
+        """
+        Checks that grouping two mementos which are each already in a
+        group puts all the members of both groups into lock-step
+
+        :return:
+        """
+        test_classes = [EmptyTestClass() for _ in range(4)]
+        stacks = [
+            recollection.Memento(test_class)
+            for test_class in test_classes
+        ]
+
+        stacks[0].group(stacks[1])
+        stacks[2].group(stacks[3])
+        stacks[1].group(stacks[2])
+
+        for stack in stacks:
+            self.assertEqual(
+                set(stacks),
+                set(stack.sync_group()),
+            )
+
+        # -- A memento which has never been grouped is alone
+        test_class = EmptyTestClass()
+        stack = recollection.Memento(test_class)
+
+        self.assertEqual(
+            [stack],
+            stack.sync_group(),
+        )
+
     # --------------------------------------------------------------------------
     def test_can_unregister(self):
         """
@@ -627,6 +1216,168 @@ class TestMemento(unittest.TestCase):
         except Exception:
             pass
 
+    # --------------------------------------------------------------------------
+    def test_history_only_labels_are_not_serialised(self):
+        """
+        Ensures that labels registered as history only are held in the
+        history but never handed to the serialiser
+
+        :return:
+        """
+        test_class = EmptyTestClass()
+        test_class.foo = 1
+        test_class.bar = 2
+
+        stack = recollection.Memento(test_class)
+        stack.register('foo')
+        stack.register('bar', history_only=True)
+        stack.register_serialiser(
+            serialiser=_RecordingSerialiser,
+            identifier='',
+        )
+
+        stack.store(serialise=True)
+
+        self.assertEqual(
+            2,
+            stack._states[0]['bar'],
+        )
+
+        self.assertEqual(
+            {'foo': 1},
+            _RecordingSerialiser.DATA,
+        )
+
+    # --------------------------------------------------------------------------
+    def test_history_only_labels_survive_deserialisation(self):
+        """
+        Ensures that a memento with history only labels can deserialise
+        the state it serialised, leaving those labels untouched
+
+        :return:
+        """
+        test_class = EmptyTestClass()
+        test_class.foo = 1
+        test_class.bar = 2
+
+        stack = recollection.Memento(test_class)
+        stack.register('foo')
+        stack.register('bar', history_only=True)
+        stack.register_serialiser(
+            serialiser=_RecordingSerialiser,
+            identifier='',
+        )
+        stack.store(serialise=True)
+
+        restored_class = EmptyTestClass()
+        restored_class.foo = 0
+        restored_class.bar = 5
+
+        restored = recollection.Memento(restored_class)
+        restored.register('foo')
+        restored.register('bar', history_only=True)
+        restored.register_serialiser(
+            serialiser=_RecordingSerialiser,
+            identifier='',
+        )
+        restored.deserialise()
+
+        self.assertEqual(
+            (1, 5),
+            (restored_class.foo, restored_class.bar),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_async_store_and_restore(self):
+        """
+        Ensures that coroutine getters and setters are awaited when
+        storing and restoring asynchronously
+
+        :return:
+        """
+        test_class = _AsyncTestClass()
+
+        stack = recollection.Memento(test_class)
+        stack.register(
+            label='value',
+            getter=test_class.get_value,
+            setter=test_class.set_value,
+        )
+        stack.register('plain')
+
+        async def run():
+            for i in range(5):
+                test_class._value = i
+                test_class.plain = i * 10
+                await stack.astore()
+
+            await stack.arestore(2)
+
+        asyncio.run(run())
+
+        self.assertEqual(
+            2,
+            test_class._value,
+        )
+
+        self.assertEqual(
+            20,
+            test_class.plain,
+        )
+
+    # --------------------------------------------------------------------------
+    def test_sync_store_with_async_getter(self):
+        """
+        Ensures that we get a storage error when trying to store
+        synchronously with coroutine getters registered
+
+        :return:
+        """
+        test_class = _AsyncTestClass()
+
+        stack = recollection.Memento(test_class)
+        stack.register(
+            label='value',
+            getter=test_class.get_value,
+            setter=test_class.set_value,
+        )
+
+        self.assertRaises(
+            recollection.StorageError,
+            stack.store,
+        )
+
+    # --------------------------------------------------------------------------
+    def test_async_serialise(self):
+        """
+        Ensures that serialisation and deserialisation can be performed
+        through the coroutine api
+
+        :return:
+        """
+        test_class = EmptyTestClass()
+        test_class.foo = 1
+
+        stack = recollection.Memento(test_class)
+        stack.register('foo')
+        stack.register_serialiser(
+            serialiser=_RecordingSerialiser,
+            identifier='',
+        )
+
+        async def run():
+            await stack.astore(serialise=True)
+
+            test_class.foo = 2
+            await stack.adeserialise()
+
+        asyncio.run(run())
+
+        self.assertEqual(
+            1,
+            test_class.foo,
+        )
+
     # --------------------------------------------------------------------------
     def test_registration_event_triggering(self):
         """
@@ -0,0 +1,160 @@
+from recollection.tests.classes import SetterTestClass
+
+import os
+import shutil
+import tempfile
+import unittest
+import recollection
+
+
+# ------------------------------------------------------------------------------
+class _FailingSerialiser(recollection.PickleSerialiser):
+    """
+    Fails every serialisation it is given
+    """
+
+    @staticmethod
+    def serialise(data, identifier):
+        raise IOError('Failed to write the state')
+
+
+# ------------------------------------------------------------------------------
+class TestOffload(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = recollection.SerialisationPool(
+            max_workers=2,
+            max_in_flight=2,
+        )
+
+    # --------------------------------------------------------------------------
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'data.pkl')
+
+    # --------------------------------------------------------------------------
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    # --------------------------------------------------------------------------
+    def test_serialise_returns_future(self):
+        """
+        Ensures that serialising through a pool returns a future which
+        completes once the state is on disk
+
+        :return:
+        """
+        test_class, stack = self._memento_test_data()
+
+        test_class.setTarget(10)
+        stack.store()
+
+        future = stack.serialise()
+        future.result()
+
+        self.assertEqual(
+            10,
+            recollection.PickleSerialiser.deserialise(self.path)['target'],
+        )
+
+    # --------------------------------------------------------------------------
+    def test_writes_are_ordered(self):
+        """
+        Ensures that many serialisations to the same location are written
+        in order, including incremental patches
+
+        :return:
+        """
+        test_class, stack = self._memento_test_data(incremental=True)
+
+        results = list()
+
+        for i in range(20):
+            test_class.setTarget(i)
+            stack.store()
+            results.append(stack.serialise())
+
+        for result in results:
+            result.result()
+
+        self.assertEqual(
+            19,
+            recollection.PickleSerialiser.deserialise(self.path)['target'],
+        )
+
+    # --------------------------------------------------------------------------
+    def test_wait_for_stored_serialisations(self):
+        """
+        Ensures that serialisations made by storing can be waited on,
+        even though store does not return their futures
+
+        :return:
+        """
+        test_class, stack = self._memento_test_data()
+
+        for i in range(5):
+            test_class.setTarget(i)
+            stack.store(serialise=True)
+
+        self.assertTrue(stack.wait_for_serialisation())
+
+        self.assertEqual(
+            4,
+            recollection.PickleSerialiser.deserialise(self.path)['target'],
+        )
+
+    # --------------------------------------------------------------------------
+    def test_failed_serialisations_are_reported(self):
+        """
+        Ensures that a serialisation which fails in the pool is logged
+        and raised when waited on
+
+        :return:
+        """
+        test_class, stack = self._memento_test_data()
+
+        stack.register_serialiser(
+            serialiser=_FailingSerialiser,
+            identifier=self.path,
+            pool=self.pool,
+        )
+
+        with self.assertLogs('memento', level='ERROR'):
+            stack.store(serialise=True)
+
+            with self.assertRaises(IOError):
+                stack.wait_for_serialisation()
+
+    # --------------------------------------------------------------------------
+    def _memento_test_data(self, incremental=False):
+
+        test_class = SetterTestClass()
+
+        stack = recollection.Memento(test_class)
+        stack.register(
+            label='target',
+            getter=test_class.getTarget,
+            setter=test_class.setTarget,
+        )
+
+        stack.register(
+            label='distance',
+            getter=test_class.getDistance,
+            setter=test_class.setDistance,
+        )
+
+        stack.register_serialiser(
+            serialiser=recollection.PickleSerialiser,
+            identifier=self.path,
+            incremental=incremental,
+            pool=self.pool,
+        )
+
+        return test_class, stack
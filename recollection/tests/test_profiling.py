@@ -0,0 +1,263 @@
+from recollection.tests.classes import EmptyTestClass
+
+import time
+import recollection
+import unittest
+
+
+# ------------------------------------------------------------------------------
+class _SlowTestClass(object):
+    """
+    Exposes a value whose setter is deliberately slow
+    """
+
+    def __init__(self):
+        self._value = 0
+
+    def get_value(self):
+        return self._value
+
+    def set_value(self, value):
+        time.sleep(0.05)
+        self._value = value
+
+
+# ------------------------------------------------------------------------------
+class _BulkTestClass(object):
+    """
+    Implements the bulk protocol, so its values are never read or set
+    through the getters and setters of the items
+    """
+
+    def __init__(self):
+        self.foo = 0
+        self.bar = list()
+
+    def __recollection_getstate__(self, labels):
+        return dict((label, getattr(self, label)) for label in labels)
+
+    def __recollection_setstate__(self, state):
+        self.__dict__.update(state)
+
+
+# ------------------------------------------------------------------------------
+class TestProfiling(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def test_labels_are_ranked_by_cost(self):
+        """
+        Checks that the label with the slow setter is reported as the most
+        costly, and the label holding the most data as holding the most
+        memory
+
+        :return:
+        """
+        test_class = _SlowTestClass()
+        test_class.large = list(range(1000))
+
+        stack = recollection.Memento(test_class)
+        stack.register(
+            label='value',
+            getter=test_class.get_value,
+            setter=test_class.set_value,
+        )
+        stack.register('large')
+
+        with recollection.profile(stack) as profiler:
+            for i in range(5):
+                test_class._value = i
+                test_class.large = list(range(1000 + i))
+                stack.store()
+
+            stack.restore(1)
+
+        report = profiler.report()
+
+        self.assertEqual(
+            'value',
+            report[0]['label'],
+        )
+
+        self.assertEqual(
+            1,
+            report[0]['sets'],
+        )
+
+        large = [entry for entry in report if entry['label'] == 'large'][0]
+
+        # -- Five stores, along with the store made by the restore
+        self.assertEqual(
+            6,
+            large['copies'],
+        )
+
+        self.assertGreater(
+            large['history_share'],
+            0.9,
+        )
+
+        self.assertIn(
+            'large',
+            profiler.format(),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_bulk_access_is_profiled(self):
+        """
+        Checks that labels read and set through the bulk protocol are
+        credited with the gets and sets made on their behalf
+
+        :return:
+        """
+        test_class = _BulkTestClass()
+
+        stack = recollection.Memento(test_class)
+        stack.register('foo')
+        stack.register('bar')
+
+        with recollection.profile(stack) as profiler:
+            for i in range(5):
+                test_class.foo = i
+                test_class.bar = list(range(i))
+                stack.store()
+
+            stack.restore(1)
+
+        for entry in profiler.report():
+
+            # -- Five stores, along with the store made by the restore
+            self.assertEqual(
+                6,
+                entry['gets'],
+            )
+
+            self.assertEqual(
+                1,
+                entry['sets'],
+            )
+
+            self.assertGreaterEqual(
+                entry['get_ns'],
+                0,
+            )
+
+        self.assertNotIn(
+            '_read_values',
+            stack.__dict__,
+        )
+
+    # --------------------------------------------------------------------------
+    def test_registered_attributes_are_profiled(self):
+        """
+        Checks that attributes registered by register_all, which are read
+        and copied together, are credited with their gets and copies
+
+        :return:
+        """
+        test_class = EmptyTestClass()
+        test_class.small = 0
+        test_class.large = list(range(1000))
+
+        stack = recollection.Memento(test_class)
+        stack.register_all()
+
+        with recollection.profile(stack) as profiler:
+            for _ in range(3):
+                stack.store()
+
+        report = dict(
+            (entry['label'], entry)
+            for entry in profiler.report()
+        )
+
+        self.assertEqual(
+            3,
+            report['small']['gets'],
+        )
+
+        # -- Integers are never copied
+        self.assertEqual(
+            0,
+            report['small']['copies'],
+        )
+
+        self.assertEqual(
+            3,
+            report['large']['copies'],
+        )
+
+        self.assertGreater(
+            report['large']['copy_bytes'],
+            1000,
+        )
+
+    # --------------------------------------------------------------------------
+    def test_stop_removes_profiling(self):
+        """
+        Checks that once stopped, the items are left exactly as they were
+
+        :return:
+        """
+        test_class = EmptyTestClass()
+        test_class.foo = 0
+
+        stack = recollection.Memento(test_class)
+        stack.register('foo')
+
+        profiler = recollection.Profiler(stack)
+        profiler.start()
+        stack.store()
+        profiler.stop()
+
+        stack.store()
+
+        self.assertFalse(profiler.running)
+
+        self.assertEqual(
+            1,
+            profiler.report()[0]['gets'],
+        )
+
+        for item in stack._items_to_record:
+            self.assertEqual(
+                dict(),
+                dict(
+                    (name, value)
+                    for name, value in item.__dict__.items()
+                    if name in ('get', 'set', '_copy')
+                ),
+            )
+
+    # --------------------------------------------------------------------------
+    def test_stop_keeps_stats(self):
+        """
+        Checks that stopping a profiler started whilst stats are enabled
+        puts back the wrapping added by stats
+
+        :return:
+        """
+        test_class = EmptyTestClass()
+        test_class.foo = 0
+
+        stack = recollection.Memento(test_class)
+        stack.register('foo')
+        stack.enable_stats()
+
+        wrapped = stack.__dict__['_copy_values']
+
+        with recollection.Profiler(stack):
+            stack.store()
+
+        self.assertIs(
+            wrapped,
+            stack.__dict__['_copy_values'],
+        )
+
+        # -- Copies made once the profiler has stopped are still recorded
+        copies = stack.stats()['latency']['copy']['count']
+        stack.store()
+
+        self.assertGreater(
+            stack.stats()['latency']['copy']['count'],
+            copies,
+        )
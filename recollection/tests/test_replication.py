@@ -0,0 +1,102 @@
+from recollection.tests.classes import EmptyTestClass
+
+import recollection
+import unittest
+
+
+# ------------------------------------------------------------------------------
+class TestReplication(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.primary_class = EmptyTestClass()
+        self.primary_class.foo = 0
+        self.primary_class.bar = 'bar'
+
+        self.primary_stack = recollection.Memento(self.primary_class)
+        self.primary_stack.register('foo')
+        self.primary_stack.register('bar')
+
+        self.follower_class = EmptyTestClass()
+        self.follower_class.foo = None
+        self.follower_class.bar = None
+
+        self.follower_stack = recollection.Memento(self.follower_class)
+        self.follower_stack.register('foo')
+        self.follower_stack.register('bar')
+
+    # --------------------------------------------------------------------------
+    def test_history_is_replicated(self):
+        """
+        Checks that both the existing history and any new states are
+        replicated and acknowledged, in order
+
+        :return:
+        """
+        self.primary_stack.store()
+
+        with recollection.ReplicationPrimary(self.primary_stack) as primary:
+            follower = recollection.ReplicationFollower(
+                self.follower_stack,
+                primary.address,
+            )
+
+            for i in range(1, 4):
+                self.primary_class.foo = i
+                self.primary_stack.store()
+
+            self.assertTrue(primary.wait(timeout=10))
+
+            self.assertEqual(
+                [4],
+                primary.acknowledged(),
+            )
+
+            self.assertEqual(
+                [dict(state) for state in self.primary_stack.states()],
+                [dict(state) for state in self.follower_stack.states()],
+            )
+
+            # -- The target is left alone until the follower is promoted
+            self.assertIsNone(self.follower_class.foo)
+
+            follower.promote()
+
+        self.assertEqual(
+            3,
+            self.follower_class.foo,
+        )
+
+        self.assertEqual(
+            'bar',
+            self.follower_class.bar,
+        )
+
+    # --------------------------------------------------------------------------
+    def test_promoted_follower_stops_following(self):
+        """
+        Checks that once promoted, states from the primary are no longer
+        applied
+
+        :return:
+        """
+        with recollection.ReplicationPrimary(self.primary_stack) as primary:
+            follower = recollection.ReplicationFollower(
+                self.follower_stack,
+                primary.address,
+            )
+
+            self.primary_stack.store()
+            self.assertTrue(follower.wait(1, timeout=10))
+
+            self.assertEqual(
+                1,
+                follower.promote(),
+            )
+
+            self.primary_stack.store()
+
+        self.assertEqual(
+            1,
+            self.follower_stack.count(),
+        )
@@ -0,0 +1,323 @@
+from recollection import fileio
+from recollection.tests.classes import SetterTestClass
+
+import os
+import recollection
+import unittest
+
+
+# ------------------------------------------------------------------------------
+class TestSerialiserJsonLines(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.identifier = 'memento/tests/json_lines'
+        self.data_path = recollection.JsonLinesSerialiser.locator(
+            self.identifier,
+        )
+
+        # -- Remove any old data
+        if os.path.exists(self.data_path):
+            os.remove(self.data_path)
+
+    # --------------------------------------------------------------------------
+    def test_serialise_appends(self):
+        """
+        Checks that every serialisation appends a single compact record
+
+        :return:
+        """
+        test_class, stack = self._memento_test_data()
+
+        for i in range(5):
+            test_class.setTarget(i)
+            stack.store(serialise=True)
+
+        with open(self.data_path, 'r') as f:
+            lines = f.readlines()
+
+        self.assertEqual(
+            5,
+            len(lines),
+        )
+
+        self.assertNotIn(
+            ' ',
+            lines[0],
+        )
+
+    # --------------------------------------------------------------------------
+    def test_deserialise(self):
+        """
+        Checks that the most recent record is restored, including types
+        which json does not natively support
+
+        :return:
+        """
+        test_class, stack = self._memento_test_data()
+
+        test_class.setTarget(10)
+        stack.store(serialise=True)
+
+        test_class.setTarget((1, 2, {3, 4}))
+        test_class.setDistance(b'bytes')
+        stack.store(serialise=True)
+
+        new_test_class, new_stack = self._memento_test_data()
+        new_stack.deserialise()
+
+        self.assertEqual(
+            (1, 2, {3, 4}),
+            new_test_class.getTarget(),
+        )
+
+        self.assertEqual(
+            b'bytes',
+            new_test_class.getDistance(),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_partial_record_is_ignored(self):
+        """
+        Checks that a record which was only partially written (such as
+        during a crash) is ignored in favour of the last complete record
+
+        :return:
+        """
+        test_class, stack = self._memento_test_data()
+
+        test_class.setTarget(10)
+        stack.store(serialise=True)
+
+        with open(self.data_path, 'a') as f:
+            f.write('{"target":')
+
+        self.assertEqual(
+            10,
+            recollection.JsonLinesSerialiser.deserialise(
+                self.identifier,
+            )['target'],
+        )
+
+        self.assertEqual(
+            1,
+            len(list(recollection.JsonLinesSerialiser.history(
+                self.identifier,
+            ))),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_history_and_compact(self):
+        """
+        Checks that the history streams all records in order and that
+        compacting retains only the most recent ones
+
+        :return:
+        """
+        test_class, stack = self._memento_test_data()
+
+        for i in range(10):
+            test_class.setTarget(i)
+            stack.store(serialise=True)
+
+        self.assertEqual(
+            list(range(10)),
+            [
+                record['target']
+                for record in recollection.JsonLinesSerialiser.history(
+                    self.identifier,
+                )
+            ],
+        )
+
+        recollection.JsonLinesSerialiser.compact(self.identifier, keep=3)
+
+        self.assertEqual(
+            [7, 8, 9],
+            [
+                record['target']
+                for record in recollection.JsonLinesSerialiser.history(
+                    self.identifier,
+                )
+            ],
+        )
+
+    # --------------------------------------------------------------------------
+    def test_compact_under_group_durability(self):
+        """
+        Checks that under group durability compacting replaces the file
+        before it returns, without handing the rename to the group commit.
+        A group commit in progress may be waiting on the lock compact
+        holds, so compact must never wait on one.
+
+        :return:
+        """
+        test_class, stack = self._memento_test_data()
+
+        for i in range(10):
+            test_class.setTarget(i)
+            stack.store(serialise=True)
+
+        recollection.set_durability(
+            recollection.DURABILITY_GROUP,
+            group_interval=60000,
+        )
+
+        calls = list()
+
+        fileio._GROUP_COMMIT.rename = lambda *args: calls.append('rename')
+        fileio._GROUP_COMMIT.flush = lambda: calls.append('flush')
+
+        try:
+            recollection.JsonLinesSerialiser.compact(self.identifier, keep=3)
+
+        finally:
+            del fileio._GROUP_COMMIT.rename
+            del fileio._GROUP_COMMIT.flush
+            recollection.set_durability(recollection.DURABILITY_NONE)
+
+        self.assertEqual(
+            [],
+            calls,
+        )
+
+        with open(self.data_path, 'rb') as f:
+            self.assertEqual(
+                3,
+                len(f.read().splitlines()),
+            )
+
+    # --------------------------------------------------------------------------
+    def test_compacts_once_too_large(self):
+        """
+        Checks that the file is compacted automatically once it grows
+        beyond the maximum size, keeping the most recent states
+
+        :return:
+        """
+        test_class, stack = self._memento_test_data()
+        stack.register_serialiser(
+            serialiser=recollection.JsonLinesSerialiser,
+            identifier=self.identifier,
+            incremental=True,
+        )
+
+        max_size = recollection.JsonLinesSerialiser.MAX_SIZE
+        keep = recollection.JsonLinesSerialiser.KEEP
+
+        recollection.JsonLinesSerialiser.MAX_SIZE = 1024
+        recollection.JsonLinesSerialiser.KEEP = 10
+
+        try:
+            for i in range(500):
+                test_class.setTarget(i)
+                stack.store(serialise=True)
+
+                self.assertLessEqual(
+                    os.path.getsize(self.data_path),
+                    1024,
+                )
+
+        finally:
+            recollection.JsonLinesSerialiser.MAX_SIZE = max_size
+            recollection.JsonLinesSerialiser.KEEP = keep
+
+        history = [
+            record['target']
+            for record in recollection.JsonLinesSerialiser.history(
+                self.identifier,
+            )
+        ]
+
+        self.assertEqual(
+            499,
+            history[-1],
+        )
+
+        self.assertLess(
+            len(history),
+            100,
+        )
+
+        self.assertEqual(
+            {'target': 499, 'distance': 0},
+            recollection.JsonLinesSerialiser.deserialise(self.identifier),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_incremental_serialise(self):
+        """
+        Checks that patches are written as partial records and are
+        folded back onto the full record when deserialising
+
+        :return:
+        """
+        test_class, stack = self._memento_test_data()
+        stack.register_serialiser(
+            serialiser=recollection.JsonLinesSerialiser,
+            identifier=self.identifier,
+            incremental=True,
+        )
+
+        test_class.setTarget(10)
+        test_class.setDistance(20)
+        stack.store(serialise=True)
+
+        test_class.setTarget(11)
+        stack.store(serialise=True)
+
+        # -- Storing with no changes should not write anything
+        stack.store(serialise=True)
+
+        with open(self.data_path, 'r') as f:
+            lines = f.readlines()
+
+        self.assertEqual(
+            2,
+            len(lines),
+        )
+
+        self.assertNotIn(
+            'distance',
+            lines[1],
+        )
+
+        self.assertEqual(
+            {'target': 11, 'distance': 20},
+            recollection.JsonLinesSerialiser.deserialise(self.identifier),
+        )
+
+        self.assertEqual(
+            [10, 11],
+            [
+                record['target']
+                for record in recollection.JsonLinesSerialiser.history(
+                    self.identifier,
+                )
+            ],
+        )
+
+    # --------------------------------------------------------------------------
+    def _memento_test_data(self):
+
+        test_class = SetterTestClass()
+
+        stack = recollection.Memento(test_class)
+        stack.register(
+            label='target',
+            getter=test_class.getTarget,
+            setter=test_class.setTarget,
+        )
+
+        stack.register(
+            label='distance',
+            getter=test_class.getDistance,
+            setter=test_class.setDistance,
+        )
+
+        stack.register_serialiser(
+            serialiser=recollection.JsonLinesSerialiser,
+            identifier=self.identifier,
+        )
+
+        return test_class, stack
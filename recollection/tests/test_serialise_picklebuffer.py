@@ -0,0 +1,212 @@
+from recollection.tests.classes import SetterTestClass
+
+import os
+import recollection
+import tempfile
+import unittest
+
+
+# ------------------------------------------------------------------------------
+class TestSerialiserPickleBuffer(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def test_serialise(self):
+        """
+        Checks to see that our serialisation kicks in and we have
+        both a persistent data artifact and a buffer sidecar
+
+        :return:
+        """
+        # -- Create out test stack
+        test_class, stack = self._memento_test_data()
+
+        # -- Define the data location
+        temp_file = tempfile.NamedTemporaryFile(delete=True)
+        temp_file.close()
+
+        # -- Register our serialiser
+        stack.register_serialiser(
+            serialiser=recollection.PickleBufferSerialiser,
+            identifier=temp_file.name,
+        )
+
+        # -- Set some properties on the class
+        test_class.setTarget(b'x' * 10000)
+        test_class.setDistance(20)
+
+        # -- Store the data and serialise
+        stack.store(serialise=True)
+
+        # -- Ensure the data exists
+        self.assertTrue(
+            os.path.exists(temp_file.name)
+        )
+
+        self.assertTrue(
+            os.path.exists(
+                recollection.PickleBufferSerialiser.sidecar(temp_file.name),
+            )
+        )
+
+    # --------------------------------------------------------------------------
+    def test_deserialise(self):
+        """
+        Checks that large buffers are restored as the type they were
+        stored as, while small values come back as they were
+
+        :return:
+        """
+        # -- Create out test stack
+        test_class, stack = self._memento_test_data()
+
+        # -- Define the data location
+        temp_file = tempfile.NamedTemporaryFile(delete=True)
+        temp_file.close()
+
+        # -- Register our serialiser
+        stack.register_serialiser(
+            serialiser=recollection.PickleBufferSerialiser,
+            identifier=temp_file.name,
+        )
+
+        # -- Set some properties on the class
+        test_class.setTarget(bytearray(b'x' * 10000))
+        test_class.setDistance(b'small')
+
+        # -- Store the data and serialise
+        stack.store(serialise=True)
+
+        # -- Create out test stack
+        new_test_class, new_stack = self._memento_test_data()
+
+        # -- Register our serialiser
+        new_stack.register_serialiser(
+            serialiser=recollection.PickleBufferSerialiser,
+            identifier=temp_file.name,
+        )
+        new_stack.deserialise()
+
+        self.assertIsInstance(
+            new_test_class.getTarget(),
+            bytearray,
+        )
+
+        self.assertEqual(
+            b'x' * 10000,
+            new_test_class.getTarget(),
+        )
+
+        self.assertEqual(
+            b'small',
+            new_test_class.getDistance(),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_reserialise_while_mapped(self):
+        """
+        Ensures that re-serialising does not invalidate buffers which
+        have already been restored from a previous deserialisation
+
+        :return:
+        """
+        temp_file = tempfile.NamedTemporaryFile(delete=True)
+        temp_file.close()
+
+        recollection.PickleBufferSerialiser.serialise(
+            {'target': memoryview(b'a' * 10000)},
+            temp_file.name,
+        )
+
+        restored = recollection.PickleBufferSerialiser.deserialise(
+            temp_file.name,
+        )
+
+        recollection.PickleBufferSerialiser.serialise(
+            {'target': b'b' * 20000},
+            temp_file.name,
+        )
+
+        self.assertEqual(
+            b'a' * 10000,
+            restored['target'].tobytes(),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_buffers_round_trip(self):
+        """
+        Checks that deserialised buffers can be stored again, with large
+        bytes keeping their type and memoryviews of any size being mapped
+
+        :return:
+        """
+        # -- Create out test stack
+        test_class, stack = self._memento_test_data()
+
+        # -- Define the data location
+        temp_file = tempfile.NamedTemporaryFile(delete=True)
+        temp_file.close()
+
+        # -- Register our serialiser
+        stack.register_serialiser(
+            serialiser=recollection.PickleBufferSerialiser,
+            identifier=temp_file.name,
+        )
+
+        test_class.setTarget(memoryview(b'small'))
+        test_class.setDistance(b'x' * 10000)
+        stack.store(serialise=True)
+
+        # -- Create out test stack
+        new_test_class, new_stack = self._memento_test_data()
+
+        # -- Register our serialiser
+        new_stack.register_serialiser(
+            serialiser=recollection.PickleBufferSerialiser,
+            identifier=temp_file.name,
+        )
+        new_stack.deserialise()
+
+        self.assertIsInstance(
+            new_test_class.getTarget(),
+            memoryview,
+        )
+
+        self.assertEqual(
+            b'small',
+            new_test_class.getTarget().tobytes(),
+        )
+
+        self.assertIs(
+            bytes,
+            type(new_test_class.getDistance()),
+        )
+
+        # -- The distance is deep copied, which a memoryview would not allow
+        new_stack.store(serialise=True)
+
+        self.assertEqual(
+            b'x' * 10000,
+            new_stack.states()[0]['distance'],
+        )
+
+    # --------------------------------------------------------------------------
+    @classmethod
+    def _memento_test_data(cls):
+
+        test_class = SetterTestClass()
+
+        stack = recollection.Memento(test_class)
+        stack.register(
+            label='target',
+            getter=test_class.getTarget,
+            setter=test_class.setTarget,
+            copy_value=False,
+        )
+
+        stack.register(
+            label='distance',
+            getter=test_class.getDistance,
+            setter=test_class.setDistance,
+        )
+
+        return test_class, stack
@@ -14,6 +14,23 @@ class TestClass(object):
         bar = ''
 
 
+# ------------------------------------------------------------------------------
+class _FailingPatchSerialiser(recollection.PickleSerialiser):
+    """
+    Fails to write the next patch it is given when FAIL is set
+    """
+
+    FAIL = False
+
+    @staticmethod
+    def serialise_patch(patch, identifier):
+        if _FailingPatchSerialiser.FAIL:
+            _FailingPatchSerialiser.FAIL = False
+            raise IOError('Failed to write the patch')
+
+        recollection.PickleSerialiser.serialise_patch(patch, identifier)
+
+
 # ------------------------------------------------------------------------------
 class TestSerialiserAppData(unittest.TestCase):
 
@@ -151,6 +168,155 @@ class TestSerialiserAppData(unittest.TestCase):
             test_class.getDistance(),
         )
 
+    # --------------------------------------------------------------------------
+    def test_incremental_serialise(self):
+        """
+        Checks that when serialising incrementally only changed labels
+        are written after the first full serialisation, and that the
+        patches are folded back together on deserialisation
+
+        :return:
+        """
+        # -- Create out test stack
+        test_class, stack = self._memento_test_data()
+
+        # -- Define the data location
+        temp_file = tempfile.NamedTemporaryFile(delete=True)
+        temp_file.close()
+
+        # -- Register our serialiser
+        stack.register_serialiser(
+            serialiser=recollection.PickleSerialiser,
+            identifier=temp_file.name,
+            incremental=True,
+        )
+
+        # -- Write a full state, followed by a patch
+        test_class.setTarget(10)
+        test_class.setDistance('x' * 10000)
+        stack.store(serialise=True)
+
+        full_size = os.path.getsize(temp_file.name)
+
+        test_class.setTarget(11)
+        stack.store(serialise=True)
+
+        # -- The patch should not have re-written the large label
+        self.assertLess(
+            os.path.getsize(temp_file.name),
+            full_size * 1.5,
+        )
+
+        # -- Create out test stack
+        new_test_class, new_stack = self._memento_test_data()
+
+        # -- Register our serialiser
+        new_stack.register_serialiser(
+            serialiser=recollection.PickleSerialiser,
+            identifier=temp_file.name,
+        )
+        new_stack.deserialise()
+
+        self.assertEqual(
+            11,
+            new_test_class.getTarget(),
+        )
+
+        self.assertEqual(
+            'x' * 10000,
+            new_test_class.getDistance(),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_full_serialise_interval(self):
+        """
+        Checks that a full serialisation is performed once the number
+        of patches reaches the full serialise interval
+
+        :return:
+        """
+        # -- Create out test stack
+        test_class, stack = self._memento_test_data()
+
+        # -- Define the data location
+        temp_file = tempfile.NamedTemporaryFile(delete=True)
+        temp_file.close()
+
+        # -- Register our serialiser
+        stack.register_serialiser(
+            serialiser=recollection.PickleSerialiser,
+            identifier=temp_file.name,
+            incremental=True,
+            full_serialise_interval=2,
+        )
+
+        sizes = list()
+
+        for i in range(4):
+            test_class.setTarget(i)
+            stack.store(serialise=True)
+            sizes.append(os.path.getsize(temp_file.name))
+
+        # -- The first write is full, followed by two patches and then
+        # -- a full write again
+        self.assertLess(sizes[0], sizes[1])
+        self.assertLess(sizes[1], sizes[2])
+        self.assertEqual(sizes[0], sizes[3])
+
+    # --------------------------------------------------------------------------
+    def test_failed_patch_is_not_considered_persisted(self):
+        """
+        Checks that a change whose patch failed to be written is still
+        persisted by the next serialisation
+
+        :return:
+        """
+        # -- Create out test stack
+        test_class, stack = self._memento_test_data()
+
+        # -- Define the data location
+        temp_file = tempfile.NamedTemporaryFile(delete=True)
+        temp_file.close()
+
+        # -- Register our serialiser
+        stack.register_serialiser(
+            serialiser=_FailingPatchSerialiser,
+            identifier=temp_file.name,
+            incremental=True,
+        )
+
+        test_class.setTarget(10)
+        test_class.setDistance(1)
+        stack.store(serialise=True)
+
+        # -- This change is never written
+        _FailingPatchSerialiser.FAIL = True
+        test_class.setDistance(2)
+
+        with self.assertRaises(IOError):
+            stack.store(serialise=True)
+
+        # -- So it must be written along with this one
+        test_class.setTarget(11)
+        stack.store(serialise=True)
+
+        new_test_class, new_stack = self._memento_test_data()
+        new_stack.register_serialiser(
+            serialiser=recollection.PickleSerialiser,
+            identifier=temp_file.name,
+        )
+        new_stack.deserialise()
+
+        self.assertEqual(
+            11,
+            new_test_class.getTarget(),
+        )
+
+        self.assertEqual(
+            2,
+            new_test_class.getDistance(),
+        )
+
     # --------------------------------------------------------------------------
     @classmethod
     def _memento_test_data(cls):
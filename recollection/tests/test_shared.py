@@ -0,0 +1,149 @@
+from recollection.tests.classes import EmptyTestClass
+
+import recollection
+import unittest
+from concurrent import futures
+
+
+# ------------------------------------------------------------------------------
+def _read_shared(name, index):
+    """
+    Reads a shared state from within a worker process
+    """
+    with recollection.SharedHistoryReader(name) as reader:
+        return reader.count(), reader.state(index)
+
+
+# ------------------------------------------------------------------------------
+def _undecodable():
+    raise ValueError('This value cannot be decoded')
+
+
+# ------------------------------------------------------------------------------
+class _UndecodableValue(object):
+    """
+    Pickles without complaint, but fails whenever it is unpickled
+    """
+
+    def __reduce__(self):
+        return _undecodable, ()
+
+
+# ------------------------------------------------------------------------------
+class TestSharedHistory(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.test_class = EmptyTestClass()
+        self.test_class.foo = 0
+
+        self.stack = recollection.Memento(self.test_class, max_states=5)
+        self.stack.register('foo')
+
+    # --------------------------------------------------------------------------
+    def test_existing_and_new_states_are_shared(self):
+        """
+        Checks that states stored both before and after sharing are
+        readable, most recent first
+
+        :return:
+        """
+        self.stack.store()
+
+        with recollection.SharedHistory(self.stack) as shared:
+            for i in range(1, 3):
+                self.test_class.foo = i
+                self.stack.store()
+
+            with recollection.SharedHistoryReader(shared.name) as reader:
+                self.assertEqual(
+                    [{'foo': 2}, {'foo': 1}, {'foo': 0}],
+                    reader.states(),
+                )
+
+    # --------------------------------------------------------------------------
+    def test_ring_wraps(self):
+        """
+        Checks that only the most recent states are held once the ring
+        is full, matching the history of the memento
+
+        :return:
+        """
+        with recollection.SharedHistory(self.stack) as shared:
+            for i in range(12):
+                self.test_class.foo = i
+                self.stack.store()
+
+            with recollection.SharedHistoryReader(shared.name) as reader:
+                self.assertEqual(
+                    [dict(state) for state in self.stack.states()],
+                    reader.states(),
+                )
+
+                with self.assertRaises(IndexError):
+                    reader.state(5)
+
+    # --------------------------------------------------------------------------
+    def test_oversized_state(self):
+        """
+        Checks that a state too large for its slot is reported to the
+        reader rather than being partially written
+
+        :return:
+        """
+        with recollection.SharedHistory(self.stack, slot_size=64) as shared:
+            self.test_class.foo = 'x' * 128
+            self.stack.store()
+
+            with recollection.SharedHistoryReader(shared.name) as reader:
+                with self.assertRaises(recollection.StorageError):
+                    reader.state(0)
+
+    # --------------------------------------------------------------------------
+    def test_undecodable_state(self):
+        """
+        Checks that a state which cannot be decoded raises the decoding
+        error rather than being returned as None
+
+        :return:
+        """
+        # -- The value is not copied, as a copy would decode it
+        stack = recollection.Memento(self.test_class)
+        stack.register('foo', copy_value=False)
+
+        with recollection.SharedHistory(stack) as shared:
+            self.test_class.foo = _UndecodableValue()
+            stack.store()
+
+            with recollection.SharedHistoryReader(shared.name) as reader:
+                with self.assertRaises(ValueError):
+                    reader.state(0)
+
+    # --------------------------------------------------------------------------
+    def test_read_from_another_process(self):
+        """
+        Checks that a separate process can attach and read the history
+
+        :return:
+        """
+        with recollection.SharedHistory(self.stack) as shared:
+            for i in range(3):
+                self.test_class.foo = i
+                self.stack.store()
+
+            with futures.ProcessPoolExecutor(max_workers=1) as processes:
+                count, state = processes.submit(
+                    _read_shared,
+                    shared.name,
+                    1,
+                ).result()
+
+        self.assertEqual(
+            3,
+            count,
+        )
+
+        self.assertEqual(
+            {'foo': 1},
+            state,
+        )
@@ -0,0 +1,217 @@
+from recollection.tests.classes import EmptyTestClass
+from recollection.tests.classes import SetterTestClass
+
+import os
+import tempfile
+import recollection
+import unittest
+
+
+# ------------------------------------------------------------------------------
+class TestStats(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.test_class = SetterTestClass()
+
+        self.stack = recollection.Memento(self.test_class, max_states=3)
+        self.stack.register(
+            label='target',
+            getter=self.test_class.getTarget,
+            setter=self.test_class.setTarget,
+        )
+
+        self.identifier = os.path.join(
+            tempfile.mkdtemp(),
+            'stats.pkl',
+        )
+
+        self.stack.register_serialiser(
+            serialiser=recollection.PickleSerialiser,
+            identifier=self.identifier,
+        )
+
+    # --------------------------------------------------------------------------
+    def test_disabled_by_default(self):
+        """
+        Checks that nothing is recorded, or wrapped, unless enabled
+
+        :return:
+        """
+        self.assertIsNone(self.stack.stats())
+
+        self.assertNotIn(
+            'store',
+            self.stack.__dict__,
+        )
+
+    # --------------------------------------------------------------------------
+    def test_counters_and_latencies(self):
+        """
+        Checks that calls, evictions and bytes are counted and that
+        latencies are recorded for each
+
+        :return:
+        """
+        self.stack.enable_stats()
+
+        for i in range(5):
+            self.test_class.setTarget(i)
+            self.stack.store(serialise=True)
+
+        self.stack.restore(1)
+
+        stats = self.stack.stats()
+
+        self.assertEqual(
+            6,
+            stats['counters']['store'],
+        )
+
+        self.assertEqual(
+            1,
+            stats['counters']['restore'],
+        )
+
+        self.assertEqual(
+            5,
+            stats['counters']['serialise'],
+        )
+
+        # -- Six states were pushed into a history of three
+        self.assertEqual(
+            3,
+            stats['counters']['evictions'],
+        )
+
+        self.assertEqual(
+            os.path.getsize(self.identifier) * 5,
+            stats['counters']['bytes_written'],
+        )
+
+        for name in ('store', 'restore', 'serialise', 'serialiser', 'copy'):
+            latency = stats['latency'][name]
+
+            self.assertGreater(latency['count'], 0)
+            self.assertEqual(
+                latency['count'],
+                sum(latency['buckets'].values()),
+            )
+
+            self.assertLessEqual(latency['min_ns'], latency['p50_ns'])
+            self.assertLessEqual(latency['p99_ns'], latency['max_ns'])
+
+    # --------------------------------------------------------------------------
+    def test_disable_removes_instrumentation(self):
+        """
+        Checks that disabling stats leaves the memento as it was, including
+        items registered whilst stats were enabled
+
+        :return:
+        """
+        self.stack.enable_stats()
+        self.stack.register(
+            label='distance',
+            getter=self.test_class.getDistance,
+            setter=self.test_class.setDistance,
+        )
+        self.stack.store()
+
+        self.assertEqual(
+            2,
+            self.stack.stats()['latency']['copy']['count'],
+        )
+
+        self.stack.disable_stats()
+
+        self.assertIsNone(self.stack.stats())
+
+        for item in self.stack._items_to_record:
+            self.assertNotIn(
+                '_copy',
+                item.__dict__,
+            )
+
+        for method in ('store', 'restore', 'serialise', '_write', '_push',
+                       '_copy_values'):
+            self.assertNotIn(
+                method,
+                self.stack.__dict__,
+            )
+
+    # --------------------------------------------------------------------------
+    def test_disable_keeps_profiler(self):
+        """
+        Checks that disabling stats puts back the wrapping of a profiler
+        started beforehand, and that stats cannot be disabled whilst a
+        profiler started afterwards is still running
+
+        :return:
+        """
+        profiler = recollection.Profiler(self.stack)
+        profiler.start()
+
+        wrapped = self.stack.__dict__['_copy_values']
+
+        self.stack.enable_stats()
+        self.stack.disable_stats()
+
+        self.assertIs(
+            wrapped,
+            self.stack.__dict__['_copy_values'],
+        )
+
+        profiler.stop()
+        self.stack.enable_stats()
+        profiler.start()
+
+        self.assertRaises(
+            RuntimeError,
+            self.stack.disable_stats,
+        )
+
+        # -- Nothing should have been removed by the refusal
+        self.stack.store()
+
+        self.assertEqual(
+            1,
+            self.stack.stats()['counters']['store'],
+        )
+
+        self.assertEqual(
+            1,
+            profiler.report()[0]['gets'],
+        )
+
+        profiler.stop()
+        self.stack.disable_stats()
+
+        for method in ('_copy_values', '_read_values', 'store'):
+            self.assertNotIn(
+                method,
+                self.stack.__dict__,
+            )
+
+    # --------------------------------------------------------------------------
+    def test_copies_of_registered_attributes(self):
+        """
+        Checks that the copy latency is recorded for attributes registered
+        by register_all, whose values are copied together
+
+        :return:
+        """
+        test_class = EmptyTestClass()
+        test_class.foo = [1, 2]
+        test_class.bar = dict(a=1)
+
+        stack = recollection.Memento(test_class)
+        stack.register_all()
+        stack.enable_stats()
+
+        stack.store()
+        stack.store()
+
+        self.assertEqual(
+            2,
+            stack.stats()['latency']['copy']['count'],
+        )
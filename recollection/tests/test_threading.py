@@ -0,0 +1,141 @@
+from recollection.tests.classes import EmptyTestClass
+
+import threading
+import recollection
+import unittest
+
+
+# ------------------------------------------------------------------------------
+class TestThreading(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def test_concurrent_stores(self):
+        """
+        Checks that stores from many threads are all recorded and that
+        every recorded state is complete
+
+        :return:
+        """
+        test_class = EmptyTestClass()
+        test_class.foo = 0
+        test_class.bar = 0
+
+        stack = recollection.Memento(
+            test_class,
+            max_states=None,
+            thread_safe=True,
+        )
+        stack.register('foo')
+        stack.register('bar')
+
+        def work(offset):
+            for i in range(200):
+                with stack.defer():
+                    test_class.foo = offset + i
+                    test_class.bar = offset + i
+
+        threads = [
+            threading.Thread(target=work, args=(idx * 1000,))
+            for idx in range(8)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(
+            1600,
+            stack.count(),
+        )
+
+        for state in stack.states():
+            self.assertEqual(
+                state['foo'],
+                state['bar'],
+            )
+
+    # --------------------------------------------------------------------------
+    def test_readers_are_unaffected_by_stores(self):
+        """
+        Checks that a view of the states does not change as further
+        states are stored, and cannot be altered
+
+        :return:
+        """
+        test_class = EmptyTestClass()
+        test_class.foo = 0
+
+        stack = recollection.Memento(test_class, thread_safe=True)
+        stack.register('foo')
+        stack.store()
+
+        states = stack.states()
+
+        test_class.foo = 1
+        stack.store()
+
+        self.assertEqual(
+            1,
+            len(states),
+        )
+
+        with self.assertRaises(TypeError):
+            states[0]['foo'] = 5
+
+        self.assertEqual(
+            {'foo': (0, 1)},
+            stack.diff(1, 0),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_grouped_mementos_across_threads(self):
+        """
+        Checks that grouped mementos can be stored from different threads
+        without deadlocking
+
+        :return:
+        """
+        test_class_a = EmptyTestClass()
+        test_class_a.foo = 0
+
+        test_class_b = EmptyTestClass()
+        test_class_b.foo = 0
+
+        stack_a = recollection.Memento(
+            test_class_a,
+            max_states=None,
+            thread_safe=True,
+        )
+        stack_a.register('foo')
+
+        stack_b = recollection.Memento(
+            test_class_b,
+            max_states=None,
+            thread_safe=True,
+        )
+        stack_b.register('foo')
+
+        stack_a.group(stack_b)
+
+        def work(stack):
+            for _ in range(100):
+                stack.store()
+
+        threads = [
+            threading.Thread(target=work, args=(stack_a,)),
+            threading.Thread(target=work, args=(stack_b,)),
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join(timeout=10)
+            self.assertFalse(thread.is_alive())
+
+        self.assertEqual(
+            400,
+            stack_a.count() + stack_b.count(),
+        )
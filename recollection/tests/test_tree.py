@@ -0,0 +1,173 @@
+from recollection.tests.classes import SetterTestClass
+
+import recollection
+import unittest
+
+
+# ------------------------------------------------------------------------------
+class TestUndoTree(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.test_class = SetterTestClass()
+        self.test_class.foo = 0
+
+        self.calls = list()
+
+        def set_distance(distance):
+            self.calls.append(distance)
+            self.test_class.setDistance(distance)
+
+        self.stack = recollection.Memento(self.test_class)
+        self.stack.register('foo')
+        self.stack.register(
+            label='distance',
+            getter=self.test_class.getDistance,
+            setter=set_distance,
+        )
+
+        self.tree = recollection.UndoTree(self.stack)
+
+    # --------------------------------------------------------------------------
+    def test_store_after_undo_branches(self):
+        """
+        Checks that storing after an undo starts a new branch, leaving
+        the undone state reachable
+
+        :return:
+        """
+        for i in range(3):
+            self.test_class.foo = i
+            self.stack.store()
+
+        undone = self.tree.current
+
+        self.tree.undo()
+
+        self.test_class.foo = 10
+        self.stack.store()
+
+        self.assertEqual(
+            2,
+            len(undone.parent.children),
+        )
+
+        self.assertEqual(
+            ['foo'],
+            self.tree.restore_to(undone),
+        )
+
+        self.assertEqual(
+            2,
+            self.test_class.foo,
+        )
+
+        self.assertIs(
+            undone,
+            self.tree.current,
+        )
+
+        # -- The distance never changed, so its setter is never called
+        self.assertEqual(
+            [],
+            self.calls,
+        )
+
+    # --------------------------------------------------------------------------
+    def test_undo_reverts_unstored_changes(self):
+        """
+        Checks that undoing compares against the live values of the target,
+        so changes made since the last store are reverted too
+
+        :return:
+        """
+        self.stack.store()
+
+        self.test_class.foo = 1
+        self.stack.store()
+
+        # -- This change is never stored, so the current node knows
+        # -- nothing of it
+        self.test_class.setDistance(7)
+
+        self.assertEqual(
+            ['foo', 'distance'],
+            self.tree.undo(),
+        )
+
+        self.assertEqual(
+            (0, 0),
+            (self.test_class.foo, self.test_class.getDistance()),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_redo_follows_latest_branch(self):
+        """
+        Checks that redo follows the most recently stored branch unless
+        told otherwise
+
+        :return:
+        """
+        self.stack.store()
+
+        self.test_class.foo = 1
+        self.stack.store()
+
+        self.tree.undo()
+
+        self.test_class.setDistance(5)
+        self.stack.store()
+
+        self.tree.undo()
+        self.tree.redo()
+
+        self.assertEqual(
+            (0, 5),
+            (self.test_class.foo, self.test_class.getDistance()),
+        )
+
+        self.tree.undo()
+        self.tree.redo(0)
+
+        self.assertEqual(
+            (1, 0),
+            (self.test_class.foo, self.test_class.getDistance()),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_pruning_keeps_current_branch(self):
+        """
+        Checks that once the tree holds too many nodes, nodes off the
+        current branch are removed first
+
+        :return:
+        """
+        tree = recollection.UndoTree(self.stack, max_nodes=4)
+
+        self.stack.store()
+        self.stack.store()
+        tree.undo()
+
+        for i in range(3):
+            self.test_class.foo = i + 1
+            self.stack.store()
+
+        self.assertEqual(
+            4,
+            len(tree),
+        )
+
+        node = tree.current
+
+        while node.parent is not None:
+            node = node.parent
+
+        self.assertIs(
+            tree.root,
+            node,
+        )
+
+        self.assertEqual(
+            [3, 2, 1, 0],
+            [node.state['foo'] for node in reversed(tree.nodes())],
+        )
@@ -0,0 +1,243 @@
+"""
+This module allows the history of a memento to be navigated as an undo
+tree. Rather than a single list in which states which have been undone are
+mixed in with those stored afterwards, every store made after navigating
+back to an earlier state starts a new branch - so no state is ever lost
+by undoing and then making a different change.
+
+    ..code-block:: python
+
+        >>> import recollection
+        >>>
+        >>> tree = recollection.UndoTree(memento)
+        >>>
+        >>> memento.store()
+        >>> tree.undo()
+        >>>
+        >>> # -- This starts a new branch, leaving the undone state in place
+        >>> memento.store()
+        >>>
+        >>> # -- Any state can be returned to, from any branch
+        >>> tree.restore_to(node)
+
+States are shared between the tree and the history of the memento rather
+than being copied. When moving to a node only the labels whose live values
+differ from that node are set on the target.
+"""
+from . import exceptions
+
+import types
+import itertools
+import collections
+
+
+# ------------------------------------------------------------------------------
+class UndoTree(object):
+    """
+    Records every state stored by a memento as a node within a tree, where
+    each node is a child of the node which was current when it was stored.
+
+    Navigation should be done through the tree (with undo, redo and
+    restore_to) rather than through the restore method of the memento, as
+    a restore is itself stored as a new state.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, memento, max_nodes=1000):
+        """
+        :param memento: The memento whose states should be recorded
+        :type memento: recollection.Memento
+
+        :param max_nodes: The most nodes the tree will hold. Once exceeded
+            the oldest nodes which are not an ancestor of the current node
+            are removed. If zero or None the tree is never pruned.
+        :type max_nodes: int
+        """
+        self._memento = memento
+        self._max_nodes = max_nodes
+
+        self._ids = itertools.count()
+        self._nodes = collections.OrderedDict()
+
+        self.root = None
+        self.current = None
+
+        with memento._lock:
+
+            # -- The tree starts from the most recent state the memento
+            # -- holds, if there is one
+            if memento._states:
+                self._add(memento._states[0])
+
+            memento._push_observers.append(self._add)
+
+    # --------------------------------------------------------------------------
+    def __len__(self):
+        return len(self._nodes)
+
+    # --------------------------------------------------------------------------
+    def close(self):
+        """
+        Stops recording the states stored by the memento
+
+        :return: None
+        """
+        with self._memento._lock:
+            if self._add in self._memento._push_observers:
+                self._memento._push_observers.remove(self._add)
+
+    # --------------------------------------------------------------------------
+    def nodes(self):
+        """
+        Returns every node within the tree, oldest first
+
+        :return: list(Node, ...)
+        """
+        return list(self._nodes.values())
+
+    # --------------------------------------------------------------------------
+    def undo(self):
+        """
+        Moves to the parent of the current node
+
+        :return: The labels which were changed
+        :rtype: list(str, ...)
+        """
+        if self.current is None or self.current.parent is None:
+            raise exceptions.StorageError('There is no earlier state')
+
+        return self.restore_to(self.current.parent)
+
+    # --------------------------------------------------------------------------
+    def redo(self, branch=-1):
+        """
+        Moves to a child of the current node.
+
+        :param branch: The index of the child to move to. Children are
+            ordered oldest first, so by default the most recently stored
+            branch is followed.
+        :type branch: int
+
+        :return: The labels which were changed
+        :rtype: list(str, ...)
+        """
+        if self.current is None or not self.current.children:
+            raise exceptions.StorageError('There is no later state')
+
+        return self.restore_to(self.current.children[branch])
+
+    # --------------------------------------------------------------------------
+    def restore_to(self, node):
+        """
+        Sets the target of the memento to the state held by the given node,
+        which then becomes the current node. Only the labels whose live
+        values differ from the given node are set, and nothing is stored.
+
+        :param node: The node to move to
+        :type node: Node
+
+        :return: The labels which were changed
+        :rtype: list(str, ...)
+        """
+        memento = self._memento
+
+        with memento._lock:
+            if self._nodes.get(node.id) is not node:
+                raise exceptions.StorageError(
+                    'This node is not held within the tree',
+                )
+
+            with memento.omit():
+                changed = memento._set_state(node._state)
+
+            self.current = node
+
+            return changed
+
+    # --------------------------------------------------------------------------
+    def _add(self, snapshot):
+        """
+        Records the given snapshot as a child of the current node
+        """
+        node = Node(next(self._ids), snapshot, self.current)
+
+        if self.current is None:
+            self.root = node
+
+        else:
+            self.current._children.append(node)
+
+        self._nodes[node.id] = node
+        self.current = node
+
+        if self._max_nodes:
+            while len(self._nodes) > self._max_nodes:
+                self._prune()
+
+    # --------------------------------------------------------------------------
+    def _prune(self):
+        """
+        Removes the oldest node which is not an ancestor of the current node.
+        When every node is an ancestor the root is removed instead.
+        """
+        ancestors = set()
+        node = self.current
+
+        while node is not None:
+            ancestors.add(node.id)
+            node = node.parent
+
+        for node in self._nodes.values():
+            if node.id not in ancestors and not node._children:
+                node.parent._children.remove(node)
+                del self._nodes[node.id]
+                return
+
+        # -- Everything remaining is a single line of ancestors, so we
+        # -- cut the tree at its root
+        root = self.root
+        del self._nodes[root.id]
+
+        self.root = root._children[0]
+        self.root.parent = None
+
+
+# ------------------------------------------------------------------------------
+class Node(object):
+    """
+    A single state within an UndoTree
+    """
+
+    __slots__ = ('id', 'parent', '_state', '_children')
+
+    # --------------------------------------------------------------------------
+    def __init__(self, id_, state, parent):
+        self.id = id_
+        self.parent = parent
+
+        self._state = state
+        self._children = list()
+
+    # --------------------------------------------------------------------------
+    def __repr__(self):
+        return '<Node %s>' % self.id
+
+    # --------------------------------------------------------------------------
+    @property
+    def state(self):
+        """
+        A read-only view of the state held by this node
+
+        :return: types.MappingProxyType
+        """
+        return types.MappingProxyType(self._state)
+
+    # --------------------------------------------------------------------------
+    @property
+    def children(self):
+        """
+        The nodes stored whilst this node was current, oldest first
+
+        :return: tuple(Node, ...)
+        """
+        return tuple(self._children)